@@ -0,0 +1,114 @@
+"""
+Android Köprüsü
+Uygulama ve servis süreçlerinin ortak kullandığı Android bağlamı yardımcıları
+ve JNI tutamaç önbelleği
+"""
+
+from runtime import platform
+
+if platform == 'android':
+    from jnius import autoclass
+else:
+    autoclass = None
+
+# Servis başlarken bir kez çözülen sınıflar ve sistem servisleri
+JAVA_CLASSES = [
+    'org.kivy.android.PythonService',
+    'org.kivy.android.PythonActivity',
+    'android.content.Context',
+    'android.os.Looper',
+    'android.app.NotificationManager',
+    'android.app.NotificationChannel',
+    'androidx.core.app.NotificationCompat',
+    'androidx.core.app.NotificationCompat$Builder',
+    'android.R$drawable',
+]
+SYSTEM_SERVICES = ['LOCATION_SERVICE', 'NOTIFICATION_SERVICE', 'CONNECTIVITY_SERVICE']
+
+
+class JavaHandles:
+    """Java sınıfı, sabit ve sistem servisi tutamaçlarının önbelleği
+
+    autoclass ve getSystemService her çağrıda JNI üzerinden yansıma turu
+    yapar; tutamaçlar ilk kullanımda çözülür ve süreç boyunca yeniden
+    kullanılır. lookups yapılan JNI çözümlemelerini sayar.
+    """
+
+    def __init__(self, resolve_class=None, get_context=None):
+        self._resolve_class = resolve_class
+        self._get_context = get_context
+        self._classes = {}
+        self._constants = {}
+        self._services = {}
+        self._context = None
+        self.lookups = 0
+
+    def java_class(self, name):
+        """autoclass(name), bir kez çözülür"""
+        cls = self._classes.get(name)
+        if cls is None:
+            self.lookups += 1
+            cls = self._classes[name] = self._resolve_class(name)
+        return cls
+
+    def constant(self, class_name, field):
+        """Statik alan değeri (ör. Context.LOCATION_SERVICE), bir kez okunur"""
+        key = (class_name, field)
+        if key not in self._constants:
+            cls = self.java_class(class_name)
+            self.lookups += 1
+            self._constants[key] = getattr(cls, field)
+        return self._constants[key]
+
+    def context(self):
+        """Sürecin Android bağlamı; henüz yoksa önbelleğe alınmaz"""
+        if self._context is None:
+            self.lookups += 1
+            self._context = self._get_context()
+        return self._context
+
+    def system_service(self, name):
+        """Context.<name> sistem servisi (ör. 'NOTIFICATION_SERVICE')"""
+        service = self._services.get(name)
+        if service is None:
+            service_name = self.constant('android.content.Context', name)
+            self.lookups += 1
+            service = self.context().getSystemService(service_name)
+            if service is not None:
+                self._services[name] = service
+        return service
+
+    def preload(self, classes=JAVA_CLASSES, services=SYSTEM_SERVICES):
+        """Sınıfları ve servisleri döngü başlamadan çöz"""
+        for name in classes:
+            self.java_class(name)
+        for name in services:
+            self.system_service(name)
+
+    def reset(self):
+        """Bağlam değiştiğinde bağlama bağlı tutamaçları bırak"""
+        self._context = None
+        self._services.clear()
+
+
+def _current_context():
+    service = handles.java_class('org.kivy.android.PythonService').mService
+    if service is not None:
+        return service
+    return handles.java_class('org.kivy.android.PythonActivity').mActivity
+
+
+handles = JavaHandles(autoclass, _current_context)
+
+
+def android_context():
+    """Servis sürecinde servisi, uygulama sürecinde aktiviteyi döndür"""
+    if platform != 'android':
+        return None
+    return _current_context()
+
+
+def running_in_service():
+    """Kod Android arka plan servisinin sürecinde mi çalışıyor"""
+    return (platform == 'android' and
+            handles.java_class('org.kivy.android.PythonService').mService is not None)
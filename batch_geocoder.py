@@ -0,0 +1,142 @@
+"""
+Toplu Ters Geocoding
+Kayıtlı konum geçmişini veya çevrimdışı biriken konumları toplu çözümler.
+
+Noktalar önbellek hücresine (geohash) göre tekilleştirilir; her hücre önce
+önbellekten, sonra çevrimdışı sınır dizininden çözülür. Yalnızca kalan
+hücreler sınırlı sayıda işçiyle ağ arka ucuna gider; istek hızı token
+kovasıyla sınırlanır (bkz. resilience.py).
+Sonuçlar girdiyle aynı sırada döner. None iki anlama gelir: arka uç
+"burada adres yok" dedi (ör. deniz) ya da istek başarısız oldu; hangisi
+olduğu last_failed listesinde tutulur, yalnızca başarısızlar yeniden denenir.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from geocache import DEFAULT_PRECISION, GeocodeCache, geohash_encode
+from geocoder import (
+    NOMINATIM_URL, GeocoderError, GuardedGeocoder, NominatimGeocoder, nominatim_limiter,
+)
+from offline_geocoder import OfflineResolver
+from runtime import Logger
+
+DEFAULT_WORKERS = 2
+
+
+def _iter_points(points):
+    """Liste, demet yineleyicisi veya (N, 2) NumPy dizisinden (enlem, boylam) üret"""
+    tolist = getattr(points, 'tolist', None)
+    if tolist is not None:
+        points = tolist()
+    for point in points:
+        yield float(point[0]), float(point[1])
+
+
+class BatchGeocoder:
+    """Hücre tekilleştirmeli, önbellek ve çevrimdışı öncelikli toplu çözümleyici"""
+
+    def __init__(self, cache=None, offline=None, remote=None, precision=None,
+                 workers=DEFAULT_WORKERS, limiter=None):
+        self.cache = cache
+        self.offline = offline
+        self.remote = remote
+        self.precision = precision or (cache.precision if cache is not None else DEFAULT_PRECISION)
+        self.workers = max(1, workers)
+        # Arka uç kendisi sınırlamıyorsa (ör. GuardedGeocoder değilse) kullanılır
+        self.limiter = limiter
+        self.last_stats = {}
+        # Son çağrıda isteği başarısız olan girdiler (girdi sırasıyla True/False)
+        self.last_failed = []
+
+    def reverse_many(self, points):
+        """Adres sözlüklerini (veya None) girdiyle aynı sırada döndür"""
+        started = time.perf_counter()
+
+        # Hücre -> (temsilci nokta, girdi sıraları)
+        cells = {}
+        order = []
+        for index, (lat, lon) in enumerate(_iter_points(points)):
+            cell = geohash_encode(lat, lon, self.precision)
+            entry = cells.get(cell)
+            if entry is None:
+                cells[cell] = entry = ((lat, lon), [])
+            entry[1].append(index)
+            order.append(cell)
+
+        resolved = {}
+        failed = set()
+        stats = {'points': len(order), 'cells': len(cells), 'cache': 0,
+                 'offline': 0, 'remote': 0, 'failed': 0}
+
+        misses = []
+        for cell, ((lat, lon), _) in cells.items():
+            address = self.cache.get(lat, lon) if self.cache is not None else None
+            if address is not None:
+                stats['cache'] += 1
+            elif self.offline is not None:
+                address = self.offline.lookup(lat, lon)
+                if address is not None:
+                    stats['offline'] += 1
+
+            if address is not None:
+                resolved[cell] = address
+            else:
+                misses.append(cell)
+
+        if misses and self.remote is not None:
+            self._resolve_remote(cells, misses, resolved, failed, stats)
+
+        stats['unresolved'] = stats['cells'] - len(resolved)
+        stats['seconds'] = time.perf_counter() - started
+        self.last_stats = stats
+        self.last_failed = [cell in failed for cell in order]
+        Logger.info(f"BatchGeocoder: {stats}")
+        return [resolved.get(cell) for cell in order]
+
+    def _resolve_remote(self, cells, misses, resolved, failed, stats):
+        def fetch(lat, lon):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            return self.remote.reverse(lat, lon)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(fetch, *cells[cell][0]): cell for cell in misses}
+            for future in as_completed(futures):
+                cell = futures[future]
+                try:
+                    address = future.result()
+                except GeocoderError as e:
+                    Logger.warning(f"BatchGeocoder: {cell} çözülemedi - {str(e)}")
+                    stats['failed'] += 1
+                    failed.add(cell)
+                    continue
+
+                stats['remote'] += 1
+                if address is None:
+                    continue
+                resolved[cell] = address
+                # Önbelleğe yazma tek iş parçacığında kalır
+                if self.cache is not None:
+                    self.cache.put(*cells[cell][0], address)
+
+    def close(self):
+        if self.remote is not None:
+            self.remote.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def create_batch_geocoder(cache=None, nominatim_url=NOMINATIM_URL, client=None,
+                          workers=DEFAULT_WORKERS):
+    """Varsayılan önbellek, paketlenmiş sınırlar ve Nominatim ile toplu çözümleyici kur
+
+    Nominatim istekleri servisle paylaşılan token kovasını bekler.
+    """
+    remote = GuardedGeocoder(NominatimGeocoder(url=nominatim_url, client=client),
+                             limiter=nominatim_limiter(), wait=60)
+    return BatchGeocoder(
+        cache=cache if cache is not None else GeocodeCache(),
+        offline=OfflineResolver.load_default(),
+        remote=remote, workers=workers,
+    )
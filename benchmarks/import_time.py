@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+İçe Aktarma Süresi Raporu
+Giriş noktalarını (service, main) yeni bir yorumlayıcıda -X importtime ile
+yükler; toplam süreyi, en pahalı modülleri ve servis sürecine sızan ağır
+paketleri (kivy, requests, numpy) raporlar.
+
+Kullanım:
+    python benchmarks/import_time.py service
+    python benchmarks/import_time.py main --top 30
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Servis soğuk başlangıcında yüklenmemesi gereken paketler
+HEAVY_PACKAGES = ('kivy', 'requests', 'urllib3', 'numpy')
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def _run(module):
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT_DIR, env.get('PYTHONPATH')]))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} içe aktarılamadı:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def import_profile(module, repeat=3):
+    """En hızlı denemenin toplam süresini (ms), pahalı modülleri ve ağır paketleri döndür"""
+    best = None
+    for _ in range(repeat):
+        entries = _run(module)
+        total = next(cumulative for name, depth, _, cumulative in entries
+                     if name == module and depth == 0)
+        if best is None or total < best[0]:
+            best = (total, entries)
+
+    total, entries = best
+    # Yorumlayıcı açılışı (site, encodings) hedefin alt ağacında değil
+    start = max(i for i, (name, depth, _, _) in enumerate(entries)
+                if name == module and depth == 0)
+    first = start
+    while first > 0 and entries[first - 1][1] > 0:
+        first -= 1
+    subtree = entries[first:start + 1]
+
+    heavy = sorted({name.split('.')[0] for name, _, _, _ in subtree
+                    if name.split('.')[0] in HEAVY_PACKAGES})
+    return {
+        'module': module,
+        'ms': total / 1000,
+        'modules': len(subtree),
+        'heavy': heavy,
+        'entries': subtree,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Giriş noktası içe aktarma süresi raporu")
+    parser.add_argument('module', nargs='?', default='service')
+    parser.add_argument('--top', type=int, default=20, help="gösterilecek en pahalı modül sayısı")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help="sonucu JSON olarak yaz")
+    args = parser.parse_args()
+
+    profile = import_profile(args.module, args.repeat)
+    if args.json:
+        profile = dict(profile, entries=[
+            {'module': name, 'depth': depth, 'self_us': self_us, 'cumulative_us': cumulative}
+            for name, depth, self_us, cumulative in profile['entries']
+        ])
+        print(json.dumps(profile, indent=2))
+        return
+
+    print(f"{args.module}: {profile['ms']:.1f} ms, {profile['modules']} modül")
+    print(f"Ağır paketler: {', '.join(profile['heavy']) or '-'}\n")
+    print(f"{'self [ms]':>10} | {'toplam [ms]':>11} | modül")
+    slowest = sorted(profile['entries'], key=lambda entry: entry[3], reverse=True)[:args.top]
+    for name, depth, self_us, cumulative in slowest:
+        print(f"{self_us / 1000:>10.1f} | {cumulative / 1000:>11.1f} | {'  ' * depth}{name}")
+
+
+if __name__ == '__main__':
+    main()
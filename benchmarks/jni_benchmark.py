@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+JNI Çağrı Sayacı (mikro kıyaslama)
+Bir takip turunun (konum + bildirim) Java tarafına kaç kez geçtiğini sayar.
+Gerçek JVM yerine her sınıf çözümlemesini, alan okumasını ve metot
+çağrısını sayan bir taklit kullanılır. Şimdiki yol gerçek koddur:
+locations.location_to_fix ve notifications.LocationNotifier taklit JVM'e
+bağlanarak çalıştırılır. Önceki yol (her turda autoclass ve
+getSystemService) artık depoda olmadığından ilk sürümün service.py
+döngüsünden aktarılmıştır.
+
+Kullanım:
+    python benchmarks/jni_benchmark.py --ticks 1000
+    python benchmarks/jni_benchmark.py --json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Kivy komut satırı argümanlarını yutmasın
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+import notifications  # noqa: E402
+from android_bridge import JavaHandles  # noqa: E402
+from locations import location_to_fix  # noqa: E402
+from notifications import CHANNEL_ID, LOCATION_NOTIFICATION_ID, LocationNotifier  # noqa: E402
+
+# Önceki yolda bildirim oluşturucusunun her turda çağrılan ayarlayıcıları
+BUILDER_SETTERS = ['setContentTitle', 'setContentText', 'setSmallIcon', 'setPriority',
+                   'setAutoCancel', 'setVibrate', 'setSubText']
+LOCATION_GETTERS = ['getLatitude', 'getLongitude', 'getAccuracy', 'getTime', 'getProvider']
+
+# notifications modülünün Android'de içe aktarılırken çözdüğü sınıflar
+NOTIFICATION_CLASSES = {
+    'NotificationManager': 'android.app.NotificationManager',
+    'NotificationCompat': 'androidx.core.app.NotificationCompat',
+    'NotificationCompatBuilder': 'androidx.core.app.NotificationCompat$Builder',
+    'NotificationChannel': 'android.app.NotificationChannel',
+    'RDrawable': 'android.R$drawable',
+}
+
+
+class CountingJVM:
+    """JNI geçişlerini sayan taklit Java ortamı"""
+
+    def __init__(self):
+        self.resolves = 0       # autoclass (yansıma ile sınıf çözümleme)
+        self.crossings = 0      # alan okuma + metot çağrısı
+
+    def autoclass(self, name):
+        self.resolves += 1
+        return _JavaObject(self, name)
+
+    def reset(self):
+        self.resolves = 0
+        self.crossings = 0
+
+
+class _JavaObject:
+    def __init__(self, jvm, name):
+        self._jvm = jvm
+        self._name = name
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        self._jvm.crossings += 1
+        return _JavaObject(self._jvm, f"{self._name}.{attr}")
+
+    def __call__(self, *args):
+        self._jvm.crossings += 1
+        return _JavaObject(self._jvm, f"{self._name}()")
+
+    def __truediv__(self, other):
+        # getTime() / 1000.0 gibi sayısal dönüşümler; değerin kendisi ölçülmez
+        return 0.0
+
+
+@contextlib.contextmanager
+def counting_notifications(jvm, context):
+    """notifications modülünü Android'deymiş gibi taklit JVM'e bağla, çıkışta geri al"""
+    saved = {name: getattr(notifications, name, None)
+             for name in ['handles', 'platform', *NOTIFICATION_CLASSES]}
+    handles = JavaHandles(jvm.autoclass, lambda: context)
+    notifications.handles = handles
+    notifications.platform = 'android'
+    for name, class_name in NOTIFICATION_CLASSES.items():
+        setattr(notifications, name, handles.java_class(class_name))
+    try:
+        yield handles
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                delattr(notifications, name)
+            else:
+                setattr(notifications, name, value)
+
+
+def legacy_tick(jvm):
+    """Önceki yol (ilk sürümün service.py döngüsü): her turda sınıf, bağlam ve
+    sistem servisi yeniden çözülür"""
+    # Konum: son bilinen konum yoklaması
+    jvm.autoclass('android.location.LocationManager')
+    context = jvm.autoclass('org.kivy.android.PythonActivity').mActivity
+    Context = jvm.autoclass('android.content.Context')
+    location_manager = context.getSystemService(Context.LOCATION_SERVICE)
+    location_manager.isProviderEnabled('gps')
+    location = location_manager.getLastKnownLocation('gps')
+    for getter in LOCATION_GETTERS:
+        getattr(location, getter)()
+
+    # Bildirim
+    context = jvm.autoclass('org.kivy.android.PythonActivity').mActivity
+    Context = jvm.autoclass('android.content.Context')
+    notification_manager = context.getSystemService(Context.NOTIFICATION_SERVICE)
+    builder = jvm.autoclass('androidx.core.app.NotificationCompat$Builder')(context, CHANNEL_ID)
+    for setter in BUILDER_SETTERS:
+        getattr(builder, setter)(None)
+    notification_manager.notify(LOCATION_NOTIFICATION_ID, builder.build())
+
+
+def cached_tick(notifier, location):
+    """Şimdiki yol: dinleyicinin verdiği konum dönüştürülür, hazır oluşturucuyla bildirilir"""
+    location_to_fix(location)
+    notifier.notify("Fatih / İstanbul")
+
+
+def cached_path(jvm):
+    """Gerçek bildirimciyi ve dinleyicinin vereceği Location nesnesini hazırla"""
+    # Aralık sınırı ölçümü etkilemesin: her tur gerçekten gönderilir
+    notifier = LocationNotifier(min_interval=0, merge_foreground=False)
+    # Location nesnesini Java tarafı oluşturup geri çağrıya verir; geçiş sayılmaz
+    location = _JavaObject(jvm, 'android.location.Location')
+    return notifier, location
+
+
+def measure(name, tick, jvm, ticks, setup=None):
+    """Turları çalıştır, tur başına geçiş sayısını ve süreyi döndür"""
+    jvm.reset()
+    if setup is not None:
+        setup()
+    setup_resolves, setup_crossings = jvm.resolves, jvm.crossings
+
+    jvm.reset()
+    started = time.perf_counter()
+    for _ in range(ticks):
+        tick()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'path': name,
+        'ticks': ticks,
+        'setup_resolves': setup_resolves,
+        'setup_crossings': setup_crossings,
+        'resolves_per_tick': jvm.resolves / ticks,
+        'crossings_per_tick': jvm.crossings / ticks,
+        'python_us_per_tick': elapsed / ticks * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tur başına JNI geçişi sayacı")
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--json', action='store_true', help="sonucu JSON olarak yaz")
+    args = parser.parse_args()
+
+    jvm = CountingJVM()
+    context = _JavaObject(jvm, 'PythonService.mService')
+    notifier, location = cached_path(jvm)
+
+    results = [measure('legacy', lambda: legacy_tick(jvm), jvm, args.ticks)]
+    with counting_notifications(jvm, context):
+        results.append(measure('cached', lambda: cached_tick(notifier, location), jvm,
+                               args.ticks, setup=lambda: cached_tick(notifier, location)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'yol':<8} {'kurulum':>8} {'autoclass/tur':>14} {'geçiş/tur':>10} {'µs/tur':>8}")
+    for r in results:
+        print(f"{r['path']:<8} {r['setup_resolves'] + r['setup_crossings']:>8} "
+              f"{r['resolves_per_tick']:>14.1f} {r['crossings_per_tick']:>10.1f} "
+              f"{r['python_us_per_tick']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Takip Hattı Kıyaslama Paketi
+Sentetik bir günü sanal saatle tüm hattan geçirir (bkz. tools/simulate.py)
+ve tur gecikmesi, önbellek isabet oranı, saatlik bildirim, tur başına bellek
+ayırma, CPU süresi, JNI geçişleri, bölge değerlendirme süresi, iz
+sadeleştirme oranı, yükleme istek/bayt sayısı ve giriş noktalarının içe
+aktarma süresini ölçer. Sonuçlar baseline.json ile karşılaştırılır; thresholds.json'daki
+toleranslar aşılırsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/run.py                          # ölç ve karşılaştır
+    python benchmarks/run.py --update-baseline        # temel değerleri yenile
+    python benchmarks/run.py --threshold tick_ms_p95=0.5 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'tools'))
+# Kivy komut satırı argümanlarını yutmasın
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from geofence import CircleFence, GeofenceMonitor, PolygonFence  # noqa: E402
+from import_time import import_profile  # noqa: E402
+from jni_benchmark import (  # noqa: E402
+    CountingJVM, _JavaObject, cached_path, cached_tick, counting_notifications, measure,
+)
+from simulate import simulate  # noqa: E402
+from simulation import synthetic_trajectory  # noqa: E402
+from trajectory import (  # noqa: E402
+    MODE_DEAD_RECKONING, MODE_DOUGLAS_PEUCKER, create_simplifier, max_error,
+)
+
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+THRESHOLDS_PATH = os.path.join(BENCH_DIR, 'thresholds.json')
+
+DAY = 86400
+
+
+class TickProbe:
+    """Motorun her turunu (konum alma + işleme) süre ve bellek olarak ölçer"""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.ticks = []         # tur başına saniye
+        self.allocations = []   # tur başına en yüksek ek bellek (bayt)
+        self._started = None
+        self._base_memory = 0
+
+    def install(self, engine):
+        acquire = engine._acquire
+        process = engine.process
+
+        async def timed_acquire():
+            self._finish()
+            if self.trace_memory:
+                tracemalloc.reset_peak()
+                self._base_memory = tracemalloc.get_traced_memory()[0]
+            self._started = time.perf_counter()
+            self.ticks.append(0.0)
+            result = await acquire()
+            self.ticks[-1] += time.perf_counter() - self._started
+            return result
+
+        async def timed_process(location):
+            started = time.perf_counter()
+            try:
+                return await process(location)
+            finally:
+                self.ticks[-1] += time.perf_counter() - started
+
+        engine._acquire = timed_acquire
+        engine.process = timed_process
+
+    def _finish(self):
+        if self.trace_memory and self._started is not None:
+            self.allocations.append(tracemalloc.get_traced_memory()[1] - self._base_memory)
+
+    def close(self):
+        self._finish()
+        self._started = None
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_day(duration, seed):
+    """Sentetik günü ölç: gecikme, isabet oranı, bildirim, CPU"""
+    probe = TickProbe()
+    stats = simulate(duration=duration, seed=seed, setup=probe.install)
+    probe.close()
+
+    hours = stats['virtual_seconds'] / 3600
+    lookups = stats['cache_hits'] + stats['cache_misses']
+    per_day = DAY / max(stats['virtual_seconds'], 1)
+    return {
+        'tick_ms_p50': _percentile(probe.ticks, 0.5) * 1000,
+        'tick_ms_p95': _percentile(probe.ticks, 0.95) * 1000,
+        'cache_hit_rate': stats['cache_hits'] / lookups if lookups else 0.0,
+        'notifications_per_hour': stats['notifications'] / hours if hours else 0.0,
+        'nominatim_requests_per_day': stats['nominatim_requests'] * per_day,
+        'cpu_seconds_per_day': stats['cpu_seconds'] * per_day,
+    }
+
+
+def run_allocations(duration, seed):
+    """Kısa simülasyonda tur başına bellek ayırmayı tracemalloc ile ölç"""
+    probe = TickProbe(trace_memory=True)
+    tracemalloc.start()
+    try:
+        simulate(duration=duration, seed=seed, setup=probe.install)
+        probe.close()
+    finally:
+        tracemalloc.stop()
+    return {'alloc_kib_per_tick': statistics.mean(probe.allocations) / 1024}
+
+
+def run_jni(ticks=1000):
+    """Bildirim + konum turu başına JNI geçişi (taklit JVM ile)"""
+    jvm = CountingJVM()
+    context = _JavaObject(jvm, 'PythonService.mService')
+    notifier, location = cached_path(jvm)
+    with counting_notifications(jvm, context):
+        result = measure('cached', lambda: cached_tick(notifier, location), jvm, ticks,
+                         setup=lambda: cached_tick(notifier, location))
+    return {'jni_crossings_per_tick': result['crossings_per_tick'] + result['resolves_per_tick']}
+
+
+def run_geofence(fences=10000, fixes=20000, seed=1):
+    """İstanbul ölçeğine dağılmış daire/poligon bölgelerle konum başına değerlendirme süresi"""
+    rng = random.Random(seed)
+    # Dosya yerine bölgeler doğrudan indekse eklenir
+    monitor = GeofenceMonitor(path=os.devnull)
+    monitor.refresh()
+    for i in range(fences):
+        lat, lon = rng.uniform(40.8, 41.2), rng.uniform(28.6, 29.4)
+        if i % 2:
+            monitor.index.add(CircleFence(i, str(i), lat, lon, rng.uniform(50, 500)))
+        else:
+            size = rng.uniform(0.001, 0.005)
+            monitor.index.add(PolygonFence(i, str(i), [(lat, lon), (lat + size, lon),
+                                                       (lat + size, lon + size),
+                                                       (lat, lon + size / 2)]))
+    points = [{'lat': rng.uniform(40.8, 41.2), 'lon': rng.uniform(28.6, 29.4), 'time': i}
+              for i in range(fixes)]
+
+    started = time.perf_counter()
+    for fix in points:
+        monitor.update(fix)
+    return {'geofence_us_per_fix': (time.perf_counter() - started) / fixes * 1e6}
+
+
+def run_trajectory(duration, seed):
+    """Sentetik günün iki kipte sadeleştirme oranı ve en büyük hatası (metre)"""
+    fixes = list(synthetic_trajectory(duration, seed=seed))
+    results = {}
+    for mode, key in ((MODE_DEAD_RECKONING, 'dr'), (MODE_DOUGLAS_PEUCKER, 'dp')):
+        simplifier = create_simplifier(mode)
+        kept = [fix for point in fixes for fix in simplifier.push(point)] + simplifier.flush()
+        results[f'trajectory_ratio_{key}'] = len(fixes) / len(kept)
+        results[f'trajectory_error_m_{key}'] = max_error(fixes, kept)
+    return results
+
+
+def run_upload(duration, seed):
+    """Sadeleştirilmiş izin toplu yüklenmesi: günlük istek ve sıkıştırılmış bayt"""
+    stats = simulate(duration=duration, seed=seed, upload=True, simplify=MODE_DEAD_RECKONING)
+    per_day = DAY / max(stats['virtual_seconds'], 1)
+    return {
+        'upload_requests_per_day': stats['upload']['requests'] * per_day,
+        'upload_kib_per_day': stats['upload']['sent_bytes'] / 1024 * per_day,
+    }
+
+
+def run_imports():
+    """Servis ve uygulama giriş noktalarının soğuk içe aktarma süresi"""
+    service = import_profile('service')
+    app = import_profile('main')
+    return {
+        'import_ms_service': service['ms'],
+        'import_ms_main': app['ms'],
+        # Servis sürecine sızan kivy/requests/numpy paketleri
+        'service_heavy_packages': len(service['heavy']),
+    }
+
+
+def _load_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(results, baseline, thresholds):
+    """Her ölçümü temel değerle karşılaştır; (ad, değer, temel, durum) listesi döndür
+
+    direction: 'lower' (küçük iyi), 'higher' (büyük iyi) veya 'equal' (iki yönde)
+    tolerance: temel değere göre izin verilen oran, slack: mutlak pay
+    """
+    rows = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        rule = thresholds.get(name, {})
+        if base is None or not rule:
+            rows.append((name, value, base, 'yeni'))
+            continue
+
+        allowed = abs(base) * rule.get('tolerance', 0.0) + rule.get('slack', 0.0)
+        direction = rule.get('direction', 'lower')
+        if direction == 'lower':
+            regressed = value > base + allowed
+        elif direction == 'higher':
+            regressed = value < base - allowed
+        else:
+            regressed = abs(value - base) > allowed
+        rows.append((name, value, base, 'GERİLEME' if regressed else 'ok'))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Takip hattı kıyaslamaları")
+    parser.add_argument('--duration', type=float, default=DAY, help="sentetik gün süresi (sn)")
+    parser.add_argument('--alloc-duration', type=float, default=3 * 3600,
+                        help="bellek ölçümü için simülasyon süresi (sn)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--thresholds', default=THRESHOLDS_PATH)
+    parser.add_argument('--threshold', action='append', default=[], metavar='AD=ORAN',
+                        help="bir ölçümün toleransını geçersiz kıl (ör. tick_ms_p95=0.5)")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="ölçümleri temel değer olarak kaydet")
+    parser.add_argument('--json', action='store_true', help="sonucu JSON olarak yaz")
+    args = parser.parse_args()
+
+    results = {}
+    results.update(run_day(args.duration, args.seed))
+    results.update(run_allocations(args.alloc_duration, args.seed))
+    results.update(run_jni())
+    results.update(run_geofence())
+    results.update(run_trajectory(args.duration, args.seed))
+    results.update(run_upload(args.duration, args.seed))
+    results.update(run_imports())
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Temel değerler yazıldı: {args.baseline}")
+        return 0
+
+    thresholds = _load_json(args.thresholds)
+    for override in args.threshold:
+        name, _, tolerance = override.partition('=')
+        thresholds.setdefault(name, {})['tolerance'] = float(tolerance)
+
+    rows = compare(results, _load_json(args.baseline), thresholds)
+    failed = [row for row in rows if row[3] == 'GERİLEME']
+
+    if args.json:
+        print(json.dumps({'results': results, 'regressions': [row[0] for row in failed]},
+                         indent=2))
+    else:
+        print(f"{'ölçüm':<28} {'değer':>12} {'temel':>12}  durum")
+        for name, value, base, status in rows:
+            base_text = f"{base:>12.3f}" if base is not None else f"{'-':>12}"
+            print(f"{name:<28} {value:>12.3f} {base_text}  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,7 +15,7 @@ def check_requirements():
     print("🔍 Gerekli araçlar kontrol ediliyor...")
     
     required_tools = {
-        'python': 'Python 3.7+',
+        'python': 'Python 3.9+',
         'java': 'Java JDK 8+',
         'git': 'Git',
     }
@@ -0,0 +1,54 @@
+"""
+Saat
+Motorun zaman kaynağı: gerçek saat ya da simülasyon için sanal saat.
+
+VirtualClock(speed=N) gerçek zamanın N katı hızla ilerler (1x-1000x);
+speed=None iken beklemeler anında biter ve sanal zaman bekleme kadar ileri
+atlanır, böylece bir günlük takip birkaç saniyede çalışır.
+"""
+
+import asyncio
+import time
+
+
+class SystemClock:
+    """Gerçek saat"""
+
+    # True ise motor her turda işlemenin bitmesini bekler (bkz. VirtualClock)
+    synchronous = False
+
+    def time(self):
+        return time.time()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock:
+    """Hızlandırılmış veya beklemesiz sanal saat"""
+
+    def __init__(self, start=None, speed=None):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed pozitif olmalı")
+        self.start = start if start is not None else time.time()
+        self.speed = speed
+        # Beklemesiz kipte işleme sürerken zaman ilerlemez
+        self.synchronous = speed is None
+        self._virtual = self.start
+        self._real_anchor = time.monotonic()
+
+    def time(self):
+        if self.speed is None:
+            return self._virtual
+        return self.start + (time.monotonic() - self._real_anchor) * self.speed
+
+    def elapsed(self):
+        """Başlangıçtan beri geçen sanal süre"""
+        return self.time() - self.start
+
+    async def sleep(self, seconds):
+        if self.speed is None:
+            self._virtual += max(0.0, seconds)
+            await asyncio.sleep(0)
+        else:
+            await asyncio.sleep(max(0.0, seconds) / self.speed)
@@ -0,0 +1,473 @@
+"""
+Konum Takip Motoru
+Konum alma → adres çözümleme → bildirim hattını asyncio üzerinde çalıştırır.
+Beklemeler iptal edilebilir; engelleyen çağrılar (GPS, HTTP) iş parçacığı
+havuzunda yürür, böylece durdurma anında gerçekleşir ve bir konumun
+çözümlenmesi sürerken bir sonraki konum alınabilir.
+
+Uygulama (main.py) ve Android servisi (service.py) bu motorun ince
+ön yüzleridir; süreç kilidi aynı anda yalnızca bir döngünün çalışmasını sağlar.
+"""
+
+import asyncio
+import os
+import time
+
+from batch_geocoder import BatchGeocoder
+from clock import SystemClock
+from gating import ChangeGate
+from geofence import event_text
+from geocache import default_data_dir
+from geocoder import (
+    TEXT_TIMEOUT, USER_AGENT, address_text, create_geocoder, format_address, geocoder_caches,
+    is_resolved,
+)
+from http_client import HttpClient
+from locations import create_location_provider
+from metrics import Metrics
+from motion import STILL
+from notifications import notifier, send_geofence_notification, send_location_notification
+from offline_queue import KIND_FIX, QueueFlusher
+from runtime import Logger
+from scheduler import AdaptiveScheduler
+
+LOCK_FILENAME = 'tracking.lock'
+
+
+class ProcessLock:
+    """Süreçler arası, engellemeyen dosya kilidi"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(default_data_dir(), LOCK_FILENAME)
+        self._file = None
+
+    def acquire(self):
+        """Kilidi almayı dene; başka süreç tutuyorsa False döndür"""
+        if self._file is not None:
+            return True
+
+        f = open(self.path, 'a+')
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+
+        self._file = f
+        return True
+
+    def release(self):
+        """Kilidi bırak (süreç ölürse işletim sistemi de bırakır)"""
+        if self._file is None:
+            return
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class TrackingEngine:
+    """asyncio tabanlı konum takip hattı
+
+    Varsayılan olarak konumu locations, adresi geocoder, bildirimi
+    notifications modülüyle üretir; testler için her aşama değiştirilebilir:
+
+    provider          -> LocationProvider (dinleyici tabanlı konum kuyruğu)
+    motion            -> MotionDetector; durağanken konum alma askıya alınır (bkz. motion.py)
+    geofences         -> GeofenceMonitor; her konum bölgelere göre değerlendirilir (bkz. geofence.py)
+    uploader          -> Uploader; konumlar partiler halinde sunucuya yüklenir (bkz. uploader.py)
+    locate()          -> {'lat', 'lon', ...} veya None   (provider yerine, engelleyebilir)
+    geocode(lat, lon) -> adres metni                     (engelleyebilir)
+    notify(text)      -> bildirimi gönderir              (döngü iş parçacığında)
+    alert(text)       -> bölge olayını ayrı, sesli bildirimle gönderir (hız sınırı yok)
+    """
+
+    def __init__(self, geocoder_backend='offline', provider=None, locate=None, geocode=None,
+                 notify=None, http_client=None, scheduler=None, change_gate=None,
+                 lock=None, publisher=None, track_writer=None, offline_queue=None,
+                 clock=None, metrics=None, metrics_exporter=None, motion=None,
+                 geofences=None, uploader=None, alert=None, log_prefix='Engine'):
+        # Bağlantılar motor boyunca açık kalır, her güncellemede el sıkışma yapılmaz
+        self.http_client = http_client or HttpClient(user_agent=USER_AGENT)
+        self.geocoder = None
+        if geocode is None:
+            # 'offline': önce paketlenmiş sınırlar; 'nominatim': önce ağ (bkz. geocoder.py)
+            self.geocoder = create_geocoder(geocoder_backend, client=self.http_client)
+            geocode = self._geocode
+
+        # Konum kaynağı bir kez kaydolur, her tur yalnızca kuyruğu okur
+        self.provider = None
+        if locate is None:
+            self.provider = provider or create_location_provider()
+            locate = self.provider.latest
+
+        # Simülasyonda sanal saat (bkz. clock.py, simulation.py)
+        self.clock = clock or SystemClock()
+        self.locate = locate
+        self.geocode = geocode
+        self.notify = notify or send_location_notification
+        # Bölge olayları konum bildirimiyle birleştirilmez, sınırlanmaz
+        self.alert = alert or send_geofence_notification
+        self.scheduler = scheduler or AdaptiveScheduler(clock=self.clock.time)
+        self.change_gate = change_gate or ChangeGate()
+        self.lock = lock or ProcessLock()
+        # Arayüze konum/durum yayını (isteğe bağlı, bkz. status_channel.py)
+        self.publisher = publisher
+        # Konum geçmişi (isteğe bağlı, bkz. track_store.py)
+        self.track_writer = track_writer
+        # Ağ yokken çözümlenemeyen konumlar (isteğe bağlı, bkz. offline_queue.py)
+        self.offline_queue = offline_queue
+        self.flusher = None
+        if offline_queue is not None:
+            self.flusher = QueueFlusher(offline_queue, {KIND_FIX: self._resolve_backlog})
+        self._backlog_pending = False
+        # Hareket algılayıcı (isteğe bağlı); durağanken konum kaynağı kapalı kalır
+        self.motion = motion
+        self._suspended = False
+        # Bölge tetikleyicileri (isteğe bağlı); giriş/çıkış/bekleme bildirilir
+        self.geofences = geofences
+        # Konum geçmişi yükleyici (isteğe bağlı)
+        self.uploader = uploader
+        # Aşama süreleri, sayaçlar ve göstergeler (bkz. metrics.py)
+        self.metrics = metrics or Metrics()
+        self.metrics_exporter = metrics_exporter
+        self._register_samplers()
+        self.log_prefix = log_prefix
+        self.current_location = None
+        self.current_text = None
+        self._task = None
+        self._stopping = False
+        self._fixes = None
+        self._loop = None
+
+    def _register_samplers(self):
+        """Başka bileşenlerin sayaçlarını dışa aktarımda oku"""
+        metrics = self.metrics
+        metrics.sampler('gate', self.change_gate.stats)
+        metrics.sampler('http', self.http_client.stats)
+        metrics.sampler('cpu_seconds', time.process_time)
+        if self.geocoder is not None:
+            metrics.sampler('cache', self._cache_stats)
+        if self.notify is send_location_notification:
+            metrics.sampler('notifier', notifier.stats)
+        if self.geofences is not None:
+            metrics.sampler('geofence', self.geofences.stats)
+        if self.track_writer is not None and self.track_writer.simplifier is not None:
+            metrics.sampler('trajectory', self.track_writer.simplifier.stats)
+        if self.uploader is not None:
+            metrics.sampler('upload', self.uploader.stats)
+
+    def _cache_stats(self):
+        caches = geocoder_caches(self.geocoder)
+        return {'hits': sum(cache.hits for cache in caches),
+                'misses': sum(cache.misses for cache in caches)}
+
+    def _geocode(self, lat, lon):
+        return address_text(self.geocoder, lat, lon)
+
+    @property
+    def is_running(self):
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    def start(self):
+        """Hattı çalışan olay döngüsünde başlat"""
+        if self.is_running:
+            return self._task
+        previous = self._task
+        if previous is not None and not previous.done():
+            # Durdurulan döngü temizliğini bitirmeden yenisi kaynakları almasın
+            self._task = asyncio.ensure_future(self._run_after(previous))
+        else:
+            self._task = asyncio.ensure_future(self.run())
+        self._stopping = False
+        return self._task
+
+    def stop(self):
+        """Hattı beklemeden durdur (bekleyen uyku ve istekler iptal edilir)
+
+        Görev temizliği (sağlayıcı, yayıncı, kilit) bitene kadar saklanır;
+        bu sırada çağrılan start() yeni döngüyü onun ardından başlatır.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            self._stopping = True
+
+    async def _run_after(self, previous):
+        """Önceki döngünün finally bloğu bittikten sonra çalış"""
+        try:
+            await asyncio.wait({previous})
+        except asyncio.CancelledError:
+            # Bu görev de iptal edildiyse bitişi yine öncekinin temizliğinden sonra olsun
+            await asyncio.wait({previous})
+            raise
+        return await self.run()
+
+    async def run(self):
+        """Konum alma ve işleme görevlerini birlikte çalıştır"""
+        # Aynı süreç grubunda ikinci bir döngü GPS/HTTP/bildirim işini katlar
+        if not self.lock.acquire():
+            Logger.warning(f"{self.log_prefix}: Başka bir takip döngüsü çalışıyor - başlatılmadı")
+            return False
+
+        Logger.info(f"{self.log_prefix}: Takip döngüsü başladı")
+        self._loop = asyncio.get_running_loop()
+        if self.publisher is not None:
+            await self.publisher.start()
+        self._publish_status('running')
+
+        # En fazla bir konum bekler; işleme gecikirse eski konum yenisiyle değişir
+        self._fixes = asyncio.Queue(maxsize=1)
+        self._suspended = False
+        if self.provider is not None:
+            self.provider.start()
+        if self.motion is not None:
+            self.motion.start()
+        tasks = [asyncio.ensure_future(self._process_fixes())]
+        if self.flusher is not None:
+            self._backlog_pending = True
+            tasks.append(asyncio.ensure_future(self.flusher.run()))
+        if self.metrics_exporter is not None:
+            tasks.append(asyncio.ensure_future(self.metrics_exporter.run()))
+        if self.uploader is not None:
+            tasks.append(asyncio.ensure_future(self.uploader.run()))
+        try:
+            await self._acquire_loop()
+        finally:
+            if self.provider is not None and not self._suspended:
+                self.provider.stop()
+            if self.motion is not None:
+                self.motion.stop()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._publish_status('stopped')
+            if self.publisher is not None:
+                self.publisher.close()
+            self.lock.release()
+            Logger.info(f"{self.log_prefix}: Takip döngüsü durdu - HTTP {self.http_client.stats()}, "
+                        f"atlanan {self.change_gate.stats()}")
+
+    async def idle(self):
+        """Kuyruktaki konum işlenene kadar bekle"""
+        if self._fixes is not None:
+            await self._fixes.join()
+
+    def close(self):
+        """Ağ, önbellek ve dosya kaynaklarını bırak"""
+        if self.geocoder is not None:
+            self.geocoder.close()
+        if self.track_writer is not None:
+            self.track_writer.close()
+        if self.offline_queue is not None:
+            self.offline_queue.close()
+        if self.uploader is not None:
+            self.uploader.close()
+        self.http_client.close()
+
+    async def _acquire_loop(self):
+        while True:
+            metrics = self.metrics
+            if self._suspend_while_still():
+                # Konum, adres ve bildirim işi yok; yalnızca hareket yoklanır
+                metrics.incr('still_ticks')
+                if self.current_location is not None:
+                    # Durağan cihaz bölgede beklemeye devam ediyor
+                    self._check_geofences([dict(self.current_location, time=self.clock.time())])
+                self._publish_status('still', next_update=self.motion.poll_interval)
+                await self.clock.sleep(self.motion.poll_interval)
+                continue
+
+            try:
+                with metrics.timer('acquire'):
+                    location = await self._acquire()
+                # Önceki konum hâlâ işleniyorsa 1
+                metrics.gauge('queue_depth', self._fixes.qsize())
+                if location:
+                    self._offer(location)
+                else:
+                    metrics.incr('no_fix')
+                    Logger.warning(f"{self.log_prefix}: Konum alınamadı")
+                delay = self.scheduler.next_interval()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.incr('loop_errors')
+                Logger.error(f"{self.log_prefix}: Döngü hatası - {str(e)}")
+                delay = self.scheduler.record_error()
+
+            metrics.gauge('interval', delay)
+            self._publish_status('running', next_update=delay)
+            if self.clock.synchronous:
+                # Sanal zaman atlamadan önce konum işlensin
+                await self._fixes.join()
+            await self.clock.sleep(delay)
+
+    def _suspend_while_still(self):
+        """Cihaz durağansa konum kaynağını durdur, hareket başlayınca yeniden başlat"""
+        if self.motion is None:
+            return False
+
+        still = self.motion.update(self.scheduler.speed) == STILL
+        self.metrics.gauge('motion', self.motion.state)
+        if still != self._suspended:
+            self._suspended = still
+            if still:
+                Logger.info(f"{self.log_prefix}: Cihaz durağan - konum alma askıya alındı")
+                if self.provider is not None:
+                    self.provider.stop()
+            else:
+                Logger.info(f"{self.log_prefix}: Hareket algılandı - konum alma sürüyor")
+                # Askı öncesi hız tahmini geçersiz; ilk aralık taban değerden başlasın
+                self.scheduler.reset()
+                if self.provider is not None:
+                    self.provider.start()
+        return still
+
+    def _publish_status(self, state, **extra):
+        if self.publisher is not None:
+            self.publisher.publish('status', state=state, speed=self.scheduler.speed,
+                                   counters=self.change_gate.stats(), **extra)
+
+    async def _acquire(self):
+        """Son turdan beri gelen konumları işle, en güncelini döndür"""
+        if self.provider is None:
+            location = await asyncio.to_thread(self.locate)
+            fixes = [location] if location else []
+        else:
+            fixes = self.provider.drain()
+            location = fixes[-1] if fixes else self.provider.last_fix
+            if not fixes and location is not None:
+                # minDistance içinde kalındıysa sistem konum göndermez: durağan say
+                self.scheduler.observe(dict(location, time=self.clock.time()))
+
+        self.scheduler.observe_many(fixes)
+        self.metrics.incr('fixes', len(fixes))
+        if fixes:
+            self._check_geofences(fixes)
+        elif location is not None:
+            self._check_geofences([dict(location, time=self.clock.time())])
+        # Dosya ve SQLite yazımları olay döngüsünü bekletmesin
+        if self.track_writer is not None and fixes:
+            await asyncio.to_thread(self.track_writer.append_many, fixes)
+        if self.uploader is not None and fixes:
+            await asyncio.to_thread(self.uploader.add_many, fixes)
+        return location
+
+    def _check_geofences(self, fixes):
+        """Konumları bölgelere göre değerlendir, olayları bildir ve yayınla"""
+        if self.geofences is None:
+            return
+        with self.metrics.timer('geofence'):
+            events = [event for fix in fixes for event in self.geofences.update(fix)]
+
+        for event in events:
+            self.metrics.incr(f"geofence_{event['type']}")
+            if self.publisher is not None:
+                self.publisher.publish('geofence', **event)
+            text = event_text(event)
+            self.alert(text)
+            Logger.info(f"{self.log_prefix}: {text}")
+
+    def _offer(self, location):
+        """Konumu kuyruğa koy, işlenmemiş eski konumu at"""
+        if self._fixes.full():
+            self._fixes.get_nowait()
+            self._fixes.task_done()
+            self.metrics.incr('fixes_dropped')
+        self._fixes.put_nowait(location)
+
+    async def _process_fixes(self):
+        while True:
+            location = await self._fixes.get()
+            try:
+                with self.metrics.timer('process'):
+                    await self.process(location)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.metrics.incr('process_errors')
+                Logger.error(f"{self.log_prefix}: İşleme hatası - {str(e)}")
+            finally:
+                self._fixes.task_done()
+
+    def _track_backlog(self, location, resolved):
+        """Çözümlenemeyen konumu kuyruğa al; çözümleme başarılıysa kuyruğu boşalt"""
+        if self.offline_queue is None:
+            return
+        if not resolved:
+            self.offline_queue.push(KIND_FIX, location)
+            self._backlog_pending = True
+        elif self._backlog_pending:
+            # Ağ geri geldi: yoklama aralığını beklemeden boşalt
+            self._backlog_pending = False
+            self.flusher.wake()
+
+    def _resolve_backlog(self, fixes):
+        """Kuyruktaki konumları toplu çözümle (iş parçacığında çalışır)"""
+        if self.geocoder is not None:
+            batch = BatchGeocoder(remote=self.geocoder)
+            addresses = batch.reverse_many([(fix['lat'], fix['lon']) for fix in fixes])
+            # Adresi olmayan yer (ör. deniz) çözümlenmiş sayılır; yalnızca hatalar yeniden denenir
+            done = [not failed for failed in batch.last_failed]
+            texts = [format_address(address) for address in addresses if address is not None]
+        else:
+            texts = [self.geocode(fix['lat'], fix['lon']) for fix in fixes]
+            done = [is_resolved(text) for text in texts]
+            texts = [text for text in texts if is_resolved(text)]
+
+        # Çevrimdışıyken geçilen bölgeler (sırasıyla, tekrarsız)
+        regions = [text for i, text in enumerate(texts) if i == 0 or text != texts[i - 1]]
+        if regions and self.publisher is not None:
+            self._loop.call_soon_threadsafe(
+                lambda: self.publisher.publish('backfill', resolved=sum(done), regions=regions))
+        return done
+
+    async def process(self, location):
+        """Tek bir konumu çözümle ve gerekiyorsa bildir"""
+        gate = self.change_gate
+        metrics = self.metrics
+        self.current_location = location
+
+        # Yakın konumu yeniden çözümleme, aynı bölgeyi yeniden bildirme
+        resolved = True
+        if gate.should_geocode(location):
+            with metrics.timer('geocode'):
+                text = await asyncio.to_thread(self.geocode, location['lat'], location['lon'])
+            resolved = is_resolved(text)
+            if not resolved:
+                metrics.incr('geocode_timeouts' if text == TEXT_TIMEOUT else 'geocode_failures')
+            gate.record_geocode(location, text, resolved)
+            self._track_backlog(location, resolved)
+        else:
+            metrics.incr('geocode_skipped')
+            text = gate.last_text
+
+        self.current_text = text
+        if self.publisher is not None:
+            self.publisher.publish('location', lat=location['lat'], lon=location['lon'],
+                                   provider=location.get('provider'), text=text)
+
+        if gate.should_notify(text, resolved):
+            with metrics.timer('notify'):
+                self.notify(text)
+            metrics.incr('notifications')
+            Logger.info(f"{self.log_prefix}: Konum güncellendi - {text}")
+        elif not resolved:
+            metrics.incr('notifications_suppressed')
+            Logger.info(f"{self.log_prefix}: Adres çözümlenemedi, bildirim atlandı - {text}")
+        else:
+            metrics.incr('notifications_suppressed')
+            Logger.info(f"{self.log_prefix}: Bölge değişmedi - {text}")
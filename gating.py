@@ -0,0 +1,92 @@
+"""
+Önemli Değişiklik Filtresi
+Konum yeterince değişmediyse geocoding'i, bölge değişmediyse bildirimi atlar
+"""
+
+from geometry import first_departure, haversine_m, np
+
+DEFAULT_MIN_DISTANCE = 200      # metre
+
+
+class ChangeGate:
+    """Geocoding ve bildirim öncesi değişiklik kontrolü"""
+
+    def __init__(self, min_distance=DEFAULT_MIN_DISTANCE):
+        self.min_distance = min_distance
+        self.last_geocoded = None       # son çözümlenen konum
+        self.last_text = None           # son çözümlenen adres metni
+        self.last_notified = None       # son bildirilen adres metni
+        self.counters = {
+            'ticks': 0,
+            'geocoded': 0,
+            'geocode_skipped': 0,
+            'notified': 0,
+            'notification_suppressed': 0,
+        }
+
+    def should_geocode(self, location):
+        """Son çözümlenen konumdan yeterince uzaklaşıldı mı"""
+        self.counters['ticks'] += 1
+
+        if self.last_geocoded is None or self.last_text is None:
+            return True
+
+        distance = haversine_m(self.last_geocoded['lat'], self.last_geocoded['lon'],
+                               location['lat'], location['lon'])
+        if distance >= self.min_distance:
+            return True
+
+        self.counters['geocode_skipped'] += 1
+        return False
+
+    def geocode_indices(self, lat, lon):
+        """Bir iz boyunca geocoding yapılacak noktaların sıraları (çözümlemeler başarılı sayılır)
+
+        Sayaçları ve durumu değiştirmez; NumPy gerekir.
+        """
+        if np is None:
+            raise RuntimeError("NumPy yüklü değil")
+        lat = np.ascontiguousarray(lat, dtype=np.float64)
+        lon = np.ascontiguousarray(lon, dtype=np.float64)
+        # first_departure '>' ile karşılaştırır, should_geocode '>=' ile
+        radius = np.nextafter(self.min_distance, 0)
+        indices = []
+        if self.last_geocoded is not None and self.last_text is not None:
+            index = first_departure(self.last_geocoded['lat'], self.last_geocoded['lon'],
+                                    lat, lon, radius)
+        else:
+            index = 0
+
+        while index < lat.size:
+            indices.append(index)
+            index = first_departure(lat[index], lon[index], lat, lon, radius, index + 1)
+        return indices
+
+    def record_geocode(self, location, text, resolved=True):
+        """Geocoding sonucunu kaydet; çözümlenemeyen sonuç bir sonraki turda yeniden denenir"""
+        self.counters['geocoded'] += 1
+        if resolved:
+            self.last_geocoded = {'lat': location['lat'], 'lon': location['lon']}
+            self.last_text = text
+        else:
+            self.last_geocoded = None
+            self.last_text = None
+
+    def should_notify(self, text, resolved=True):
+        """Adres son bildirimden farklı mı
+
+        Çözümlenemeyen adresin yer tutucu metni bildirilmez ve son bildirilen
+        adresi değiştirmez; bölgeden çıkılmadıysa sonraki başarılı çözümleme
+        yeniden bildirim üretmez.
+        """
+        if not resolved or text == self.last_notified:
+            self.counters['notification_suppressed'] += 1
+            return False
+
+        self.last_notified = text
+        self.counters['notified'] += 1
+        return True
+
+    def stats(self):
+        """Atlanan iş sayaçları"""
+        return dict(self.counters)
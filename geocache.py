@@ -0,0 +1,188 @@
+"""
+Ters Geocoding Önbelleği
+Koordinatları geohash hücrelerine göre anahtarlayan kalıcı (SQLite) önbellek
+Uygulama ve arka plan servisi aynı dosyayı paylaşır
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from runtime import Logger
+
+# Geohash alfabesi (base32)
+_GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Varsayılan ayarlar
+DEFAULT_PRECISION = 6           # ~1.2 km x 0.6 km hücre
+DEFAULT_TTL = 7 * 24 * 3600     # 1 hafta
+DEFAULT_MAX_ENTRIES = 2000
+CACHE_FILENAME = 'geocache.sqlite3'
+
+
+def geohash_encode(lat, lon, precision=DEFAULT_PRECISION):
+    """Koordinatı verilen hassasiyette geohash dizesine çevir"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        # Çift bitler boylamı, tek bitler enlemi böler
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits = bits << 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def default_data_dir():
+    """Uygulamanın yazılabilir veri klasörünü bul"""
+    # python-for-android, uygulama ve servis için bu değişkeni ayarlar
+    base = os.environ.get('ANDROID_PRIVATE')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.location_tracker')
+    os.makedirs(base, exist_ok=True)
+    return base
+
+
+class GeocodeCache:
+    """Geohash hücresi anahtarlı, TTL ve LRU destekli kalıcı önbellek"""
+
+    def __init__(self, path=None, precision=DEFAULT_PRECISION,
+                 ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or os.path.join(default_data_dir(), CACHE_FILENAME)
+        self.precision = precision
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        """Veritabanı bağlantısını (gerekirse) aç"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=5,
+                                         check_same_thread=False)
+            # Uygulama ve servis süreçleri aynı anda okuyup yazabilsin
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS geocache ('
+                ' cell TEXT PRIMARY KEY,'
+                ' address TEXT NOT NULL,'
+                ' created REAL NOT NULL,'
+                ' last_access REAL NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS geocache_last_access'
+                ' ON geocache (last_access)'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def cell_for(self, lat, lon):
+        """Koordinatın önbellek anahtarını döndür"""
+        return geohash_encode(lat, lon, self.precision)
+
+    def get(self, lat, lon):
+        """Önbellekteki adres sözlüğünü döndür, yoksa None"""
+        cell = self.cell_for(lat, lon)
+        now = time.time()
+
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    'SELECT address, created FROM geocache WHERE cell = ?',
+                    (cell,)
+                ).fetchone()
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                address, created = row
+                if now - created > self.ttl:
+                    # Süresi dolmuş kayıt
+                    conn.execute('DELETE FROM geocache WHERE cell = ?', (cell,))
+                    conn.commit()
+                    self.misses += 1
+                    return None
+
+                conn.execute(
+                    'UPDATE geocache SET last_access = ? WHERE cell = ?',
+                    (now, cell)
+                )
+                conn.commit()
+                self.hits += 1
+                return json.loads(address)
+
+        except sqlite3.Error as e:
+            Logger.error(f"GeocodeCache: Okuma hatası - {str(e)}")
+            self.misses += 1
+            return None
+
+    def put(self, lat, lon, address):
+        """Adres sözlüğünü önbelleğe yaz"""
+        cell = self.cell_for(lat, lon)
+        now = time.time()
+
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    'INSERT OR REPLACE INTO geocache'
+                    ' (cell, address, created, last_access) VALUES (?, ?, ?, ?)',
+                    (cell, json.dumps(address, ensure_ascii=False), now, now)
+                )
+                self._evict(conn)
+                conn.commit()
+
+        except sqlite3.Error as e:
+            Logger.error(f"GeocodeCache: Yazma hatası - {str(e)}")
+
+    def _evict(self, conn):
+        """Kapasite aşıldıysa en uzun süre kullanılmayan kayıtları sil"""
+        count = conn.execute('SELECT COUNT(*) FROM geocache').fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM geocache WHERE cell IN ('
+                ' SELECT cell FROM geocache ORDER BY last_access ASC LIMIT ?)',
+                (excess,)
+            )
+
+    def purge_expired(self):
+        """Süresi dolmuş tüm kayıtları temizle"""
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute('DELETE FROM geocache WHERE created < ?',
+                             (time.time() - self.ttl,))
+                conn.commit()
+        except sqlite3.Error as e:
+            Logger.error(f"GeocodeCache: Temizleme hatası - {str(e)}")
+
+    def close(self):
+        """Bağlantıyı kapat"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,296 @@
+"""
+Ters Geocoding Arka Uçları
+Uygulama ve arka plan servisinin ortak kullandığı Geocoder arayüzü ve uygulamaları
+"""
+
+import time
+
+from geocache import GeocodeCache
+from http_client import HttpClient, TransportError, TransportTimeout
+from offline_geocoder import OfflineResolver
+from resilience import CircuitBreaker, TokenBucket, default_limiter_path
+from runtime import Logger
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/reverse"
+USER_AGENT = "LocationTracker/1.0"
+# Nominatim kullanım politikası: saniyede en fazla bir istek
+NOMINATIM_RATE = 1.0
+
+# Kullanıcıya gösterilen yer tutucu metinler
+TEXT_UNKNOWN = "Konum belirlenemedi"
+TEXT_FAILED = "Adres bilgisi alınamadı"
+TEXT_TIMEOUT = "Bağlantı zaman aşımı"
+
+
+class GeocoderError(Exception):
+    """Arka uç adres çözümleyemedi (ağ, HTTP veya veri hatası)"""
+
+
+class GeocoderTimeout(GeocoderError):
+    """Arka uç zaman aşımına uğradı"""
+
+
+class GeocoderUnavailable(GeocoderError):
+    """İstek gönderilmedi (hız sınırı veya açık devre); sonraki arka uca geçilir"""
+
+
+class Geocoder:
+    """Ters geocoding arka ucu arayüzü
+
+    reverse() Nominatim 'address' biçiminde bir sözlük, bölge bulunamazsa None
+    döndürür; çözümleme yapılamazsa GeocoderError fırlatır.
+    """
+
+    name = 'geocoder'
+
+    def reverse(self, lat, lon):
+        raise NotImplementedError
+
+    def close(self):
+        """Arka ucun kaynaklarını bırak"""
+
+
+class NominatimGeocoder(Geocoder):
+    """Nominatim (OpenStreetMap) HTTP arka ucu"""
+
+    name = 'nominatim'
+
+    def __init__(self, url=NOMINATIM_URL, zoom=10, language='tr', client=None):
+        self.url = url
+        self.zoom = zoom
+        self.language = language
+        # Dışarıdan verilen istemcinin ömrünü sahibi yönetir
+        self._owns_client = client is None
+        self.client = client if client is not None else HttpClient(user_agent=USER_AGENT)
+
+    def reverse(self, lat, lon):
+        params = {
+            'lat': lat,
+            'lon': lon,
+            'format': 'json',
+            'addressdetails': 1,
+            'accept-language': self.language,
+            'zoom': self.zoom
+        }
+
+        try:
+            response = self.client.get(self.url, params=params)
+        except TransportTimeout as e:
+            raise GeocoderTimeout(str(e)) from e
+        except TransportError as e:
+            raise GeocoderError(str(e)) from e
+
+        if response.status_code != 200:
+            raise GeocoderError(f"HTTP {response.status_code}")
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise GeocoderError(f"Geçersiz yanıt - {str(e)}") from e
+
+        return data.get('address') or None
+
+    def close(self):
+        if self._owns_client:
+            self.client.close()
+
+
+class OfflineGeocoder(Geocoder):
+    """Paketlenmiş sınır poligonlarıyla çalışan çevrimdışı arka uç"""
+
+    name = 'offline'
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+
+    def reverse(self, lat, lon):
+        return self.resolver.lookup(lat, lon)
+
+
+class GuardedGeocoder(Geocoder):
+    """Arka ucu token kovası ve devre kesiciyle saran arka uç
+
+    Token yoksa veya devre açıksa istek gönderilmeden GeocoderUnavailable
+    fırlatılır; zincirde önbellek ve çevrimdışı çözümleme devreye girer.
+    wait > 0 ise token için en fazla bu kadar beklenir (toplu çözümleme).
+    """
+
+    name = 'guarded'
+
+    def __init__(self, backend, limiter=None, breaker=None, wait=0.0):
+        self.backend = backend
+        self.limiter = limiter
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.wait = wait
+        self.name = f"guarded-{backend.name}"
+
+    def reverse(self, lat, lon):
+        if not self.breaker.allow():
+            raise GeocoderUnavailable("Devre açık")
+        if self.limiter is not None:
+            allowed = (self.limiter.acquire(self.wait) if self.wait > 0
+                       else self.limiter.try_acquire())
+            if not allowed:
+                self.breaker.release()
+                raise GeocoderUnavailable("Hız sınırı")
+
+        try:
+            address = self.backend.reverse(lat, lon)
+        except GeocoderError:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return address
+
+    def close(self):
+        self.backend.close()
+        if self.limiter is not None:
+            self.limiter.close()
+
+
+class CachedGeocoder(Geocoder):
+    """Başka bir arka ucu geohash önbelleğiyle saran arka uç"""
+
+    name = 'cached'
+
+    def __init__(self, backend, cache=None):
+        self.backend = backend
+        self.cache = cache if cache is not None else GeocodeCache()
+
+    def reverse(self, lat, lon):
+        address = self.cache.get(lat, lon)
+        if address is not None:
+            return address
+
+        address = self.backend.reverse(lat, lon)
+        if address is not None:
+            self.cache.put(lat, lon, address)
+        return address
+
+    def close(self):
+        self.backend.close()
+        self.cache.close()
+
+
+class FallbackGeocoder(Geocoder):
+    """Arka uçları sırayla dener, ilk sonucu döndürür"""
+
+    name = 'fallback'
+
+    def __init__(self, backends):
+        self.backends = list(backends)
+
+    def reverse(self, lat, lon):
+        last_error = None
+        for backend in self.backends:
+            try:
+                address = backend.reverse(lat, lon)
+            except GeocoderError as e:
+                Logger.warning(f"Geocoder: {backend.name} başarısız - {str(e)}")
+                last_error = e
+                continue
+            if address is not None:
+                return address
+
+        if last_error is not None:
+            raise last_error
+        return None
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
+
+
+def nominatim_limiter():
+    """Uygulama, servis ve araçların paylaştığı Nominatim token kovası"""
+    return TokenBucket(NOMINATIM_RATE, name='nominatim', path=default_limiter_path())
+
+
+def create_geocoder(backend='offline', cache=None, nominatim_url=NOMINATIM_URL, client=None,
+                    limiter=None, limiter_wait=2.0):
+    """Ayarlara göre arka uç zincirini kur
+
+    'offline'  : paketlenmiş sınırlar, sonra önbellekli Nominatim
+    'nominatim': önbellekli Nominatim, hata olursa paketlenmiş sınırlar
+
+    Nominatim paylaşılan token kovası ve devre kesiciyle korunur; devre
+    açıkken istek gönderilmez, önbellek ve paketlenmiş sınırlar kullanılır.
+    """
+    if backend not in ('offline', 'nominatim'):
+        raise ValueError(f"Bilinmeyen geocoder arka ucu: {backend}")
+
+    nominatim = GuardedGeocoder(NominatimGeocoder(url=nominatim_url, client=client),
+                                limiter=limiter or nominatim_limiter(), wait=limiter_wait)
+    chain = [CachedGeocoder(nominatim, cache)]
+
+    resolver = OfflineResolver.load_default()
+    if resolver is not None:
+        offline = OfflineGeocoder(resolver)
+        if backend == 'offline':
+            chain.insert(0, offline)
+        else:
+            chain.append(offline)
+
+    return chain[0] if len(chain) == 1 else FallbackGeocoder(chain)
+
+
+def geocoder_caches(geocoder):
+    """Arka uç zincirindeki önbellekleri döndür"""
+    if isinstance(geocoder, CachedGeocoder):
+        return [geocoder.cache]
+    if isinstance(geocoder, FallbackGeocoder):
+        return [cache for backend in geocoder.backends for cache in geocoder_caches(backend)]
+    return []
+
+
+def format_address(address):
+    """Adres sözlüğünü 'ilçe / şehir / il' metnine çevir"""
+    if not address:
+        return TEXT_UNKNOWN
+
+    # Türkiye için il/ilçe bilgisi
+    state = address.get('state', '') or address.get('province', '')
+    city = (address.get('city', '') or address.get('town', '')
+            or address.get('county', '') or address.get('village', ''))
+    district = address.get('suburb', '') or address.get('neighbourhood', '')
+
+    location_parts = []
+    if district:
+        location_parts.append(district)
+    if city and city != district:
+        location_parts.append(city)
+    if state and state not in location_parts:
+        location_parts.append(state)
+
+    return " / ".join(location_parts) if location_parts else TEXT_UNKNOWN
+
+
+def address_text(geocoder, lat, lon):
+    """Koordinatı bildirimde gösterilecek metne çevir, hataları yer tutucuya dönüştür"""
+    try:
+        return format_address(geocoder.reverse(lat, lon))
+    except GeocoderTimeout:
+        Logger.error("Geocoder: Zaman aşımı")
+        return TEXT_TIMEOUT
+    except GeocoderError as e:
+        Logger.error(f"Geocoder: Reverse geocoding hatası - {str(e)}")
+        return TEXT_FAILED
+
+
+def is_resolved(text):
+    """Metin gerçek bir çözümleme sonucu mu (hata yer tutucusu değil)"""
+    return text not in (TEXT_FAILED, TEXT_TIMEOUT)
+
+
+def measure_latency(geocoder, points, repeat=1):
+    """Arka ucun nokta başına gecikmesini (saniye) ölç"""
+    timings = []
+    for _ in range(repeat):
+        for lat, lon in points:
+            start = time.perf_counter()
+            try:
+                geocoder.reverse(lat, lon)
+            except GeocoderError:
+                pass
+            timings.append(time.perf_counter() - start)
+    return timings
@@ -0,0 +1,356 @@
+"""
+Bölge Tetikleyicileri (Geofence)
+Operatörün tanımladığı daire ve poligon bölgeler için giriş, çıkış ve
+bekleme olayları üretir. Motor her konumu GeofenceMonitor.update() ile
+değerlendirir.
+
+Bölgeler bbox'larına göre ızgara hücrelerine dağıtılır; bir konum yalnızca
+kendi hücresindeki bölgelerle karşılaştırılır. Çıkış için konumun sınırdan
+en az histerezis payı (veya konum doğruluğu) kadar uzaklaşması gerekir,
+böylece sınırda dolaşan konumlar ardışık giriş/çıkış üretmez.
+
+Dosya biçimi (geofences.ndjson, satır başına bir JSON nesnesi):
+    {"id": "ev", "name": "Ev", "lat": 41.0, "lon": 29.0, "radius": 150, "dwell": 600}
+    {"id": "park", "name": "Park", "polygon": [[41.0, 29.0], [41.01, 29.0], ...]}
+    {"id": "ev", "deleted": true}
+
+Dosyaya yalnızca ekleme yapılır; aynı id'li sonraki satır öncekinin yerini
+alır. Dosya yalnızca büyüdüğü kadar okunur; kısalır veya değişirse baştan
+yüklenir. İçinde bulunulan bölge silinirse (ya da yeniden yüklenen dosyada
+yoksa) bir sonraki konumda çıkış olayı üretilir; yeniden yüklemede kalan
+bölgelerin giriş zamanı ve bekleme durumu korunur.
+"""
+
+import json
+import math
+import os
+import time
+
+from geocache import default_data_dir
+from geometry import EARTH_RADIUS_M
+from runtime import Logger
+
+GEOFENCE_FILENAME = 'geofences.ndjson'
+
+ENTER = 'enter'
+EXIT = 'exit'
+DWELL = 'dwell'
+
+# Izgara hücre boyutu (derece, ~1 km)
+DEFAULT_CELL = 0.01
+DEFAULT_HYSTERESIS = 25.0       # metre
+DEFAULT_DWELL = 300             # saniye; 0 ise bekleme olayı yok
+DEFAULT_RELOAD_INTERVAL = 60    # saniye; dosya değişikliği kontrol aralığı
+DEFAULT_BATCH = 5000            # bir yenilemede okunan en fazla satır
+
+_METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+
+class CircleFence:
+    """Merkez ve yarıçapla (metre) tanımlı bölge"""
+
+    kind = 'circle'
+
+    def __init__(self, fence_id, name, lat, lon, radius, dwell=None):
+        self.id = fence_id
+        self.name = name
+        self.lat = lat
+        self.lon = lon
+        self.radius = radius
+        self.dwell = dwell
+        self._cos_lat = math.cos(math.radians(lat))
+        dlat = radius / _METERS_PER_DEGREE
+        dlon = dlat / max(self._cos_lat, 1e-6)
+        self.bbox = (lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+
+    def _distance(self, lat, lon):
+        # Eşdikdörtgen yaklaşım: bölge ölçeğinde haversine ile fark metrenin altında
+        dx = (lon - self.lon) * self._cos_lat
+        dy = lat - self.lat
+        return math.sqrt(dx * dx + dy * dy) * _METERS_PER_DEGREE
+
+    def contains(self, lat, lon):
+        return self._distance(lat, lon) <= self.radius
+
+    def distance_outside(self, lat, lon):
+        """Sınırın dışındaki uzaklık (metre), içerideyse 0"""
+        return max(0.0, self._distance(lat, lon) - self.radius)
+
+
+class PolygonFence:
+    """Köşe listesiyle ((lat, lon), ...) tanımlı bölge"""
+
+    kind = 'polygon'
+
+    def __init__(self, fence_id, name, points, dwell=None):
+        if len(points) < 3:
+            raise ValueError("Poligon en az 3 köşe içermeli")
+        self.id = fence_id
+        self.name = name
+        self.dwell = dwell
+        self.lats = [float(p[0]) for p in points]
+        self.lons = [float(p[1]) for p in points]
+        self.bbox = (min(self.lats), min(self.lons), max(self.lats), max(self.lons))
+        self._cos_lat = math.cos(math.radians((self.bbox[0] + self.bbox[2]) / 2))
+
+    def contains(self, lat, lon):
+        """Çift-tek kuralıyla nokta poligonun içinde mi"""
+        min_lat, min_lon, max_lat, max_lon = self.bbox
+        if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+            return False
+
+        lats, lons = self.lats, self.lons
+        inside = False
+        j = len(lats) - 1
+        for i in range(len(lats)):
+            yi, yj = lats[i], lats[j]
+            if (yi > lat) != (yj > lat) and \
+                    lon < (lons[j] - lons[i]) * (lat - yi) / (yj - yi) + lons[i]:
+                inside = not inside
+            j = i
+        return inside
+
+    def distance_outside(self, lat, lon):
+        """Kenarlara en kısa uzaklık (metre), içerideyse 0"""
+        if self.contains(lat, lon):
+            return 0.0
+
+        # Yerel düzlemde (metre) nokta-doğru parçası uzaklığı
+        scale = self._cos_lat
+        best = math.inf
+        j = len(self.lats) - 1
+        for i in range(len(self.lats)):
+            ax, ay = (self.lons[j] - lon) * scale, self.lats[j] - lat
+            bx, by = (self.lons[i] - lon) * scale, self.lats[i] - lat
+            dx, dy = bx - ax, by - ay
+            length = dx * dx + dy * dy
+            t = 0.0 if length == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length))
+            px, py = ax + t * dx, ay + t * dy
+            best = min(best, px * px + py * py)
+            j = i
+        return math.sqrt(best) * _METERS_PER_DEGREE
+
+
+def parse_fence(record):
+    """Dosya satırını bölgeye çevir; geçersizse ValueError"""
+    fence_id = str(record['id'])
+    name = record.get('name') or fence_id
+    dwell = record.get('dwell')
+    if 'polygon' in record:
+        return PolygonFence(fence_id, name, record['polygon'], dwell)
+    radius = float(record['radius'])
+    if radius <= 0:
+        raise ValueError("Yarıçap pozitif olmalı")
+    return CircleFence(fence_id, name, float(record['lat']), float(record['lon']), radius, dwell)
+
+
+class GeofenceIndex:
+    """Bölgeleri bbox'larına göre ızgara hücrelerine dağıtan indeks"""
+
+    def __init__(self, cell=DEFAULT_CELL):
+        self.cell = cell
+        self.fences = {}
+        self._grid = {}
+        self._cells = {}
+
+    def __len__(self):
+        return len(self.fences)
+
+    def _cell(self, lat, lon):
+        return int(lat // self.cell), int(lon // self.cell)
+
+    def add(self, fence):
+        """Bölgeyi ekle; aynı id'li bölge varsa yerine geçer"""
+        self.remove(fence.id)
+        min_lat, min_lon, max_lat, max_lon = fence.bbox
+        y0, x0 = self._cell(min_lat, min_lon)
+        y1, x1 = self._cell(max_lat, max_lon)
+        cells = [(y, x) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+        for key in cells:
+            self._grid.setdefault(key, []).append(fence)
+        self.fences[fence.id] = fence
+        self._cells[fence.id] = cells
+
+    def remove(self, fence_id):
+        fence = self.fences.pop(fence_id, None)
+        if fence is None:
+            return None
+        for key in self._cells.pop(fence_id):
+            bucket = self._grid[key]
+            bucket.remove(fence)
+            if not bucket:
+                del self._grid[key]
+        return fence
+
+    def clear(self):
+        self.fences.clear()
+        self._grid.clear()
+        self._cells.clear()
+
+    def candidates(self, lat, lon):
+        """Konumun hücresindeki bölgeler"""
+        return self._grid.get(self._cell(lat, lon), ())
+
+    def query(self, lat, lon):
+        """Konumu içeren bölgeler"""
+        return [fence for fence in self.candidates(lat, lon) if fence.contains(lat, lon)]
+
+
+def default_geofence_path():
+    """Bölge dosyasının varsayılan yolu"""
+    return os.path.join(default_data_dir(), GEOFENCE_FILENAME)
+
+
+class GeofenceMonitor:
+    """Konum akışından giriş/çıkış/bekleme olayları üreten izleyici
+
+    update(fix) her konum için çağrılır ve olay sözlüklerinin listesini
+    döndürür: {'type', 'id', 'name', 'time', 'lat', 'lon'}.
+    """
+
+    def __init__(self, path=None, cell=DEFAULT_CELL, hysteresis=DEFAULT_HYSTERESIS,
+                 dwell=DEFAULT_DWELL, reload_interval=DEFAULT_RELOAD_INTERVAL,
+                 batch=DEFAULT_BATCH, clock=time.time):
+        self.path = path or default_geofence_path()
+        self.index = GeofenceIndex(cell)
+        self.hysteresis = hysteresis
+        self.dwell = dwell
+        self.reload_interval = reload_interval
+        self.batch = batch
+        self.clock = clock
+        # Bölge id -> {'fence', 'since': giriş zamanı, 'dwelled': bekleme bildirildi mi}
+        self.active = {}
+        self.events = {ENTER: 0, EXIT: 0, DWELL: 0}
+        self.evaluated = 0
+        self.checked = 0
+        self.invalid = 0
+        self._offset = 0
+        self._identity = None
+        self._pending = False
+        self._next_refresh = None
+
+    def refresh(self):
+        """Dosyada yeni satır varsa oku; dosya değiştiyse baştan yükle"""
+        self._next_refresh = self.clock() + self.reload_interval
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._identity is not None:
+                self._reset()
+            return 0
+        except OSError as e:
+            Logger.error(f"Geofence: Bölge dosyası okunamadı - {str(e)}")
+            return 0
+
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self._identity or stat.st_size < self._offset:
+            self._reset()
+            self._identity = identity
+        if stat.st_size == self._offset:
+            return 0
+
+        loaded = 0
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                for raw in f:
+                    # Yazımı sürmekte olan son satır bir sonraki yenilemede okunur
+                    if not raw.endswith(b'\n'):
+                        break
+                    self._offset += len(raw)
+                    self._apply(raw)
+                    loaded += 1
+                    if loaded >= self.batch:
+                        break
+        except OSError as e:
+            Logger.error(f"Geofence: Bölge dosyası okunamadı - {str(e)}")
+        # Kalan satırlar bir sonraki konumda, aralığı beklemeden okunur
+        self._pending = self._offset < stat.st_size and loaded >= self.batch
+        if loaded:
+            Logger.info(f"Geofence: {loaded} satır okundu, {len(self.index)} bölge")
+        return loaded
+
+    def _reset(self):
+        # active korunur: kaybolan bölgeler update()'te çıkış olayıyla düşer
+        self.index.clear()
+        self._offset = 0
+        self._identity = None
+
+    def _apply(self, raw):
+        try:
+            record = json.loads(raw)
+            if record.get('deleted'):
+                self.index.remove(str(record['id']))
+            else:
+                self.index.add(parse_fence(record))
+        except (ValueError, KeyError, TypeError) as e:
+            self.invalid += 1
+            Logger.warning(f"Geofence: Geçersiz bölge satırı atlandı - {str(e)}")
+
+    def _event(self, kind, fence, fix):
+        self.events[kind] += 1
+        return {'type': kind, 'id': fence.id, 'name': fence.name, 'time': fix['time'],
+                'lat': fix['lat'], 'lon': fix['lon']}
+
+    def update(self, fix):
+        """Konumu değerlendir, yeni olayları döndür"""
+        if self._pending or self._next_refresh is None or self.clock() >= self._next_refresh:
+            self.refresh()
+
+        lat, lon, now = fix['lat'], fix['lon'], fix['time']
+        index = self.index
+        self.evaluated += 1
+        events = []
+
+        # Çıkış: içerideki bölgeler sınırdan pay kadar uzaklaşınca
+        margin = max(self.hysteresis, fix.get('accuracy') or 0.0)
+        for fence_id, state in list(self.active.items()):
+            fence = index.fences.get(fence_id)
+            if fence is None:
+                # Yükleme sürerken bölge henüz okunmamış olabilir
+                if not self._pending:
+                    del self.active[fence_id]
+                    events.append(self._event(EXIT, state['fence'], fix))
+                continue
+            state['fence'] = fence
+            if fence.distance_outside(lat, lon) > margin:
+                del self.active[fence_id]
+                events.append(self._event(EXIT, fence, fix))
+            elif not state['dwelled']:
+                dwell = fence.dwell if fence.dwell is not None else self.dwell
+                if dwell and now - state['since'] >= dwell:
+                    state['dwelled'] = True
+                    events.append(self._event(DWELL, fence, fix))
+
+        # Giriş: yalnızca konumun hücresindeki bölgeler denenir
+        candidates = index.candidates(lat, lon)
+        self.checked += len(candidates)
+        for fence in candidates:
+            if fence.id not in self.active and fence.contains(lat, lon):
+                self.active[fence.id] = {'fence': fence, 'since': now, 'dwelled': False}
+                events.append(self._event(ENTER, fence, fix))
+        return events
+
+    def inside(self):
+        """İçinde bulunulan bölgeler"""
+        return [state['fence'] for state in self.active.values()]
+
+    def stats(self):
+        return {
+            'fences': len(self.index),
+            'active': len(self.active),
+            'evaluated': self.evaluated,
+            'checked': self.checked,
+            'invalid': self.invalid,
+            **self.events,
+        }
+
+
+def event_text(event):
+    """Olayı bildirim metnine çevir"""
+    if event['type'] == ENTER:
+        return f"Bölgeye girildi: {event['name']}"
+    if event['type'] == EXIT:
+        return f"Bölgeden çıkıldı: {event['name']}"
+    return f"Bölgede bekleniyor: {event['name']}"
+
@@ -0,0 +1,209 @@
+"""
+Geometri Yardımcıları
+Konumlar arası mesafe ve hız hesapları
+
+Tek nokta fonksiyonları saf Python'dur. *_array çekirdekleri ardışık
+float64 NumPy dizileri üzerinde çalışır ve milyonlarca noktalık izleri tek
+çağrıda işler (NumPy gerekir).
+"""
+
+import math
+
+from runtime import lazy_import
+
+# İlk dizi çekirdeği çağrılana kadar yüklenmez; kurulu değilse None
+np = lazy_import('numpy')
+
+EARTH_RADIUS_M = 6371008.8
+
+# Uzun duraklarda çıkış noktası bu büyüklükte parçalarla aranır
+_SEARCH_CHUNK = 256
+# Durak tespitinde birlikte denenen başlangıç sayısı ve uzaklık penceresi
+_STAY_BLOCK_MIN = 32
+_STAY_BLOCK_MAX = 2048
+_STAY_WINDOW = 64
+
+# Durak kaydı tipi (NumPy dtype tanımı; modül yüklenirken numpy gerektirmez)
+STAY_DTYPE = [('lat', 'f8'), ('lon', 'f8'), ('arrival', 'f8'),
+              ('departure', 'f8'), ('first', 'i8'), ('count', 'i8')]
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """İki koordinat arasındaki büyük çember mesafesi (metre)"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def speed_mps(fix1, fix2):
+    """İki zaman damgalı konum arasındaki ortalama hız (m/s), hesaplanamazsa None"""
+    dt = fix2['time'] - fix1['time']
+    if dt <= 0:
+        return None
+    return haversine_m(fix1['lat'], fix1['lon'], fix2['lat'], fix2['lon']) / dt
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy yüklü değil")
+
+
+def _as_float64(values):
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def haversine_array(lat1, lon1, lat2, lon2):
+    """Eleman bazında büyük çember mesafesi (metre); girdiler yayınlanabilir"""
+    _require_numpy()
+    phi1 = np.radians(_as_float64(lat1))
+    phi2 = np.radians(_as_float64(lat2))
+    dlmb = np.radians(_as_float64(lon2) - _as_float64(lon1))
+
+    a = np.sin((phi2 - phi1) * 0.5)
+    a *= a
+    b = np.sin(dlmb * 0.5)
+    b *= b
+    b *= np.cos(phi1) * np.cos(phi2)
+    a += b
+    return _arc_to_meters(a)
+
+
+def _arc_to_meters(a):
+    np.sqrt(a, out=a)
+    np.minimum(a, 1.0, out=a)
+    np.arcsin(a, out=a)
+    a *= 2 * EARTH_RADIUS_M
+    return a
+
+
+def step_distances(lat, lon):
+    """Ardışık noktalar arası mesafeler (n-1 eleman, metre)"""
+    _require_numpy()
+    phi = np.radians(_as_float64(lat))
+    lmb = np.radians(_as_float64(lon))
+    cos_phi = np.cos(phi)
+
+    a = np.sin(np.diff(phi) * 0.5)
+    a *= a
+    b = np.sin(np.diff(lmb) * 0.5)
+    b *= b
+    b *= cos_phi[:-1]
+    b *= cos_phi[1:]
+    a += b
+    return _arc_to_meters(a)
+
+
+def cumulative_distance(lat, lon):
+    """Başlangıçtan itibaren toplam yol (n eleman, ilki 0, metre)"""
+    steps = step_distances(lat, lon)
+    total = np.empty(steps.size + 1)
+    total[0] = 0.0
+    np.cumsum(steps, out=total[1:])
+    return total
+
+
+def speed_array(lat, lon, t):
+    """Ardışık noktalar arası hız (n-1 eleman, m/s); zaman ilerlemiyorsa NaN"""
+    steps = step_distances(lat, lon)
+    dt = np.diff(_as_float64(t))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speeds = steps / dt
+    speeds[dt <= 0] = np.nan
+    return speeds
+
+
+def first_departure(lat0, lon0, lat, lon, radius, start=0):
+    """(lat0, lon0)'dan radius metreden uzak ilk noktanın sırası (start'tan itibaren), yoksa len"""
+    _require_numpy()
+    n = len(lat)
+    chunk = _SEARCH_CHUNK
+    while start < n:
+        end = min(n, start + chunk)
+        far = haversine_array(lat0, lon0, lat[start:end], lon[start:end]) > radius
+        if far.any():
+            return start + int(np.argmax(far))
+        start = end
+        chunk *= 2
+    return n
+
+
+def _pair_distances(first, other, phi, lmb, cos_phi):
+    a = np.sin((phi[other] - phi[first]) * 0.5) ** 2 + \
+        cos_phi[first] * cos_phi[other] * np.sin((lmb[other] - lmb[first]) * 0.5) ** 2
+    return _arc_to_meters(a)
+
+
+def _reaches_duration(anchors, reach, phi, lmb, cos_phi, max_distance):
+    """Başlangıçlardan hangileri süre eşiğine kadar max_distance içinde kalıyor"""
+    qualified = np.zeros(anchors.size, dtype=bool)
+    active = np.arange(anchors.size)
+    window = np.arange(_STAY_WINDOW)
+    offset = 1
+    while active.size:
+        first = anchors[active]
+        limit = (reach[first] - first)[:, None]
+        k = offset + window
+        # Başlangıç x uzaklık matrisi; eşiğin ötesindeki noktalar sayılmaz
+        other = np.minimum(first[:, None] + k, phi.size - 1)
+        far = _pair_distances(first[:, None], other, phi, lmb, cos_phi) > max_distance
+        far &= k <= limit
+        inside = ~far.any(axis=1)
+        finished = inside & (offset + _STAY_WINDOW - 1 >= limit[:, 0])
+        qualified[active[finished]] = True
+        active = active[inside & ~finished]
+        offset += _STAY_WINDOW
+    return qualified
+
+
+def stay_points(lat, lon, t, max_distance=200.0, min_duration=300.0):
+    """Durak noktalarını bul (STAY_DTYPE dizisi); t artan sırada olmalı
+
+    Bir nokta, kendisinden max_distance içinde kalan ardışık noktalarla en
+    az min_duration saniye sürüyorsa durak başlatır (Li ve ark., 2008);
+    durak bu noktaların ortalaması ve ilk/son zamanıdır.
+    """
+    _require_numpy()
+    lat = _as_float64(lat)
+    lon = _as_float64(lon)
+    t = _as_float64(t)
+    n = lat.size
+
+    phi = np.radians(lat)
+    lmb = np.radians(lon)
+    cos_phi = np.cos(phi)
+    # Her başlangıç için süre eşiğine ulaşılan ilk sıra
+    reach = np.searchsorted(t, t + min_duration, side='left')
+
+    # Hızlı eleme: eşik içindeki birkaç noktadan biri bile uzaksa durak olamaz
+    candidates = np.flatnonzero(reach < n)
+    step = reach[candidates] - candidates
+    while candidates.size and step.max() > 0:
+        near = _pair_distances(candidates, candidates + step, phi, lmb, cos_phi) <= max_distance
+        candidates = candidates[near]
+        step = step[near] // 2
+
+    # Kalan adaylar bloklar halinde kesin denenir; bulunan durağın içi atlanır
+    stays = []
+    bound = 0
+    position = 0
+    block = _STAY_BLOCK_MIN
+    while position < candidates.size:
+        anchors = candidates[position:position + block]
+        qualified = _reaches_duration(anchors, reach, phi, lmb, cos_phi, max_distance)
+        found = False
+        for i in anchors[qualified].tolist():
+            if i < bound:
+                continue
+            j = first_departure(lat[i], lon[i], lat, lon, max_distance, i + 1)
+            stays.append((lat[i:j].mean(), lon[i:j].mean(), t[i], t[j - 1], i, j - i))
+            bound = j
+            found = True
+
+        position = int(np.searchsorted(candidates, max(bound, int(anchors[-1]) + 1)))
+        block = _STAY_BLOCK_MIN if found else min(block * 2, _STAY_BLOCK_MAX)
+
+    return np.array(stays, dtype=STAY_DTYPE)
@@ -0,0 +1,205 @@
+"""
+Bağlantı Havuzlu HTTP İstemcisi
+Servis boyunca yaşayan, keep-alive ve sıkıştırma kullanan HTTP oturumu.
+Her istekte yeniden TCP/TLS el sıkışması yapılmasını önler.
+
+requests/urllib3 ilk istekte yüklenir; çevrimdışı çözümlemeyle çalışan
+servis hiç ağa çıkmazsa bu maliyeti ödemez.
+"""
+
+import threading
+
+from runtime import Logger, lazy_import
+
+requests = lazy_import('requests')
+
+# Varsayılan zaman aşımları (saniye)
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 10
+
+
+class TransportError(Exception):
+    """İstek sunucuya ulaşamadı veya yanıt alınamadı"""
+
+
+class TransportTimeout(TransportError):
+    """Bağlantı ya da okuma zaman aşımı"""
+
+
+class _ConnectionStats:
+    """Havuzların paylaştığı istek/bağlantı sayaçları"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def add_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def add_connection(self):
+        with self._lock:
+            self.connections += 1
+
+
+def _counting_pools(stats):
+    """Yeni bağlantıları sayan havuz sınıflarını üret"""
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class CountingHTTPPool(HTTPConnectionPool):
+        def _new_conn(self):
+            stats.add_connection()
+            return super()._new_conn()
+
+    class CountingHTTPSPool(HTTPSConnectionPool):
+        def _new_conn(self):
+            stats.add_connection()
+            return super()._new_conn()
+
+    return {'http': CountingHTTPPool, 'https': CountingHTTPSPool}
+
+
+_adapter_class = None
+
+
+def _counting_adapter_class():
+    """Bağlantı kurulumlarını sayan HTTPAdapter sınıfı (ilk kullanımda tanımlanır)"""
+    global _adapter_class
+    if _adapter_class is None:
+        from requests.adapters import HTTPAdapter
+
+        class _CountingAdapter(HTTPAdapter):
+            def __init__(self, stats, **kwargs):
+                self._stats = stats
+                super().__init__(**kwargs)
+
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                # Modül düzeyindeki sözlüğü değiştirmemek için kopyasını ata
+                self.poolmanager.pool_classes_by_scheme = _counting_pools(self._stats)
+
+        _adapter_class = _CountingAdapter
+    return _adapter_class
+
+
+class HttpClient:
+    """Uzun ömürlü, bağlantı havuzlu HTTP istemcisi
+
+    http2=True verilirse ve httpx[http2] kuruluysa istekler HTTP/2 üzerinden
+    gider; aksi halde requests.Session + urllib3 havuzu kullanılır.
+    """
+
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, pool_size=2,
+                 user_agent=None, http2=False):
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self._stats = _ConnectionStats()
+        self._httpx = None
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.user_agent = user_agent
+
+        if http2:
+            try:
+                import httpx
+                self._httpx = httpx.Client(
+                    http2=True,
+                    headers=self._headers(),
+                    timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                    limits=httpx.Limits(max_connections=pool_size,
+                                        max_keepalive_connections=pool_size),
+                )
+            except ImportError:
+                Logger.warning("HttpClient: httpx[http2] yok - HTTP/1.1 kullanılacak")
+
+    def _headers(self):
+        from urllib3.util.request import ACCEPT_ENCODING
+        headers = {'Accept-Encoding': ACCEPT_ENCODING}
+        if self.user_agent:
+            headers['User-Agent'] = self.user_agent
+        return headers
+
+    def _requests_session(self):
+        """requests oturumunu ilk istekte kur"""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                session.headers.update(self._headers())
+                adapter = _counting_adapter_class()(self._stats, pool_connections=self.pool_size,
+                                                    pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+            return self._session
+
+    @property
+    def http_version(self):
+        return '2' if self._httpx is not None else '1.1'
+
+    def request(self, method, url, **kwargs):
+        """İstek gönder; ağ hatalarını TransportError olarak fırlat"""
+        kwargs.setdefault('timeout', self.timeout)
+        self._stats.add_request()
+
+        if self._httpx is not None:
+            return self._httpx_request(method, url, **kwargs)
+
+        session = self._session or self._requests_session()
+        try:
+            response = session.request(method, url, **kwargs)
+            # Gövdeyi okuyup bağlantıyı havuza geri bırak
+            response.content
+            return response
+        except requests.exceptions.Timeout as e:
+            raise TransportTimeout(str(e)) from e
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+
+    def _httpx_request(self, method, url, **kwargs):
+        import httpx
+
+        timeout = kwargs.pop('timeout')
+        if isinstance(timeout, tuple):
+            kwargs['timeout'] = httpx.Timeout(timeout[1], connect=timeout[0])
+        else:
+            kwargs['timeout'] = timeout
+        if 'data' in kwargs:
+            kwargs['content'] = kwargs.pop('data')
+
+        try:
+            return self._httpx.request(method, url, **kwargs)
+        except httpx.TimeoutException as e:
+            raise TransportTimeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def stats(self):
+        """Bağlantı yeniden kullanım istatistikleri"""
+        requests_made = self._stats.requests
+        connections = self._stats.connections
+        if self._httpx is not None:
+            # httpx yeni bağlantı sayısını dışarı vermiyor
+            connections = None
+        reused = requests_made - connections if connections is not None else None
+        return {
+            'http_version': self.http_version,
+            'requests': requests_made,
+            'connections': connections,
+            'reused': reused,
+            'reuse_ratio': (reused / requests_made) if requests_made and reused is not None else 0.0,
+        }
+
+    def close(self):
+        """Havuzdaki bağlantıları kapat"""
+        if self._httpx is not None:
+            self._httpx.close()
+        if self._session is not None:
+            self._session.close()
@@ -0,0 +1,247 @@
+"""
+Konum Kaynağı
+Android konum güncellemelerini dinleyici (LocationListener) ile alır ve
+iş parçacığı güvenli bir kuyruğa koyar; motor her turda kuyruğun en
+güncel konumunu okur. Masaüstünde sentetik konum üreten bir taklit kullanılır.
+"""
+
+import math
+import queue
+import random
+import threading
+import time
+
+from android_bridge import handles
+from runtime import Logger, platform
+
+if platform == 'android':
+    from jnius import PythonJavaClass, java_method
+
+    Looper = handles.java_class('android.os.Looper')
+
+    class _LocationListener(PythonJavaClass):
+        """Java LocationListener arayüzünün Python uygulaması"""
+
+        __javainterfaces__ = ['android/location/LocationListener']
+        __javacontext__ = 'app'
+
+        def __init__(self, callback):
+            super().__init__()
+            self.callback = callback
+
+        @java_method('(Landroid/location/Location;)V')
+        def onLocationChanged(self, location):
+            self.callback(location)
+
+        @java_method('(Ljava/lang/String;ILandroid/os/Bundle;)V')
+        def onStatusChanged(self, provider, status, extras):
+            pass
+
+        @java_method('(Ljava/lang/String;)V')
+        def onProviderEnabled(self, provider):
+            pass
+
+        @java_method('(Ljava/lang/String;)V')
+        def onProviderDisabled(self, provider):
+            pass
+
+# GPS ve Network provider'larını bu sırayla dene
+PROVIDERS = ['gps', 'network', 'passive']
+
+# Masaüstünde kullanılan test konumu (İstanbul)
+DESKTOP_LOCATION = {'lat': 41.0082, 'lon': 28.9784, 'provider': 'test'}
+
+# Varsayılan güncelleme eşikleri
+DEFAULT_MIN_TIME = 30           # saniye
+DEFAULT_MIN_DISTANCE = 50       # metre
+DEFAULT_QUEUE_SIZE = 64
+
+
+def location_to_fix(location, provider=None):
+    """android.location.Location nesnesini konum sözlüğüne çevir"""
+    return {
+        'lat': location.getLatitude(),
+        'lon': location.getLongitude(),
+        'accuracy': location.getAccuracy(),
+        'time': location.getTime() / 1000.0,
+        'provider': provider or location.getProvider()
+    }
+
+
+def get_current_location():
+    """Mevcut konumu al (son bilinen konum; dinleyici kullanılamıyorsa)"""
+    if platform == 'android':
+        try:
+            location_manager = handles.system_service('LOCATION_SERVICE')
+
+            for provider in PROVIDERS:
+                if location_manager.isProviderEnabled(provider):
+                    last_location = location_manager.getLastKnownLocation(provider)
+
+                    if last_location:
+                        return location_to_fix(last_location, provider)
+
+            Logger.warning("Location: Hiçbir provider'dan konum alınamadı")
+            return None
+
+        except Exception as e:
+            Logger.error(f"Location: GPS hatası - {str(e)}")
+            return None
+    else:
+        # Test için sabit konum
+        return dict(DESKTOP_LOCATION)
+
+
+class LocationProvider:
+    """Konumları kuyrukta toplayan kaynak arayüzü
+
+    Kuyruk doluysa en eski konum atılır; latest() kuyruğu boşaltıp en yeni
+    konumu, yeni konum yoksa bir öncekini döndürür.
+    """
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE):
+        self.fixes = queue.Queue(maxsize=queue_size)
+        self.last_fix = None
+        self.received = 0
+
+    def start(self):
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+    def push(self, fix):
+        """Yeni konumu kuyruğa koy (herhangi bir iş parçacığından çağrılabilir)"""
+        self.received += 1
+        while True:
+            try:
+                self.fixes.put_nowait(fix)
+                return
+            except queue.Full:
+                try:
+                    self.fixes.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def drain(self):
+        """Kuyruktaki tüm konumları sırayla döndür"""
+        fixes = []
+        while True:
+            try:
+                fixes.append(self.fixes.get_nowait())
+            except queue.Empty:
+                break
+        if fixes:
+            self.last_fix = fixes[-1]
+        return fixes
+
+    def latest(self):
+        """En güncel konum (yeni konum gelmediyse bir önceki)"""
+        self.drain()
+        return self.last_fix
+
+
+class AndroidLocationProvider(LocationProvider):
+    """requestLocationUpdates ile bir kez kaydolan dinleyici tabanlı kaynak"""
+
+    def __init__(self, min_time=DEFAULT_MIN_TIME, min_distance=DEFAULT_MIN_DISTANCE,
+                 providers=('gps', 'network'), queue_size=DEFAULT_QUEUE_SIZE):
+        super().__init__(queue_size)
+        self.min_time = min_time
+        self.min_distance = min_distance
+        self.providers = list(providers)
+        self._manager = None
+        self._listener = None
+
+    def start(self):
+        """Dinleyiciyi kaydet; son bilinen konumu hemen kuyruğa koy"""
+        if self._listener is not None:
+            return
+        try:
+            self._manager = handles.system_service('LOCATION_SERVICE')
+            self._listener = _LocationListener(lambda location: self.push(location_to_fix(location)))
+            looper = Looper.getMainLooper()
+
+            for provider in self.providers:
+                if not self._manager.isProviderEnabled(provider):
+                    continue
+                # İşletim sistemi güncellemeleri minTime/minDistance'a göre toplar
+                self._manager.requestLocationUpdates(
+                    provider, int(self.min_time * 1000), float(self.min_distance),
+                    self._listener, looper
+                )
+                last_location = self._manager.getLastKnownLocation(provider)
+                if last_location and self.last_fix is None:
+                    self.push(location_to_fix(last_location, provider))
+
+            Logger.info("Location: Konum dinleyicisi kaydedildi")
+
+        except Exception as e:
+            Logger.error(f"Location: Dinleyici hatası - {str(e)}")
+
+    def stop(self):
+        if self._listener is not None and self._manager is not None:
+            try:
+                self._manager.removeUpdates(self._listener)
+            except Exception as e:
+                Logger.error(f"Location: Dinleyici kaldırma hatası - {str(e)}")
+        self._listener = None
+
+
+class DesktopLocationProvider(LocationProvider):
+    """Masaüstü taklidi: İstanbul çevresinde sentetik konum üretir
+
+    speed=0 iken sabit test konumu üretilir; aksi halde verilen hızla
+    rastgele yönlerde ilerleyen bir yol çizilir.
+    """
+
+    def __init__(self, interval=DEFAULT_MIN_TIME, speed=0.0, start=DESKTOP_LOCATION,
+                 queue_size=DEFAULT_QUEUE_SIZE, seed=None):
+        super().__init__(queue_size)
+        self.interval = interval
+        self.speed = speed
+        self._position = (start['lat'], start['lon'])
+        self._bearing = 0.0
+        self._rng = random.Random(seed)
+        self._stop = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        # Her iş parçacığının kendi durdurma olayı: hızlı durdur/başlat eskisini canlandırmaz
+        self._stop = threading.Event()
+        self._emit()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, stop):
+        while not stop.wait(self.interval):
+            self._emit()
+
+    def _emit(self):
+        lat, lon = self._position
+        if self.speed > 0:
+            self._bearing += self._rng.uniform(-0.5, 0.5)
+            step = self.speed * self.interval
+            lat += math.degrees(step * math.cos(self._bearing) / 6371008.8)
+            lon += math.degrees(step * math.sin(self._bearing) /
+                                (6371008.8 * math.cos(math.radians(lat))))
+            self._position = (lat, lon)
+
+        self.push({'lat': lat, 'lon': lon, 'accuracy': 5.0,
+                   'time': time.time(), 'provider': 'test'})
+
+
+def create_location_provider(min_time=DEFAULT_MIN_TIME, min_distance=DEFAULT_MIN_DISTANCE):
+    """Platforma uygun konum kaynağını oluştur"""
+    if platform == 'android':
+        return AndroidLocationProvider(min_time=min_time, min_distance=min_distance)
+    return DesktopLocationProvider(interval=min_time)
@@ -5,10 +5,6 @@ Arka planda çalışan konum takip ve bildirim sistemi
 """
 
 from kivy.app import App
-from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.label import Label
-from kivy.uix.button import Button
-from kivy.clock import Clock
 from kivy.logger import Logger
 from kivy.utils import platform
 
@@ -16,33 +12,52 @@ from kivy.utils import platform
 if platform == 'android':
     try:
         from android.permissions import request_permissions, Permission
-        from android.broadcast import BroadcastReceiver
-        from jnius import autoclass, cast
         from android import mActivity
-        
-        # Android sınıfları
-        PythonService = autoclass('org.kivy.android.PythonService')
-        Context = autoclass('android.content.Context')
-        NotificationManager = autoclass('android.app.NotificationManager')
-        NotificationCompat = autoclass('androidx.core.app.NotificationCompat')
-        PendingIntent = autoclass('android.app.PendingIntent')
-        Intent = autoclass('android.content.Intent')
     except ImportError:
         Logger.warning("Android modülleri yüklenemedi - Desktop modunda çalışılıyor")
 
-import requests
-import json
-from datetime import datetime
-import threading
-import time
+import asyncio
+
+from android_bridge import handles
+from metrics import summary_text
+from status_channel import StatusPublisher, StatusSubscriber
 
 class LocationService:
-    """Konum servisi sınıfı"""
+    """Konum servisi sınıfı
+
+    Android'de takip arka plan servisinde (service.py) çalışır; masaüstünde
+    aynı motor uygulamanın asyncio döngüsünde çalıştırılır.
+    """
     
-    def __init__(self):
-        self.is_running = False
-        self.location_thread = None
-        self.current_location = None
+    def __init__(self, geocoder_backend='offline'):
+        self.geocoder_backend = geocoder_backend
+        self._engine = None
+        self._task = None
+    
+    @property
+    def engine(self):
+        """Motoru ilk kullanımda kur (ilk ekran motor modüllerini beklemesin)"""
+        if self._engine is None:
+            from engine import TrackingEngine
+            from geofence import GeofenceMonitor
+            from metrics import Metrics, MetricsExporter
+            publisher = StatusPublisher()
+            metrics = Metrics()
+            self._engine = TrackingEngine(self.geocoder_backend, publisher=publisher,
+                                          metrics=metrics,
+                                          metrics_exporter=MetricsExporter(metrics,
+                                                                           publisher=publisher),
+                                          geofences=GeofenceMonitor(),
+                                          log_prefix='LocationService')
+        return self._engine
+    
+    @property
+    def is_running(self):
+        return self._engine is not None and self._engine.is_running
+    
+    @property
+    def current_location(self):
+        return self._engine.current_location if self._engine is not None else None
         
     def start_location_tracking(self):
         """Konum takibini başlat"""
@@ -55,127 +70,32 @@ class LocationService:
                 Permission.WAKE_LOCK,
                 Permission.FOREGROUND_SERVICE
             ])
+            # Döngüyü arka plan servisi çalıştırır, burada ikinci bir döngü açılmaz
+            return
         
-        self.is_running = True
-        self.location_thread = threading.Thread(target=self._location_loop)
-        self.location_thread.daemon = True
-        self.location_thread.start()
+        # Hat Kivy'nin asyncio olay döngüsünde çalışır
+        self._task = self.engine.start()
         Logger.info("LocationService: Konum takibi başlatıldı")
     
     def stop_location_tracking(self):
         """Konum takibini durdur"""
-        self.is_running = False
-        if self.location_thread:
-            self.location_thread.join()
+        # Bekleyen uyku ve istekler iptal edilir, arayüz beklemez
+        if self._engine is not None:
+            self._engine.stop()
         Logger.info("LocationService: Konum takibi durduruldu")
     
-    def _location_loop(self):
-        """Ana konum takip döngüsü"""
-        while self.is_running:
-            try:
-                location = self._get_current_location()
-                if location:
-                    address = self._reverse_geocode(location['lat'], location['lon'])
-                    self._send_notification(address)
-                    Logger.info(f"LocationService: Konum güncellendi - {address}")
-                
-                # 2 dakika bekle
-                time.sleep(120)
-                
-            except Exception as e:
-                Logger.error(f"LocationService: Hata - {str(e)}")
-                time.sleep(30)  # Hata durumunda 30 saniye bekle
-    
-    def _get_current_location(self):
-        """Mevcut konumu al"""
-        if platform == 'android':
-            try:
-                # Android GPS servisi
-                LocationManager = autoclass('android.location.LocationManager')
-                context = mActivity
-                location_manager = context.getSystemService(Context.LOCATION_SERVICE)
-                
-                # En son bilinen konumu al
-                providers = location_manager.getProviders(True)
-                location = None
-                
-                for provider in providers.toArray():
-                    last_location = location_manager.getLastKnownLocation(provider)
-                    if last_location:
-                        location = {
-                            'lat': last_location.getLatitude(),
-                            'lon': last_location.getLongitude()
-                        }
-                        break
-                
-                return location
-                
-            except Exception as e:
-                Logger.error(f"GPS Hatası: {str(e)}")
-                return None
-        else:
-            # Test için sabit konum (İstanbul)
-            return {'lat': 41.0082, 'lon': 28.9784}
-    
-    def _reverse_geocode(self, lat, lon):
-        """Koordinatları adres bilgisine çevir"""
-        try:
-            # Nominatim API kullanarak reverse geocoding
-            url = f"https://nominatim.openstreetmap.org/reverse"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'format': 'json',
-                'addressdetails': 1,
-                'accept-language': 'tr'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                address = data.get('address', {})
-                
-                # Türkiye için il/ilçe bilgisi
-                state = address.get('state', '')
-                city = address.get('city', '') or address.get('town', '') or address.get('village', '')
-                
-                if state and city:
-                    return f"{city}, {state}"
-                elif state:
-                    return state
-                else:
-                    return "Konum belirlenemedi"
-            
-        except Exception as e:
-            Logger.error(f"Reverse geocoding hatası: {str(e)}")
-        
-        return "Adres bilgisi alınamadı"
-    
-    def _send_notification(self, location_text):
-        """Bildirim gönder"""
-        if platform == 'android':
-            try:
-                # Android bildirimi
-                context = mActivity
-                notification_manager = context.getSystemService(Context.NOTIFICATION_SERVICE)
-                
-                # Bildirim oluştur
-                builder = NotificationCompat.Builder(context, "location_channel")
-                builder.setContentTitle("Konum Güncellendi")
-                builder.setContentText(f"Şu anki konumunuz: {location_text}")
-                builder.setSmallIcon(android.R.drawable.ic_dialog_info)
-                builder.setPriority(NotificationCompat.PRIORITY_DEFAULT)
-                builder.setAutoCancel(True)
-                
-                notification = builder.build()
-                notification_manager.notify(1, notification)
-                
-            except Exception as e:
-                Logger.error(f"Bildirim hatası: {str(e)}")
+    def close(self):
+        """Takibi durdur, motorun ağ ve dosya kaynaklarını bırak"""
+        if self._engine is None:
+            return
+        engine = self._engine
+        engine.stop()
+        if self._task is not None and not self._task.done():
+            # İptal edilen döngü temizliğini bitirmeden kaynaklar kapanmasın
+            self._task.add_done_callback(lambda _: engine.close())
         else:
-            # Desktop için konsol çıktısı
-            current_time = datetime.now().strftime("%H:%M:%S")
-            print(f"[{current_time}] Konum Bildirimi: {location_text}")
+            engine.close()
+        self._task = None
 
 
 class LocationTrackerApp(App):
@@ -184,10 +104,16 @@ class LocationTrackerApp(App):
     def __init__(self):
         super().__init__()
         self.location_service = LocationService()
+        self.status_subscriber = StatusSubscriber(self.on_status_event)
         self.is_tracking = False
     
     def build(self):
         """UI oluştur"""
+        # Bileşen modülleri yalnızca arayüz kurulurken yüklenir
+        from kivy.uix.boxlayout import BoxLayout
+        from kivy.uix.button import Button
+        from kivy.uix.label import Label
+        
         layout = BoxLayout(orientation='vertical', padding=20, spacing=20)
         
         # Başlık
@@ -201,11 +127,27 @@ class LocationTrackerApp(App):
         # Durum etiketi
         self.status_label = Label(
             text='Konum takibi kapalı',
-            size_hint_y=0.3,
+            size_hint_y=0.15,
             font_size='18sp'
         )
         layout.add_widget(self.status_label)
         
+        # Son konum etiketi (servisin yayınından beslenir)
+        self.location_label = Label(
+            text='',
+            size_hint_y=0.15,
+            font_size='16sp'
+        )
+        layout.add_widget(self.location_label)
+        
+        # Son ölçüm aralığının özeti (servisin 'metrics' yayınından)
+        self.metrics_label = Label(
+            text='',
+            size_hint_y=0.1,
+            font_size='12sp'
+        )
+        layout.add_widget(self.metrics_label)
+        
         # Başlat/Durdur butonu
         self.toggle_button = Button(
             text='Takibi Başlat',
@@ -217,7 +159,7 @@ class LocationTrackerApp(App):
         
         # Bilgi etiketi
         info_label = Label(
-            text='Uygulama arka planda çalışacak ve\nher 2 dakikada bir konum bildirim gönderecek.',
+            text='Uygulama arka planda çalışacak ve\nhareket hızınıza göre (30 sn - 10 dk) konum bildirimi gönderecek.',
             size_hint_y=0.3,
             font_size='14sp',
             text_size=(None, None)
@@ -226,6 +168,39 @@ class LocationTrackerApp(App):
         
         return layout
     
+    def on_start(self):
+        """Servisin durum yayınına abone ol"""
+        asyncio.ensure_future(self.status_subscriber.start())
+    
+    def on_stop(self):
+        """Aboneliği bitir, masaüstü motorunu kapat"""
+        self.status_subscriber.close()
+        self.location_service.close()
+    
+    def on_status_event(self, message):
+        """Servisten gelen konum/durum olayını arayüze yansıt"""
+        data = message['data']
+        if message['type'] == 'location':
+            self.location_label.text = f"{data['text']}\n({data['lat']:.4f}, {data['lon']:.4f})"
+        elif message['type'] == 'metrics':
+            self.metrics_label.text = summary_text(data)
+        elif message['type'] == 'status':
+            if data['state'] == 'running' and not self.is_tracking:
+                # Uygulama açıldığında servis zaten çalışıyor olabilir
+                self.is_tracking = True
+                self.toggle_button.text = 'Takibi Durdur'
+                self.status_label.text = 'Konum takibi aktif - Arka planda çalışıyor'
+            elif data['state'] == 'running' and data.get('next_update') is not None:
+                self.status_label.text = (f"Konum takibi aktif - sonraki güncelleme "
+                                          f"{data['next_update']:.0f} sn sonra")
+            elif data['state'] == 'still':
+                self.status_label.text = 'Cihaz durağan - konum takibi beklemede'
+            elif data['state'] == 'stopped':
+                # Servis kendiliğinden (veya başka bir yerden) durdurulmuş olabilir
+                self.is_tracking = False
+                self.toggle_button.text = 'Takibi Başlat'
+                self.status_label.text = 'Konum takibi kapalı'
+    
     def toggle_tracking(self, instance):
         """Takibi başlat/durdur"""
         if not self.is_tracking:
@@ -248,6 +223,10 @@ class LocationTrackerApp(App):
         """Takibi durdur"""
         self.location_service.stop_location_tracking()
         self.is_tracking = False
+        
+        # Android'de arka plan servisini durdur
+        if platform == 'android':
+            self.stop_background_service()
         self.toggle_button.text = 'Takibi Başlat'
         self.status_label.text = 'Konum takibi kapalı'
     
@@ -255,12 +234,22 @@ class LocationTrackerApp(App):
         """Android arka plan servisi başlat"""
         if platform == 'android':
             try:
-                service = autoclass('org.kivy.android.PythonService')
+                service = handles.java_class('org.kivy.android.PythonService')
                 service.start(mActivity, '')
                 Logger.info("Arka plan servisi başlatıldı")
             except Exception as e:
                 Logger.error(f"Arka plan servisi hatası: {str(e)}")
     
+    def stop_background_service(self):
+        """Android arka plan servisini durdur"""
+        if platform == 'android':
+            try:
+                service = handles.java_class('org.kivy.android.PythonService')
+                service.stop(mActivity)
+                Logger.info("Arka plan servisi durduruldu")
+            except Exception as e:
+                Logger.error(f"Arka plan servisi hatası: {str(e)}")
+    
     def on_pause(self):
         """Uygulama duraklatıldığında"""
         # Arka planda çalışmaya devam et
@@ -272,4 +261,5 @@ class LocationTrackerApp(App):
 
 
 if __name__ == '__main__':
-    LocationTrackerApp().run()
+    # Kivy'yi asyncio döngüsünde çalıştır; takip hattı aynı döngüyü paylaşır
+    asyncio.run(LocationTrackerApp().async_run(async_lib='asyncio'))
@@ -0,0 +1,211 @@
+"""
+Çalışma Ölçümleri
+Sıcak yol için düşük maliyetli ölçüm yüzeyi: aşama süre histogramları
+(sabit kovalar), sayaçlar ve göstergeler. Kayıt yalnızca bellek içi sayı
+artırmadır; dışa aktarım MetricsExporter ile belirli aralıklarla dönen bir
+NDJSON dosyasına ve durum kanalına ('metrics' olayı) yapılır.
+
+Kayıt yöntemleri olay döngüsü iş parçacığından çağrılmalıdır.
+"""
+
+import asyncio
+import bisect
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from geocache import default_data_dir
+from runtime import Logger
+
+METRICS_FILENAME = 'metrics.ndjson'
+EXPORT_INTERVAL = 300           # saniye
+MAX_FILE_BYTES = 256 * 1024
+BACKUP_COUNT = 2
+
+# Kova üst sınırları (ms); son kova taşma kovasıdır
+DEFAULT_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+def default_metrics_path():
+    return os.path.join(default_data_dir(), METRICS_FILENAME)
+
+
+class Histogram:
+    """Sabit kovalı süre histogramı (ms)"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds=DEFAULT_BOUNDS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, fraction):
+        """Yüzdeliğin düştüğü kovanın üst sınırı (taşmada en büyük değer)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return float(self.bounds[index]) if index < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'max': self.max,
+            'buckets': list(self.counts),
+        }
+
+
+class Metrics:
+    """Histogram, sayaç ve gösterge kaydı
+
+    observe(ad, sn) / timer(ad)  -> aşama süresi histogramı
+    incr(ad)                     -> sayaç
+    gauge(ad, değer)             -> son değer
+    sampler(ad, fn)              -> dışa aktarımda fn() çağrılıp eklenir (ör. önbellek sayaçları)
+    """
+
+    def __init__(self, bounds=DEFAULT_BOUNDS_MS, clock=time.perf_counter):
+        self.bounds = bounds
+        self.clock = clock
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.samplers = {}
+        self.since = time.time()
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(self.bounds)
+        histogram.observe(seconds * 1000)
+
+    @contextmanager
+    def timer(self, name):
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.observe(name, self.clock() - started)
+
+    def incr(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def sampler(self, name, fn):
+        self.samplers[name] = fn
+
+    def snapshot(self, reset=False):
+        """Ölçümleri sözlük olarak döndür; reset ile histogram ve sayaçlar sıfırlanır"""
+        now = time.time()
+        samples = {}
+        for name, fn in self.samplers.items():
+            try:
+                samples[name] = fn()
+            except Exception as e:
+                Logger.error(f"Metrics: {name} okunamadı - {str(e)}")
+
+        snapshot = {
+            'since': self.since,
+            'until': now,
+            'histograms': {name: h.snapshot() for name, h in self.histograms.items()},
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'samples': samples,
+        }
+        if reset:
+            self.histograms = {}
+            self.counters = {}
+            self.since = now
+        return snapshot
+
+
+class MetricsExporter:
+    """Ölçümleri belirli aralıklarla dönen dosyaya ve durum kanalına aktarır"""
+
+    def __init__(self, metrics, path=None, interval=EXPORT_INTERVAL,
+                 max_bytes=MAX_FILE_BYTES, backups=BACKUP_COUNT, publisher=None):
+        self.metrics = metrics
+        self.path = path or default_metrics_path()
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.publisher = publisher
+
+    async def run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                self.export()
+        finally:
+            # Durdurulurken son aralık kaybolmasın
+            self.export()
+
+    def export(self):
+        """Anlık görüntüyü dosyaya ekle ve yayınla, sonra aralığı sıfırla"""
+        snapshot = self.metrics.snapshot(reset=True)
+        try:
+            self._rotate()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(snapshot, ensure_ascii=False) + '\n')
+        except OSError as e:
+            Logger.error(f"Metrics: Dosyaya yazılamadı - {str(e)}")
+
+        if self.publisher is not None:
+            self.publisher.publish('metrics', **snapshot)
+        return snapshot
+
+    def _rotate(self):
+        """Dosya sınırı aştıysa metrics.ndjson -> .1 -> .2 ... kaydır"""
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+        except OSError:
+            return
+
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+def summary_text(snapshot):
+    """Anlık görüntüyü arayüzde gösterilecek kısa metne çevir"""
+    histograms = snapshot.get('histograms', {})
+    parts = []
+    for name, label in (('acquire', 'Konum'), ('geocode', 'Adres'), ('notify', 'Bildirim')):
+        histogram = histograms.get(name)
+        if histogram and histogram['count']:
+            parts.append(f"{label} p95 {histogram['p95']:.0f} ms")
+
+    cache = snapshot.get('samples', {}).get('cache')
+    if cache and cache['hits'] + cache['misses']:
+        parts.append(f"Önbellek %{100 * cache['hits'] / (cache['hits'] + cache['misses']):.0f}")
+
+    counters = snapshot.get('counters', {})
+    if counters.get('notifications_suppressed'):
+        parts.append(f"{counters['notifications_suppressed']} bildirim atlandı")
+    return ' · '.join(parts)
@@ -0,0 +1,242 @@
+"""
+Hareket Algılama
+İvmeölçer akışından cihazın durağan, yürüyor veya araçta olduğunu tahmin eder.
+Motor cihaz durağanken konum dinleyicisini kapatır, konum almaz ve adres
+çözümlemez; hareket başlayınca dinleyici yeniden kaydedilir.
+
+Sınıflandırma, son window saniyedeki ivme büyüklüğünün standart sapmasına
+dayanır (yerçekimi sabit olduğundan sapmayı etkilemez):
+    sapma < still_std           durağan (still_hold saniye sürerse)
+    sapma >= walk_std           yürüyor (GPS hızı drive_speed üstündeyse araç)
+    arası                       araç (motor/yol titreşimi)
+Örnek gelmiyorsa (sensör yok) durum 'unknown' olur ve takip askıya alınmaz.
+"""
+
+import csv
+import math
+import statistics
+import threading
+import time
+from collections import deque
+
+from runtime import Logger, platform
+
+STILL = 'still'
+WALKING = 'walking'
+DRIVING = 'driving'
+UNKNOWN = 'unknown'
+
+# Varsayılan eşikler (m/s² / saniye / m/s)
+DEFAULT_WINDOW = 5.0
+DEFAULT_STILL_STD = 0.1
+DEFAULT_WALK_STD = 1.0
+DEFAULT_STILL_HOLD = 120
+DEFAULT_DRIVE_SPEED = 6.0
+DEFAULT_POLL_INTERVAL = 15      # durağanken hareket kontrolü aralığı
+DEFAULT_SAMPLE_RATE = 5.0       # Hz
+
+
+class AccelerometerSource:
+    """İvmeölçer kaynağı arayüzü: read() son okumadan beri gelen (t, x, y, z) örnekleri"""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def read(self):
+        raise NotImplementedError
+
+
+class PlyerAccelerometer(AccelerometerSource):
+    """plyer.accelerometer değerini sabit hızda örnekleyen kaynak"""
+
+    def __init__(self, rate=DEFAULT_SAMPLE_RATE, max_samples=256):
+        self.rate = rate
+        self._samples = deque(maxlen=max_samples)
+        self._sensor = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        try:
+            from plyer import accelerometer
+            accelerometer.enable()
+            self._sensor = accelerometer
+        except Exception as e:
+            Logger.error(f"Motion: İvmeölçer açılamadı - {str(e)}")
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+        if self._sensor is not None:
+            try:
+                self._sensor.disable()
+            except Exception as e:
+                Logger.error(f"Motion: İvmeölçer kapatılamadı - {str(e)}")
+            self._sensor = None
+
+    def _run(self):
+        while not self._stop.wait(1.0 / self.rate):
+            try:
+                x, y, z = self._sensor.acceleration
+            except Exception:
+                continue
+            if x is not None:
+                self._samples.append((time.time(), x, y, z))
+
+    def read(self):
+        samples = []
+        while self._samples:
+            samples.append(self._samples.popleft())
+        return samples
+
+
+class FileAccelerometer(AccelerometerSource):
+    """Masaüstü taklidi: CSV dosyasındaki (t, x, y, z) örneklerini zamanında verir
+
+    İlk örnek start() anına (veya sanal saatin başlangıcına) hizalanır;
+    loop=True ise dosya bitince baştan tekrarlanır.
+    """
+
+    def __init__(self, path, clock=time.time, loop=False):
+        self.path = path
+        self.clock = clock
+        self.loop = loop
+        self._samples = None
+        self._period = None
+        self._next = None
+        self._offset = None
+
+    def _load(self):
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = [(float(row.get('t') or row['time']), float(row['x']), float(row['y']),
+                     float(row['z'])) for row in reader]
+        if rows:
+            step = rows[1][0] - rows[0][0] if len(rows) > 1 else 1.0
+            self._period = rows[-1][0] - rows[0][0] + step
+        return rows
+
+    def start(self):
+        if self._samples is None:
+            self._samples = self._load()
+        self._next = 0
+        self._offset = None
+
+    def read(self):
+        if not self._samples:
+            return []
+        now = self.clock()
+        if self._offset is None:
+            self._offset = now - self._samples[0][0]
+
+        samples = []
+        while True:
+            if self._next >= len(self._samples):
+                if not self.loop:
+                    break
+                # Dosya süresi kadar kaydırıp baştan oynat
+                self._offset += self._period
+                self._next = 0
+            t, x, y, z = self._samples[self._next]
+            if t + self._offset > now:
+                break
+            samples.append((t + self._offset, x, y, z))
+            self._next += 1
+        return samples
+
+
+class MotionDetector:
+    """İvmeölçer sapması (ve varsa GPS hızı) ile hareket durumu sınıflandırıcı"""
+
+    def __init__(self, source, window=DEFAULT_WINDOW, still_std=DEFAULT_STILL_STD,
+                 walk_std=DEFAULT_WALK_STD, still_hold=DEFAULT_STILL_HOLD,
+                 drive_speed=DEFAULT_DRIVE_SPEED, poll_interval=DEFAULT_POLL_INTERVAL,
+                 min_samples=5, clock=time.time):
+        self.source = source
+        self.window = window
+        self.still_std = still_std
+        self.walk_std = walk_std
+        self.still_hold = still_hold
+        self.drive_speed = drive_speed
+        self.poll_interval = poll_interval
+        self.min_samples = min_samples
+        self.clock = clock
+        self.state = UNKNOWN
+        self.deviation = None
+        self.transitions = 0
+        self._samples = deque()
+        self._still_since = None
+
+    def start(self):
+        self.source.start()
+
+    def stop(self):
+        self.source.stop()
+
+    def _classify(self, gps_speed):
+        if len(self._samples) < self.min_samples:
+            self.deviation = None
+            return UNKNOWN
+        self.deviation = statistics.pstdev(magnitude for _, magnitude in self._samples)
+        if self.deviation < self.still_std:
+            return STILL
+        if gps_speed is not None and gps_speed >= self.drive_speed:
+            return DRIVING
+        if self.deviation >= self.walk_std:
+            return WALKING
+        return DRIVING
+
+    def update(self, gps_speed=None):
+        """Yeni örnekleri işle ve güncel durumu döndür"""
+        now = self.clock()
+        for t, x, y, z in self.source.read():
+            self._samples.append((t, math.sqrt(x * x + y * y + z * z)))
+        while self._samples and self._samples[0][0] < now - self.window:
+            self._samples.popleft()
+
+        detected = self._classify(gps_speed)
+        if detected == STILL:
+            if self._still_since is None:
+                self._still_since = now
+            # Kısa duraklamalar (kırmızı ışık) takibi kesmesin
+            if now - self._still_since < self.still_hold:
+                detected = self.state
+        else:
+            self._still_since = None
+
+        if detected != self.state:
+            self.transitions += 1
+            Logger.info(f"Motion: {self.state} -> {detected}")
+            self.state = detected
+        return self.state
+
+    @property
+    def is_still(self):
+        return self.state == STILL
+
+    def stats(self):
+        return {'state': self.state, 'deviation': self.deviation,
+                'transitions': self.transitions}
+
+
+def create_motion_detector(path=None, clock=time.time):
+    """Platforma uygun hareket algılayıcıyı kur
+
+    Android'de plyer ivmeölçeri, masaüstünde path verilirse CSV taklidi
+    kullanılır; kaynak yoksa None (takip hiç askıya alınmaz).
+    """
+    if platform == 'android':
+        return MotionDetector(PlyerAccelerometer(), clock=clock)
+    if path:
+        return MotionDetector(FileAccelerometer(path, clock=clock, loop=True), clock=clock)
+    return None
@@ -0,0 +1,250 @@
+"""
+Konum Bildirimleri
+Bildirim kanalı, foreground servis bildirimi ve konum bildirimleri
+
+Oluşturucular (NotificationCompat.Builder) bir kez hazırlanır; her
+güncellemede yalnızca metin ve alt metin değişir ve aynı bildirim kimliği
+yerinde güncellenir. Gönderimler en az min_interval aralıkla yapılır;
+aralık içinde gelen metinler kuyruğa alınmaz, yalnızca en sonuncusu
+bekletilir ve aralık dolunca gönderilir (öncekilerin üzerine yazılır).
+
+Bölge olayları (bkz. geofence.py) bu sınırdan geçmez: ayrı, yüksek
+öncelikli kanalda her olay kendi bildirim kimliğiyle hemen gönderilir.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+from android_bridge import handles
+from runtime import Logger, platform
+
+if platform == 'android':
+    NotificationManager = handles.java_class('android.app.NotificationManager')
+    NotificationCompat = handles.java_class('androidx.core.app.NotificationCompat')
+    NotificationCompatBuilder = handles.java_class('androidx.core.app.NotificationCompat$Builder')
+    NotificationChannel = handles.java_class('android.app.NotificationChannel')
+    RDrawable = handles.java_class('android.R$drawable')
+
+CHANNEL_ID = "location_channel"
+GEOFENCE_CHANNEL_ID = "geofence_channel"
+FOREGROUND_NOTIFICATION_ID = 1
+LOCATION_NOTIFICATION_ID = 2
+# Bölge olayları bu aralıktaki kimlikleri sırayla kullanır (yan yana birikir)
+GEOFENCE_NOTIFICATION_BASE = 100
+GEOFENCE_NOTIFICATION_SLOTS = 20
+
+FOREGROUND_TITLE = "Konum Takip Aktif"
+FOREGROUND_TEXT = "Uygulama arka planda konum takibi yapıyor"
+LOCATION_TITLE = "📍 Konum Güncellendi"
+GEOFENCE_TITLE = "🚩 Bölge Bildirimi"
+
+# İki konum bildirimi arasındaki en kısa süre (saniye)
+DEFAULT_MIN_INTERVAL = 30
+
+
+def setup_notification_channel():
+    """Bildirim kanalını ayarla (Android 8.0+)"""
+    if platform == 'android':
+        try:
+            notification_manager = handles.system_service('NOTIFICATION_SERVICE')
+
+            # Bildirim kanalı oluştur
+            channel = NotificationChannel(
+                CHANNEL_ID,
+                "Konum Takip Bildirimleri",
+                NotificationManager.IMPORTANCE_DEFAULT
+            )
+            channel.setDescription("Konum güncellemeleri için bildirimler")
+            notification_manager.createNotificationChannel(channel)
+
+            # Bölge olayları kaçırılmasın: ayrı, yüksek önemli kanal
+            channel = NotificationChannel(
+                GEOFENCE_CHANNEL_ID,
+                "Bölge Bildirimleri",
+                NotificationManager.IMPORTANCE_HIGH
+            )
+            channel.setDescription("Bölgeye giriş, çıkış ve bekleme bildirimleri")
+            notification_manager.createNotificationChannel(channel)
+
+            Logger.info("Notifications: Bildirim kanalı oluşturuldu")
+
+        except Exception as e:
+            Logger.error(f"Notifications: Bildirim kanalı hatası - {str(e)}")
+
+
+class LocationNotifier:
+    """Hazır oluşturucularla, hız sınırlı konum bildirimi
+
+    Konum metni varsayılan olarak ayrı, sesli/titreşimli "Konum Güncellendi"
+    bildiriminde gösterilir. merge_foreground=True iken (isteğe bağlı) metin
+    foreground servis bildiriminde yerinde ve sessizce güncellenir.
+
+    Aralık içinde gelen metinler birbirinin üzerine yazar; yalnızca bekleyen
+    tek (son) metin gönderilir, atlananlar coalesced sayacında görünür.
+    """
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, merge_foreground=False,
+                 clock=time.monotonic):
+        self.min_interval = min_interval
+        self.merge_foreground = merge_foreground
+        self.clock = clock
+        self.posted = 0
+        self.coalesced = 0
+        self.alerts = 0
+        self._builders = {}
+        self._foreground_active = False
+        self._last_post = None
+        self._pending = None
+        self._timer = None
+
+    def _builder(self, notification_id, context=None):
+        """Bildirim kimliği başına bir kez hazırlanan oluşturucu"""
+        builder = self._builders.get(notification_id)
+        if builder is not None:
+            return builder
+
+        is_geofence = notification_id == GEOFENCE_NOTIFICATION_BASE
+        builder = NotificationCompatBuilder(context or handles.context(),
+                                            GEOFENCE_CHANNEL_ID if is_geofence else CHANNEL_ID)
+        builder.setSmallIcon(RDrawable.ic_dialog_info)
+        if is_geofence:
+            builder.setContentTitle(GEOFENCE_TITLE)
+            builder.setPriority(NotificationCompat.PRIORITY_HIGH)
+            builder.setAutoCancel(True)
+            builder.setVibrate([0, 250, 250, 250])
+        elif notification_id == FOREGROUND_NOTIFICATION_ID:
+            builder.setContentTitle(FOREGROUND_TITLE)
+            builder.setContentText(FOREGROUND_TEXT)
+            builder.setPriority(NotificationCompat.PRIORITY_LOW)
+            builder.setOngoing(True)  # Sürekli bildirim
+            builder.setOnlyAlertOnce(True)
+        else:
+            builder.setContentTitle(LOCATION_TITLE)
+            builder.setPriority(NotificationCompat.PRIORITY_DEFAULT)
+            builder.setAutoCancel(True)
+            builder.setVibrate([0, 250, 250, 250])  # Titreşim
+        self._builders[notification_id] = builder
+        return builder
+
+    def start_foreground(self, service):
+        """Servisi sürekli bildirimle foreground moda al"""
+        if platform == 'android':
+            try:
+                builder = self._builder(FOREGROUND_NOTIFICATION_ID, service)
+                service.startForeground(FOREGROUND_NOTIFICATION_ID, builder.build())
+                self._foreground_active = True
+
+                Logger.info("Notifications: Foreground service başlatıldı")
+
+            except Exception as e:
+                Logger.error(f"Notifications: Foreground service hatası - {str(e)}")
+
+    def notify(self, location_text):
+        """Konum metnini bildir; aralık dolmadıysa sonraya birleştir"""
+        now = self.clock()
+        wait = 0 if self._last_post is None else self._last_post + self.min_interval - now
+        if wait <= 0:
+            self._post(location_text, now)
+            return True
+
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = location_text
+        self._schedule_flush(wait)
+        return False
+
+    def _schedule_flush(self, wait):
+        if self._timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Döngü yoksa bekleyen metin bir sonraki çağrıda gönderilir
+            return
+        self._timer = loop.call_later(wait, self.flush)
+
+    def flush(self):
+        """Bekleyen metni aralık dolduysa gönder"""
+        self._timer = None
+        if self._pending is None:
+            return
+        now = self.clock()
+        wait = self._last_post + self.min_interval - now
+        if wait > 0:
+            self._schedule_flush(wait)
+            return
+        self._post(self._pending, now)
+
+    def _post(self, location_text, now):
+        self._pending = None
+        self._last_post = now
+        self.posted += 1
+        current_time = datetime.now().strftime("%H:%M")
+
+        if platform == 'android':
+            try:
+                # Yöneticiyi ve oluşturucuyu her bildirimde yeniden hazırlama
+                notification_manager = handles.system_service('NOTIFICATION_SERVICE')
+                if self.merge_foreground and self._foreground_active:
+                    notification_id = FOREGROUND_NOTIFICATION_ID
+                else:
+                    notification_id = LOCATION_NOTIFICATION_ID
+
+                builder = self._builder(notification_id)
+                builder.setContentText(f"Şu anki konumunuz: {location_text}")
+                builder.setSubText(f"Güncelleme: {current_time}")
+                notification_manager.notify(notification_id, builder.build())
+
+            except Exception as e:
+                Logger.error(f"Notifications: Bildirim hatası - {str(e)}")
+        else:
+            # Desktop test için
+            print(f"🔔 [{current_time}] Konum Bildirimi: {location_text}")
+
+    def alert(self, text):
+        """Bölge olayını hız sınırı ve birleştirme olmadan, ayrı bildirimle gönder"""
+        self.alerts += 1
+        current_time = datetime.now().strftime("%H:%M")
+        # Ardışık olaylar birbirinin üzerine yazmasın
+        notification_id = GEOFENCE_NOTIFICATION_BASE + self.alerts % GEOFENCE_NOTIFICATION_SLOTS
+
+        if platform == 'android':
+            try:
+                notification_manager = handles.system_service('NOTIFICATION_SERVICE')
+                builder = self._builder(GEOFENCE_NOTIFICATION_BASE)
+                builder.setContentText(text)
+                builder.setSubText(current_time)
+                notification_manager.notify(notification_id, builder.build())
+
+            except Exception as e:
+                Logger.error(f"Notifications: Bölge bildirimi hatası - {str(e)}")
+        else:
+            # Desktop test için
+            print(f"🚩 [{current_time}] Bölge Bildirimi: {text}")
+
+    def stats(self):
+        return {'posted': self.posted, 'coalesced': self.coalesced, 'alerts': self.alerts}
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+notifier = LocationNotifier()
+
+
+def start_foreground(service):
+    """Servisi sürekli bildirimle foreground moda al"""
+    notifier.start_foreground(service)
+
+
+def send_location_notification(location_text):
+    """Konum bildirimi gönder"""
+    notifier.notify(location_text)
+
+
+def send_geofence_notification(text):
+    """Bölge olayı bildirimi gönder (hız sınırı yok)"""
+    notifier.alert(text)
@@ -0,0 +1,174 @@
+"""
+Çevrimdışı İl/İlçe Çözümleyici
+Uygulamayla birlikte gelen sınır poligonlarından ağ olmadan il/ilçe bulur
+
+Dosya biçimi (little-endian):
+    başlık : '<4sHHI'  sihirli sözcük, sürüm, bölge sayısı, gövde uzunluğu
+    gövde  : zlib ile sıkıştırılmış
+        bölgeler : bölge başına '<BHIHIIiiii'
+                   seviye (1=il, 2=ilçe), üst bölge, isim ofseti, isim uzunluğu,
+                   ilk halka, halka sayısı, bbox (min_lon, min_lat, max_lon, max_lat)
+        halkalar : halka başına '<II'  ilk köşe, köşe sayısı
+        köşeler  : köşe başına '<ii'   boylam, enlem (COORD_SCALE ile ölçekli)
+        isimler  : UTF-8 isim tablosu
+
+Dosya tools/build_boundaries.py ile GeoJSON sınırlarından üretilir.
+"""
+
+import os
+import struct
+import zlib
+from array import array
+
+from runtime import Logger
+
+MAGIC = b'TRBD'
+VERSION = 1
+COORD_SCALE = 100000            # 1e-5 derece (~1 m)
+NO_PARENT = 0xFFFF
+
+LEVEL_PROVINCE = 1
+LEVEL_DISTRICT = 2
+
+HEADER = struct.Struct('<4sHHI')
+REGION = struct.Struct('<BHIHIIiiii')
+RING = struct.Struct('<II')
+
+# Izgara indeksi hücre boyutu (derece)
+GRID_CELL = 0.25
+
+DEFAULT_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'data', 'tr_boundaries.bin'
+)
+
+
+class OfflineResolver:
+    """Izgara indeksli nokta-poligon sorgusu ile il/ilçe çözümleyici"""
+
+    def __init__(self, regions, rings, vertices, grid_cell=GRID_CELL):
+        # regions: (seviye, üst, isim, ilk halka, halka sayısı, bbox) demetleri
+        self.regions = regions
+        self.rings = rings
+        self.vertices = vertices
+        self.grid_cell = grid_cell
+        self._grid = {}
+        self._build_index()
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_DATA_PATH):
+        """İkili sınır dosyasını yükle"""
+        with open(path, 'rb') as f:
+            raw = f.read()
+
+        magic, version, region_count, body_len = HEADER.unpack_from(raw, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Geçersiz sınır dosyası: {path}")
+
+        body = zlib.decompress(raw[HEADER.size:HEADER.size + body_len])
+        offset = 0
+
+        region_rows = []
+        for _ in range(region_count):
+            region_rows.append(REGION.unpack_from(body, offset))
+            offset += REGION.size
+
+        ring_total = max((r[4] + r[5] for r in region_rows), default=0)
+        rings = []
+        for _ in range(ring_total):
+            rings.append(RING.unpack_from(body, offset))
+            offset += RING.size
+
+        vertex_total = max((start + count for start, count in rings), default=0)
+        vertices = array('i')
+        vertices.frombytes(body[offset:offset + vertex_total * 8])
+        if struct.pack('=i', 1) != struct.pack('<i', 1):
+            vertices.byteswap()
+        offset += vertex_total * 8
+
+        names = body[offset:]
+        regions = []
+        for level, parent, name_off, name_len, ring_start, ring_count, *bbox in region_rows:
+            name = names[name_off:name_off + name_len].decode('utf-8')
+            regions.append((level, parent, name, ring_start, ring_count, tuple(bbox)))
+
+        return cls(regions, rings, vertices)
+
+    @classmethod
+    def load_default(cls):
+        """Paketlenmiş sınır dosyasını yükle, yoksa None döndür"""
+        if not os.path.exists(DEFAULT_DATA_PATH):
+            Logger.warning("OfflineResolver: Sınır dosyası bulunamadı - çevrimdışı çözümleme kapalı")
+            return None
+        try:
+            resolver = cls.from_file(DEFAULT_DATA_PATH)
+            Logger.info(f"OfflineResolver: {len(resolver.regions)} bölge yüklendi")
+            return resolver
+        except (OSError, ValueError, struct.error, zlib.error) as e:
+            Logger.error(f"OfflineResolver: Sınır dosyası okunamadı - {str(e)}")
+            return None
+
+    def _build_index(self):
+        """Bölgeleri bbox'larına göre ızgara hücrelerine dağıt"""
+        for idx, region in enumerate(self.regions):
+            min_lon, min_lat, max_lon, max_lat = region[5]
+            x0, y0 = self._cell(min_lon / COORD_SCALE, min_lat / COORD_SCALE)
+            x1, y1 = self._cell(max_lon / COORD_SCALE, max_lat / COORD_SCALE)
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    self._grid.setdefault((x, y), []).append(idx)
+
+    def _cell(self, lon, lat):
+        return int(lon // self.grid_cell), int(lat // self.grid_cell)
+
+    def _contains(self, region, x, y):
+        """Çift-tek kuralıyla nokta bölgenin içinde mi"""
+        min_lon, min_lat, max_lon, max_lat = region[5]
+        if not (min_lon <= x <= max_lon and min_lat <= y <= max_lat):
+            return False
+
+        verts = self.vertices
+        inside = False
+        ring_start, ring_count = region[3], region[4]
+        for start, count in self.rings[ring_start:ring_start + ring_count]:
+            j = start + count - 1
+            for i in range(start, start + count):
+                xi, yi = verts[2 * i], verts[2 * i + 1]
+                xj, yj = verts[2 * j], verts[2 * j + 1]
+                if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                    inside = not inside
+                j = i
+        return inside
+
+    def lookup(self, lat, lon):
+        """Koordinatın il/ilçe bilgisini Nominatim adres biçiminde döndür"""
+        x = int(round(lon * COORD_SCALE))
+        y = int(round(lat * COORD_SCALE))
+
+        candidates = self._grid.get(self._cell(lon, lat), ())
+
+        district = None
+        for idx in candidates:
+            region = self.regions[idx]
+            if region[0] == LEVEL_DISTRICT and self._contains(region, x, y):
+                district = region
+                break
+
+        province = None
+        if district is not None and district[1] != NO_PARENT:
+            province = self.regions[district[1]]
+        else:
+            for idx in candidates:
+                region = self.regions[idx]
+                if region[0] == LEVEL_PROVINCE and self._contains(region, x, y):
+                    province = region
+                    break
+
+        if province is None and district is None:
+            return None
+
+        address = {}
+        if province is not None:
+            address['state'] = province[2]
+        if district is not None:
+            address['town'] = district[2]
+        return address
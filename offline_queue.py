@@ -0,0 +1,232 @@
+"""
+Çevrimdışı Kuyruk
+Ağ yokken çözümlenemeyen konumları ve bekleyen olayları kalıcı (SQLite)
+kuyrukta tutar; bağlantı geri geldiğinde toplu olarak boşaltır.
+
+Kuyruk kayıt sayısıyla sınırlıdır, dolunca en eski kayıt atılır. Boşaltıcı
+bağlantı yokken hiçbir iş yapmaz; bağlantı gelince kuyruğu batch_size'lık
+parçalar halinde işler.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from android_bridge import handles
+from geocache import default_data_dir
+from runtime import Logger, platform
+
+QUEUE_FILENAME = 'offline_queue.sqlite3'
+DEFAULT_MAX_ITEMS = 5000
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_CHECK_INTERVAL = 60     # saniye; bağlantı yoklama aralığı
+
+KIND_FIX = 'fix'
+
+
+def network_available():
+    """Etkin bir ağ bağlantısı var mı (masaüstünde her zaman True)"""
+    if platform != 'android':
+        return True
+    try:
+        info = handles.system_service('CONNECTIVITY_SERVICE').getActiveNetworkInfo()
+        return info is not None and info.isConnected()
+    except Exception as e:
+        Logger.error(f"OfflineQueue: Bağlantı kontrol hatası - {str(e)}")
+        return True
+
+
+class OfflineQueue:
+    """Sınırlı, kalıcı FIFO kuyruk (tür + JSON yük)"""
+
+    def __init__(self, path=None, max_items=DEFAULT_MAX_ITEMS,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, clock=time.time):
+        self.path = path or os.path.join(default_data_dir(), QUEUE_FILENAME)
+        self.max_items = max_items
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS pending ('
+                ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+                ' kind TEXT NOT NULL,'
+                ' payload TEXT NOT NULL,'
+                ' created REAL NOT NULL,'
+                ' attempts INTEGER NOT NULL DEFAULT 0)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS pending_kind ON pending (kind, id)')
+            self._conn.commit()
+        return self._conn
+
+    def push(self, kind, payload):
+        """Kaydı kuyruğa ekle; kapasite aşılırsa en eskileri at"""
+        self.push_many(kind, [payload])
+
+    def push_many(self, kind, payloads):
+        """Kayıtları tek işlemde kuyruğa ekle; kapasite aşılırsa en eskileri at"""
+        if not payloads:
+            return
+        created = self.clock()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.executemany(
+                    'INSERT INTO pending (kind, payload, created) VALUES (?, ?, ?)',
+                    [(kind, json.dumps(payload, ensure_ascii=False), created)
+                     for payload in payloads]
+                )
+                excess = conn.execute('SELECT COUNT(*) FROM pending').fetchone()[0] - self.max_items
+                if excess > 0:
+                    conn.execute(
+                        'DELETE FROM pending WHERE id IN ('
+                        ' SELECT id FROM pending ORDER BY id ASC LIMIT ?)', (excess,)
+                    )
+                    self.dropped += excess
+                conn.commit()
+        except sqlite3.Error as e:
+            Logger.error(f"OfflineQueue: Yazma hatası - {str(e)}")
+
+    def peek(self, kind, limit=DEFAULT_BATCH_SIZE):
+        """En eski kayıtları silmeden döndür: [(id, yük), ...]"""
+        try:
+            with self._lock:
+                rows = self._connection().execute(
+                    'SELECT id, payload FROM pending WHERE kind = ? ORDER BY id ASC LIMIT ?',
+                    (kind, limit)
+                ).fetchall()
+        except sqlite3.Error as e:
+            Logger.error(f"OfflineQueue: Okuma hatası - {str(e)}")
+            return []
+        return [(row_id, json.loads(payload)) for row_id, payload in rows]
+
+    def ack(self, ids):
+        """İşlenen kayıtları sil"""
+        self._execute_many('DELETE FROM pending WHERE id = ?', ids)
+
+    def retry(self, ids):
+        """İşlenemeyen kayıtların deneme sayısını artır, sınırı aşanları at"""
+        self._execute_many('UPDATE pending SET attempts = attempts + 1 WHERE id = ?', ids)
+        try:
+            with self._lock:
+                conn = self._connection()
+                dropped = conn.execute('DELETE FROM pending WHERE attempts >= ?',
+                                       (self.max_attempts,)).rowcount
+                conn.commit()
+                self.dropped += dropped
+        except sqlite3.Error as e:
+            Logger.error(f"OfflineQueue: Yazma hatası - {str(e)}")
+
+    def _execute_many(self, sql, ids):
+        if not ids:
+            return
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.executemany(sql, [(row_id,) for row_id in ids])
+                conn.commit()
+        except sqlite3.Error as e:
+            Logger.error(f"OfflineQueue: Yazma hatası - {str(e)}")
+
+    def count(self, kind=None):
+        try:
+            with self._lock:
+                conn = self._connection()
+                if kind is None:
+                    return conn.execute('SELECT COUNT(*) FROM pending').fetchone()[0]
+                return conn.execute('SELECT COUNT(*) FROM pending WHERE kind = ?',
+                                    (kind,)).fetchone()[0]
+        except sqlite3.Error as e:
+            Logger.error(f"OfflineQueue: Okuma hatası - {str(e)}")
+            return 0
+
+    def oldest(self, kind):
+        """En eski kaydın eklenme zamanı, kuyruk boşsa None"""
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    'SELECT created FROM pending WHERE kind = ? ORDER BY id ASC LIMIT 1', (kind,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            Logger.error(f"OfflineQueue: Okuma hatası - {str(e)}")
+            return None
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class QueueFlusher:
+    """Bağlantı varken kuyruğu parçalar halinde boşaltan görev
+
+    handlers: tür -> handler(yükler) ; handler her yük için True (işlendi)
+    ya da False (sonra tekrar dene) içeren liste döndürür ve iş parçacığında
+    çalışır (engelleyebilir).
+    """
+
+    def __init__(self, queue, handlers, is_online=network_available,
+                 batch_size=DEFAULT_BATCH_SIZE, check_interval=DEFAULT_CHECK_INTERVAL):
+        self.queue = queue
+        self.handlers = dict(handlers)
+        self.is_online = is_online
+        self.batch_size = batch_size
+        self.check_interval = check_interval
+        self.flushed = 0
+        self._wakeup = None
+
+    def wake(self):
+        """Bağlantının geri geldiği anlaşıldığında beklemeden boşalt"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run(self):
+        self._wakeup = asyncio.Event()
+        while True:
+            if await asyncio.to_thread(self.is_online):
+                await self.flush()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def flush(self):
+        """Tüm türleri boşalt; bir parça hiç işlenemezse o tür için dur"""
+        for kind, handler in self.handlers.items():
+            while True:
+                batch = await asyncio.to_thread(self.queue.peek, kind, self.batch_size)
+                if not batch:
+                    break
+
+                ids = [row_id for row_id, _ in batch]
+                try:
+                    done = await asyncio.to_thread(handler, [payload for _, payload in batch])
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    Logger.error(f"OfflineQueue: {kind} boşaltma hatası - {str(e)}")
+                    done = [False] * len(batch)
+
+                acked = [row_id for row_id, ok in zip(ids, done) if ok]
+                failed = [row_id for row_id, ok in zip(ids, done) if not ok]
+                await asyncio.to_thread(self.queue.ack, acked)
+                await asyncio.to_thread(self.queue.retry, failed)
+                self.flushed += len(acked)
+                Logger.info(f"OfflineQueue: {kind} - {len(acked)} işlendi, {len(failed)} bekliyor")
+
+                if not acked:
+                    # Ağ yine kesilmiş olabilir; bir sonraki kontrolde tekrar denenir
+                    break
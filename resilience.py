@@ -0,0 +1,185 @@
+"""
+İstek Koruyucuları
+Ağ arka uçlarını aşırı istekten ve art arda hatalardan koruyan token kovası
+ve devre kesici.
+
+Token kovası path verilirse durumunu SQLite dosyasında tutar; böylece
+uygulama, servis ve araçlar aynı hız sınırını paylaşır.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from geocache import default_data_dir
+from runtime import Logger
+
+LIMITER_FILENAME = 'rate_limits.sqlite3'
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+def default_limiter_path():
+    return os.path.join(default_data_dir(), LIMITER_FILENAME)
+
+
+class TokenBucket:
+    """Saniyede rate token dolan, en fazla capacity token tutan kova"""
+
+    def __init__(self, rate=1.0, capacity=1.0, name='default', path=None,
+                 clock=time.time, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self.path = path
+        self.clock = clock
+        self.sleep = sleep
+        self.granted = 0
+        self.denied = 0
+        self._tokens = capacity
+        self._updated = None
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _take(self):
+        """Token almayı dene; alınamazsa bir token için beklenecek süreyi döndür"""
+        with self._lock:
+            if self.path is None:
+                tokens, updated = self._tokens, self._updated
+                tokens, wait = self._refill_and_take(tokens, updated)
+                self._tokens, self._updated = tokens, self.clock()
+                return wait
+            return self._take_shared()
+
+    def _refill_and_take(self, tokens, updated):
+        now = self.clock()
+        if updated is not None:
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            return tokens - 1, 0.0
+        return tokens, (1 - tokens) / self.rate
+
+    def _take_shared(self):
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False,
+                                             isolation_level=None)
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS buckets ('
+                    ' name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+                )
+            conn = self._conn
+            # Süreçler arası: okuma-değiştirme-yazma tek yazma kilidi altında
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT tokens, updated FROM buckets WHERE name = ?',
+                                   (self.name,)).fetchone()
+                tokens, updated = row if row is not None else (self.capacity, None)
+                tokens, wait = self._refill_and_take(tokens, updated)
+                conn.execute('INSERT OR REPLACE INTO buckets (name, tokens, updated)'
+                             ' VALUES (?, ?, ?)', (self.name, tokens, self.clock()))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            return wait
+
+        except sqlite3.Error as e:
+            # Paylaşılan durum okunamazsa süreç içi kovaya düş
+            Logger.error(f"RateLimit: Paylaşılan kova hatası - {str(e)}")
+            tokens, wait = self._refill_and_take(self._tokens, self._updated)
+            self._tokens, self._updated = tokens, self.clock()
+            return wait
+
+    def try_acquire(self):
+        """Token varsa al ve True döndür, yoksa beklemeden False"""
+        if self._take() == 0:
+            self.granted += 1
+            return True
+        self.denied += 1
+        return False
+
+    def acquire(self, timeout=None):
+        """Token alınana kadar bekle; timeout aşılırsa False"""
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait = self._take()
+            if wait == 0:
+                self.granted += 1
+                return True
+            if deadline is not None and self.clock() + wait > deadline:
+                self.denied += 1
+                return False
+            self.sleep(wait)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CircuitBreaker:
+    """Art arda hatalarda devreyi açan, süre dolunca tek deneme isteği geçiren kesici
+
+    closed    : istekler geçer, failure_threshold ardışık hatada açılır
+    open      : istekler hemen reddedilir, reset_timeout sonra yarı açık olur
+    half_open : tek deneme isteği geçer; başarılıysa kapanır, değilse yeniden açılır
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """İstek gönderilebilir mi"""
+        with self._lock:
+            if self.state == STATE_OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self.state = STATE_HALF_OPEN
+                self._probing = False
+
+            if self.state == STATE_HALF_OPEN:
+                if self._probing:
+                    self.rejected += 1
+                    return False
+                self._probing = True
+            return True
+
+    def release(self):
+        """allow() sonrası istek gönderilmediyse deneme hakkını geri ver"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != STATE_CLOSED:
+                Logger.info("CircuitBreaker: Devre kapandı")
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != STATE_OPEN:
+                    Logger.warning(f"CircuitBreaker: Devre açıldı ({self.failures} hata)")
+                self.state = STATE_OPEN
+                self._opened_at = self.clock()
+                self._probing = False
+
+    def stats(self):
+        return {'state': self.state, 'failures': self.failures, 'rejected': self.rejected}
@@ -0,0 +1,89 @@
+"""
+Çalışma Ortamı
+Arayüz olmadan da kullanılabilen platform bilgisi, günlükçü ve gecikmeli
+içe aktarma.
+
+Servis süreci Kivy yüklemez: Logger, Kivy'nin günlükçüsü zaten yüklüyse
+(arayüz süreci) ona, değilse standart logging'e yazar. Ağır modüller
+(numpy, requests) lazy_import ile ilk kullanımda yüklenir.
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+
+
+def _detect_platform():
+    """kivy.utils.platform ile aynı kurallar (Kivy yüklemeden)"""
+    kivy_build = os.environ.get('KIVY_BUILD', '')
+    if kivy_build in ('android', 'ios'):
+        return kivy_build
+    if 'P4A_BOOTSTRAP' in os.environ or 'ANDROID_ARGUMENT' in os.environ:
+        return 'android'
+    if sys.platform in ('win32', 'cygwin'):
+        return 'win'
+    if sys.platform == 'darwin':
+        return 'macosx'
+    if sys.platform.startswith(('linux', 'freebsd')):
+        return 'linux'
+    return 'unknown'
+
+
+platform = _detect_platform()
+
+
+def lazy_import(name):
+    """Modülü ilk öznitelik erişiminde yükle; kurulu değilse None döndür
+
+    'np is None' gibi kontroller modülü yüklemez.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class _Logger:
+    """Kivy yüklüyse Kivy Logger'a, değilse standart logging'e yazan günlükçü"""
+
+    def __init__(self, name='location_tracker'):
+        self._logging = logging.getLogger(name)
+        self._configured = False
+
+    def _target(self):
+        kivy_logger = sys.modules.get('kivy.logger')
+        if kivy_logger is not None:
+            return kivy_logger.Logger
+        if not self._configured:
+            self._configured = True
+            if not self._logging.handlers and not logging.getLogger().handlers:
+                handler = logging.StreamHandler()
+                handler.setFormatter(logging.Formatter('[%(levelname)-7s] %(message)s'))
+                self._logging.addHandler(handler)
+                self._logging.setLevel(logging.INFO)
+        return self._logging
+
+    def debug(self, message):
+        self._target().debug(message)
+
+    def info(self, message):
+        self._target().info(message)
+
+    def warning(self, message):
+        self._target().warning(message)
+
+    def error(self, message):
+        self._target().error(message)
+
+
+Logger = _Logger()
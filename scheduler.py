@@ -0,0 +1,128 @@
+"""
+Uyarlanabilir Konum Sorgulama Zamanlayıcısı
+Hareket hızına göre bekleme süresini ayarlar, hatalarda üstel geri çekilme uygular
+"""
+
+import random
+import time
+
+from geometry import np, speed_array, speed_mps
+
+# Varsayılan ayarlar (saniye / metre / m/s)
+DEFAULT_MIN_INTERVAL = 30
+DEFAULT_MAX_INTERVAL = 600
+DEFAULT_BASE_INTERVAL = 120
+DEFAULT_TARGET_DISTANCE = 500       # iki güncelleme arasında kabul edilen yol
+DEFAULT_STATIONARY_SPEED = 0.5
+DEFAULT_ERROR_BASE = 30
+DEFAULT_ERROR_MAX = 600
+DEFAULT_JITTER = 0.2
+
+
+class AdaptiveScheduler:
+    """Hıza duyarlı bekleme süresi hesaplayıcı
+
+    Cihaz durağanken bekleme süresi her turda uzar (en fazla max_interval);
+    hareket halindeyken süre, bir turda target_distance kadar yol alınacak
+    şekilde kısalır (en az min_interval).
+    """
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL,
+                 base_interval=DEFAULT_BASE_INTERVAL, target_distance=DEFAULT_TARGET_DISTANCE,
+                 stationary_speed=DEFAULT_STATIONARY_SPEED, stationary_growth=1.5,
+                 error_base=DEFAULT_ERROR_BASE, error_max=DEFAULT_ERROR_MAX,
+                 jitter=DEFAULT_JITTER, smoothing=0.5, clock=time.time, rng=None):
+        if not 0 < min_interval <= base_interval <= max_interval:
+            raise ValueError("min_interval <= base_interval <= max_interval olmalı")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.base_interval = base_interval
+        self.target_distance = target_distance
+        self.stationary_speed = stationary_speed
+        self.stationary_growth = stationary_growth
+        self.error_base = error_base
+        self.error_max = error_max
+        self.jitter = jitter
+        self.smoothing = smoothing
+        self._clock = clock
+        self._rng = rng or random.Random()
+
+        self.speed = None               # yumuşatılmış hız tahmini (m/s)
+        self.interval = base_interval
+        self.consecutive_errors = 0
+        self._last_fix = None
+
+    def observe(self, location):
+        """Yeni konumu işle ve hız tahminini güncelle"""
+        fix = {
+            'lat': location['lat'],
+            'lon': location['lon'],
+            'time': location.get('time') or self._clock(),
+        }
+
+        if self._last_fix is not None:
+            speed = speed_mps(self._last_fix, fix)
+            if speed is not None:
+                if self.speed is None:
+                    self.speed = speed
+                else:
+                    # Üstel hareketli ortalama ile GPS gürültüsünü bastır
+                    self.speed = self.smoothing * speed + (1 - self.smoothing) * self.speed
+
+        self._last_fix = fix
+        return self.speed
+
+    def observe_many(self, locations):
+        """Sıralı konum listesini tek seferde işle (kuyruk boşaltma, yeniden oynatma)"""
+        if np is None or len(locations) < 2:
+            for location in locations:
+                self.observe(location)
+            return self.speed
+
+        now = self._clock()
+        fixes = [self._last_fix] if self._last_fix is not None else []
+        fixes += [{'lat': loc['lat'], 'lon': loc['lon'], 'time': loc.get('time') or now}
+                  for loc in locations]
+
+        speeds = speed_array([f['lat'] for f in fixes], [f['lon'] for f in fixes],
+                             [f['time'] for f in fixes])
+        speeds = speeds[~np.isnan(speeds)]
+        if speeds.size:
+            if self.speed is None:
+                self.speed, speeds = float(speeds[0]), speeds[1:]
+            # Üstel hareketli ortalamanın kapalı biçimi
+            decay = 1 - self.smoothing
+            weights = self.smoothing * decay ** np.arange(speeds.size - 1, -1, -1)
+            self.speed = float(decay ** speeds.size * self.speed + weights @ speeds)
+
+        self._last_fix = fixes[-1]
+        return self.speed
+
+    def reset(self):
+        """Hız tahminini unut (ör. uzun askıdan sonra hareket yeniden başladığında)"""
+        self.speed = None
+        self.interval = self.base_interval
+        self._last_fix = None
+
+    def next_interval(self):
+        """Başarılı turdan sonra beklenecek süre"""
+        self.consecutive_errors = 0
+
+        if self.speed is None:
+            interval = self.base_interval
+        elif self.speed < self.stationary_speed:
+            # Durağan: süreyi kademeli olarak uzat
+            interval = max(self.interval, self.base_interval) * self.stationary_growth
+        else:
+            interval = self.target_distance / self.speed
+
+        self.interval = min(self.max_interval, max(self.min_interval, interval))
+        return self.interval
+
+    def record_error(self):
+        """Hatadan sonra beklenecek süre (jitter'lı üstel geri çekilme)"""
+        self.consecutive_errors += 1
+        delay = min(self.error_max, self.error_base * 2 ** (self.consecutive_errors - 1))
+        spread = delay * self.jitter
+        return min(self.error_max, max(0.0, delay + self._rng.uniform(-spread, spread)))
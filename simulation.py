@@ -0,0 +1,275 @@
+"""
+Konum Simülasyonu
+Kayıtlı GPX/CSV izlerinden veya sentetik bir günlük yörüngeden konum üreten,
+sanal saatle (bkz. clock.py) çalışan konum kaynağı.
+
+Motor her turda kaynağı boşalttığında, sanal zamana kadar olan tüm
+konumlar sırayla verilir; iş parçacığı ve gerçek bekleme yoktur. İzin ilk
+konumu saatin başlangıcına hizalanır. SimulatedAccelerometer aynı izden
+hareket algılayıcı (bkz. motion.py) için ivme örnekleri üretir.
+"""
+
+import asyncio
+import csv
+import math
+import random
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from geometry import EARTH_RADIUS_M, haversine_m
+from locations import DESKTOP_LOCATION, LocationProvider
+from motion import DEFAULT_SAMPLE_RATE, DEFAULT_WINDOW, AccelerometerSource
+
+SIM_PROVIDER = 'sim'
+
+# CSV başlıkları için kabul edilen adlar
+_CSV_FIELDS = {
+    'lat': ('lat', 'latitude', 'enlem'),
+    'lon': ('lon', 'lng', 'longitude', 'boylam'),
+    'time': ('time', 'timestamp', 'zaman'),
+    'accuracy': ('accuracy', 'acc', 'dogruluk'),
+}
+
+# Sentetik gün: (durum, en kısa, en uzun süre sn, hız m/s)
+_SYNTHETIC_LEGS = [
+    ('stay', 1800, 4 * 3600, 0.0),
+    ('walk', 300, 1800, 1.4),
+    ('drive', 600, 3600, 12.0),
+]
+
+# Etkinliğe göre ivme büyüklüğü gürültüsü (m/s², standart sapma)
+_ACTIVITY_NOISE = {'stay': 0.02, 'walk': 2.0, 'drive': 0.35}
+GRAVITY = 9.81
+
+
+def _parse_time(value):
+    """Unix zamanı veya ISO 8601 metnini saniyeye çevir"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.strip().replace('Z', '+00:00')).timestamp()
+
+
+def load_gpx(path):
+    """GPX dosyasındaki iz noktalarını sırayla üret"""
+    for _, element in ET.iterparse(path):
+        if not element.tag.endswith('}trkpt') and element.tag != 'trkpt':
+            continue
+        time_text = next((child.text for child in element if child.tag.endswith('time')), None)
+        if time_text is not None:
+            yield {'lat': float(element.get('lat')), 'lon': float(element.get('lon')),
+                   'time': _parse_time(time_text), 'provider': SIM_PROVIDER}
+        element.clear()
+
+
+def load_csv(path):
+    """CSV dosyasındaki konumları sırayla üret (lat, lon, time[, accuracy])"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        columns = {}
+        for key, aliases in _CSV_FIELDS.items():
+            columns[key] = next((name for name in reader.fieldnames or []
+                                 if name.strip().lower() in aliases), None)
+        if not all(columns[key] for key in ('lat', 'lon', 'time')):
+            raise ValueError(f"CSV başlıkları eksik: {reader.fieldnames}")
+
+        for row in reader:
+            fix = {'lat': float(row[columns['lat']]), 'lon': float(row[columns['lon']]),
+                   'time': _parse_time(row[columns['time']]), 'provider': SIM_PROVIDER}
+            if columns['accuracy'] and row[columns['accuracy']]:
+                fix['accuracy'] = float(row[columns['accuracy']])
+            yield fix
+
+
+def load_trace(path):
+    """Uzantıya göre GPX veya CSV izini yükle"""
+    if path.lower().endswith('.gpx'):
+        return load_gpx(path)
+    return load_csv(path)
+
+
+def synthetic_trajectory(duration=86400, interval=1.0, start=DESKTOP_LOCATION,
+                         start_time=0.0, seed=None):
+    """Durak, yürüyüş ve araç yolculuğu dönemlerinden oluşan sentetik iz üret"""
+    rng = random.Random(seed)
+    lat, lon = start['lat'], start['lon']
+    bearing = rng.uniform(0, 2 * math.pi)
+    t = start_time
+    end = start_time + duration
+    leg_end = t
+
+    while t <= end:
+        if t >= leg_end:
+            activity, shortest, longest, speed = rng.choice(_SYNTHETIC_LEGS)
+            leg_end = t + rng.uniform(shortest, longest)
+            bearing = rng.uniform(0, 2 * math.pi)
+
+        if speed > 0:
+            bearing += rng.gauss(0, 0.05)
+            step = speed * interval
+            lat += math.degrees(step * math.cos(bearing) / EARTH_RADIUS_M)
+            lon += math.degrees(step * math.sin(bearing) /
+                                (EARTH_RADIUS_M * math.cos(math.radians(lat))))
+        # GPS gürültüsü (~5 m)
+        noise = 5.0 / EARTH_RADIUS_M
+        yield {'lat': lat + math.degrees(rng.gauss(0, noise)),
+               'lon': lon + math.degrees(rng.gauss(0, noise)),
+               'accuracy': 5.0, 'time': t, 'provider': SIM_PROVIDER, 'activity': activity}
+        t += interval
+
+
+def _activity(fix, previous):
+    """Konumun etkinliği: izde yoksa önceki konuma göre hızdan tahmin edilir"""
+    if 'activity' in fix:
+        return fix['activity']
+    if previous is None or fix['time'] <= previous['time']:
+        return 'stay'
+    speed = (haversine_m(previous['lat'], previous['lon'], fix['lat'], fix['lon'])
+             / (fix['time'] - previous['time']))
+    if speed < 0.5:
+        return 'stay'
+    return 'walk' if speed < 3.0 else 'drive'
+
+
+class SimulatedLocationProvider(LocationProvider):
+    """İzdeki konumları sanal saate göre veren kaynak
+
+    stop() ile askıya alındığında (cihaz durağan) konum verilmez; start()
+    arada kalan konumları atlar ve yalnızca en sonuncuyu verir.
+    """
+
+    def __init__(self, fixes, clock):
+        super().__init__()
+        self.clock = clock
+        self._fixes = iter(fixes)
+        self._next = None
+        self._offset = None
+        self.exhausted = False
+        self.suspended = False
+        self.skipped = 0
+        self._pending = None
+
+    @property
+    def finished(self):
+        """İzdeki tüm konumlar verildi (veya askıdayken atlandı) mı"""
+        if self.suspended:
+            self._skip_to(self.clock.time())
+        return self.exhausted and self._next is None
+
+    def start(self):
+        if self.suspended:
+            self.suspended = False
+            latest = self._skip_to(self.clock.time())
+            if latest is not None:
+                # Dinleyici yeniden kaydedilince son bilinen konum hemen gelir
+                self.skipped -= 1
+                if self._next is not None:
+                    self._pending = self._next
+                self._next = latest
+
+    def stop(self):
+        self.suspended = True
+
+    def _skip_to(self, now):
+        """Zamanı geçmiş konumları atla, atlanan en son konumu döndür"""
+        if self._next is None and not self.exhausted:
+            self._next = self._advance()
+        latest = None
+        while self._next is not None and self._next['time'] <= now:
+            latest = self._next
+            self.skipped += 1
+            self._next = self._advance()
+        return latest
+
+    def _advance(self):
+        if self._pending is not None:
+            fix, self._pending = self._pending, None
+            return fix
+        fix = next(self._fixes, None)
+        if fix is None:
+            self.exhausted = True
+            return None
+        if self._offset is None:
+            self._offset = self.clock.start - fix['time']
+        return dict(fix, time=fix['time'] + self._offset)
+
+    def drain(self):
+        """Sanal zamana kadar olan konumları sırayla döndür"""
+        if self.suspended:
+            return []
+        if self._next is None and not self.exhausted:
+            self._next = self._advance()
+
+        now = self.clock.time()
+        fixes = []
+        while self._next is not None and self._next['time'] <= now:
+            fixes.append(self._next)
+            self._next = self._advance()
+
+        self.received += len(fixes)
+        if fixes:
+            self.last_fix = fixes[-1]
+        return fixes
+
+
+class SimulatedAccelerometer(AccelerometerSource):
+    """İzdeki etkinliğe göre sanal saatte ivme örnekleri üreten kaynak
+
+    Örnekler yalnızca son window saniye için üretilir; algılayıcı daha eskisini
+    zaten kullanmaz, uzun askılarda gereksiz iş yapılmaz.
+    """
+
+    def __init__(self, fixes, clock, rate=DEFAULT_SAMPLE_RATE, window=DEFAULT_WINDOW,
+                 seed=None):
+        self.clock = clock
+        self.rate = rate
+        self.window = window
+        self._rng = random.Random(seed)
+        self._fixes = iter(fixes)
+        self._offset = None
+        self._current = None
+        self._next = None
+        self._last_sample = None
+
+    def _activity_at(self, t):
+        if self._offset is None:
+            self._next = next(self._fixes, None)
+            if self._next is None:
+                return 'stay'
+            self._offset = self.clock.start - self._next['time']
+        while self._next is not None and self._next['time'] + self._offset <= t:
+            self._next = dict(self._next, activity=_activity(self._next, self._current))
+            self._current = self._next
+            self._next = next(self._fixes, None)
+        return self._current['activity'] if self._current is not None else 'stay'
+
+    def read(self):
+        now = self.clock.time()
+        step = 1.0 / self.rate
+        t = now - self.window
+        if self._last_sample is not None:
+            t = max(t, self._last_sample + step)
+
+        samples = []
+        while t <= now:
+            noise = _ACTIVITY_NOISE[self._activity_at(t)]
+            samples.append((t, self._rng.gauss(0, noise / 4), self._rng.gauss(0, noise / 4),
+                            GRAVITY + self._rng.gauss(0, noise)))
+            self._last_sample = t
+            t += step
+        return samples
+
+
+async def run_until_finished(engine, provider, poll=0.01):
+    """Motoru iz bitene ve son konum işlenene kadar çalıştır, sonra durdur"""
+    # Beklemesiz kipte gerçek bekleme sanal saati izin sonundan öteye taşır
+    if provider.clock.synchronous:
+        poll = 0
+    task = engine.start()
+    try:
+        while not provider.finished and not task.done():
+            await asyncio.sleep(poll)
+        await engine.idle()
+    finally:
+        engine.stop()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,187 @@
+"""
+Durum Kanalı (IPC)
+Servis konum/durum olaylarını localhost üzerinden UDP ile yayınlar,
+arayüz abone olup son konumu kendi GPS/geocoding işi olmadan gösterir.
+
+Protokol: her datagram tek bir UTF-8 JSON nesnesidir
+    {"v": 1, "type": "<tür>", "ts": <unix zamanı>, "data": {...}}
+
+    subscribe    abone -> yayıncı  aboneliği başlatır/yeniler (kalp atışı)
+    unsubscribe  abone -> yayıncı  aboneliği bitirir
+    ack          yayıncı -> abone  aboneliğin alındığını doğrular
+    location     yayıncı -> abone  son konum ve adres metni
+    status       yayıncı -> abone  motor durumu (çalışıyor/durdu, aralık, sayaçlar)
+    backfill     yayıncı -> abone  ağ dönünce çözümlenen bekleyen konumlar ve bölgeleri
+    metrics      yayıncı -> abone  aralık ölçümleri: aşama histogramları, sayaçlar (bkz. metrics.py)
+    geofence     yayıncı -> abone  bölge giriş/çıkış/bekleme olayı (bkz. geofence.py)
+
+Yeni aboneye her türün son olayı hemen tekrar gönderilir.
+"""
+
+import asyncio
+import json
+import time
+
+from runtime import Logger
+
+PROTOCOL_VERSION = 1
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 47311
+SUBSCRIBER_TTL = 30         # saniye; kalp atışı gelmeyen abone düşer
+HEARTBEAT_INTERVAL = 10
+RETRY_INTERVAL = 1          # yayıncı aboneliği doğrulamadıysa
+
+
+def encode_message(msg_type, data=None):
+    """Olayı datagram baytlarına çevir"""
+    message = {'v': PROTOCOL_VERSION, 'type': msg_type, 'ts': time.time(), 'data': data or {}}
+    return json.dumps(message, ensure_ascii=False).encode('utf-8')
+
+
+def decode_message(payload):
+    """Datagramı sözlüğe çevir, geçersizse None"""
+    try:
+        message = json.loads(payload.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(message, dict) or message.get('v') != PROTOCOL_VERSION:
+        return None
+    return message
+
+
+class _PublisherProtocol(asyncio.DatagramProtocol):
+    def __init__(self, publisher):
+        self.publisher = publisher
+
+    def datagram_received(self, data, addr):
+        message = decode_message(data)
+        if message is not None:
+            self.publisher._handle(message, addr)
+
+
+class StatusPublisher:
+    """Motor tarafı: olayları abonelere yayınlar"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.subscribers = {}       # adres -> son kalp atışı
+        self.last_events = {}       # tür -> kodlanmış son olay
+        self._transport = None
+
+    async def start(self):
+        """Kontrol portunu dinlemeye başla; port doluysa yayın yapılmaz"""
+        loop = asyncio.get_running_loop()
+        try:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _PublisherProtocol(self), local_addr=(self.host, self.port)
+            )
+            # port=0 ise işletim sisteminin verdiği port
+            self.port = self._transport.get_extra_info('sockname')[1]
+            Logger.info(f"StatusChannel: Yayın {self.host}:{self.port} üzerinde")
+        except OSError as e:
+            Logger.warning(f"StatusChannel: Yayın başlatılamadı - {str(e)}")
+            self._transport = None
+        return self
+
+    def _handle(self, message, addr):
+        if message['type'] == 'subscribe':
+            is_new = addr not in self.subscribers
+            self.subscribers[addr] = time.monotonic()
+            self._transport.sendto(encode_message('ack'), addr)
+            if is_new:
+                # Geç katılan abone son durumu hemen görsün
+                for payload in self.last_events.values():
+                    self._transport.sendto(payload, addr)
+        elif message['type'] == 'unsubscribe':
+            self.subscribers.pop(addr, None)
+
+    def publish(self, msg_type, **data):
+        """Olayı tüm abonelere gönder (beklemez, kayıpsız teslim garanti edilmez)"""
+        payload = encode_message(msg_type, data)
+        self.last_events[msg_type] = payload
+        if self._transport is None:
+            return
+
+        now = time.monotonic()
+        for addr, seen in list(self.subscribers.items()):
+            if now - seen > SUBSCRIBER_TTL:
+                del self.subscribers[addr]
+                continue
+            self._transport.sendto(payload, addr)
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+class _SubscriberProtocol(asyncio.DatagramProtocol):
+    def __init__(self, subscriber):
+        self.subscriber = subscriber
+
+    def datagram_received(self, data, addr):
+        message = decode_message(data)
+        if message is not None:
+            self.subscriber._dispatch(message)
+
+
+class StatusSubscriber:
+    """Arayüz tarafı: yayıncıya abone olur ve olayları geri çağrıya iletir"""
+
+    def __init__(self, on_event, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.on_event = on_event
+        self.host = host
+        self.port = port
+        self.latest = {}            # tür -> son olay
+        self._last_received = None
+        self._transport = None
+        self._heartbeat = None
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _SubscriberProtocol(self),
+            local_addr=(self.host, 0), remote_addr=(self.host, self.port)
+        )
+        self._heartbeat = asyncio.ensure_future(self._heartbeat_loop())
+        return self
+
+    @property
+    def connected(self):
+        """Yayıncıdan yakın zamanda (ack veya olay) yanıt geldi mi"""
+        return (self._last_received is not None and
+                time.monotonic() - self._last_received < SUBSCRIBER_TTL)
+
+    async def _heartbeat_loop(self):
+        # Yayıncı yeniden başlarsa abonelik kendiliğinden yenilenir
+        while True:
+            self._send('subscribe')
+            await asyncio.sleep(HEARTBEAT_INTERVAL if self.connected else RETRY_INTERVAL)
+
+    def _send(self, msg_type):
+        if self._transport is not None:
+            try:
+                self._transport.sendto(encode_message(msg_type))
+            except OSError:
+                # Yayıncı henüz dinlemiyor; sonraki kalp atışında tekrar denenir
+                pass
+
+    def _dispatch(self, message):
+        self._last_received = time.monotonic()
+        if message['type'] == 'ack':
+            return
+        self.latest[message['type']] = message
+        try:
+            self.on_event(message)
+        except Exception as e:
+            Logger.error(f"StatusChannel: Olay işleme hatası - {str(e)}")
+
+    def close(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        if self._transport is not None:
+            self._send('unsubscribe')
+            self._transport.close()
+            self._transport = None
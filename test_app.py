@@ -6,6 +6,23 @@ Windows'ta uygulamayı test etmek için basit script
 
 import sys
 import os
+import tempfile
+from contextlib import contextmanager
+
+@contextmanager
+def temporary_data_dir():
+    """Varsayılan yolları kullanan bileşenleri geçici veri klasörüne yönlendir"""
+    # default_data_dir() bu değişkene uyar (bkz. geocache.py)
+    previous = os.environ.get('ANDROID_PRIVATE')
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['ANDROID_PRIVATE'] = tmp
+        try:
+            yield tmp
+        finally:
+            if previous is None:
+                os.environ.pop('ANDROID_PRIVATE', None)
+            else:
+                os.environ['ANDROID_PRIVATE'] = previous
 
 def test_imports():
     """Gerekli modülleri test et"""
@@ -48,27 +65,1203 @@ def test_location_service():
     try:
         # Ana uygulamayı import et
         from main import LocationService
+        from locations import get_current_location
         
-        service = LocationService()
-        
-        # Test konumu
-        test_location = service._get_current_location()
-        if test_location:
+        # Motorun önbellek, kilit ve kova dosyaları gerçek veri klasörüne yazılmasın
+        with temporary_data_dir():
+            service = LocationService()
+            
+            # Test konumu
+            test_location = get_current_location()
+            if not test_location:
+                print("[WARNING] Konum alinamadi (normal - GPS yok)")
+                return True
             print(f"[OK] Test konumu alindi: {test_location}")
             
             # Adres çözümleme testi
-            address = service._reverse_geocode(test_location['lat'], test_location['lon'])
+            address = service.engine.geocode(test_location['lat'], test_location['lon'])
+            service.close()
             print(f"[OK] Adres cozumleme: {address}")
             
             return True
-        else:
-            print("[WARNING] Konum alinamadi (normal - GPS yok)")
-            return True
             
     except Exception as e:
         print(f"[ERROR] Konum servisi hatasi: {e}")
         return False
 
+def test_location_provider():
+    """Konum kuyruğunu ve masaüstü kaynağının durdur/başlat davranışını test et"""
+    print("\n[TEST] Konum kaynagi test ediliyor...")
+    
+    try:
+        import threading
+        import time
+        from locations import DesktopLocationProvider
+        
+        # Kuyruk doluysa en eski konum atılmalı; boşken son konum korunmalı
+        provider = DesktopLocationProvider(queue_size=3)
+        for i in range(5):
+            provider.push({'lat': 41.0 + i, 'lon': 29.0})
+        drained = [fix['lat'] for fix in provider.drain()]
+        if drained != [43.0, 44.0, 45.0] or provider.latest()['lat'] != 45.0 \
+                or provider.drain() != []:
+            print(f"[ERROR] Beklenmeyen kuyruk davranisi: {drained}")
+            return False
+        
+        class SlowProvider(DesktopLocationProvider):
+            def _emit(self):
+                # Durdurma yayıcı konum üretirken gelsin
+                time.sleep(0.02)
+                super()._emit()
+        
+        # Art arda durdur/başlat tek yayıcı iş parçacığı bırakmalı
+        provider = SlowProvider(interval=0.01, speed=1.0, seed=1)
+        before = threading.active_count()
+        for _ in range(5):
+            provider.start()
+            time.sleep(0.015)
+            provider.stop()
+        provider.start()
+        time.sleep(0.1)
+        threads = threading.active_count() - before
+        provider.stop()
+        received = provider.received
+        time.sleep(0.05)
+        if threads != 1 or provider.received != received \
+                or threading.active_count() != before:
+            print(f"[ERROR] Yayici is parcacigi sizdi: {threads} is parcacigi")
+            return False
+        
+        if not 1 < len(provider.drain()) <= 64:
+            print("[ERROR] Yayici konum uretmedi")
+            return False
+        
+        print(f"[OK] Konum kaynagi calisiyor ({received} konum)")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Konum kaynagi test hatasi: {e}")
+        return False
+
+def test_geometry():
+    """NumPy geometri çekirdeklerini saf Python karşılıklarıyla karşılaştır"""
+    print("\n[TEST] Geometri cekirdekleri test ediliyor...")
+    
+    try:
+        from gating import ChangeGate
+        from geometry import cumulative_distance, haversine_array, haversine_m, stay_points
+        from simulation import synthetic_trajectory
+        
+        fixes = list(synthetic_trajectory(12 * 3600, interval=2.0, seed=1))
+        lat = [fix['lat'] for fix in fixes]
+        lon = [fix['lon'] for fix in fixes]
+        t = [fix['time'] for fix in fixes]
+        n = len(fixes)
+        
+        steps = [haversine_m(lat[i], lon[i], lat[i + 1], lon[i + 1]) for i in range(n - 1)]
+        vector = haversine_array(lat[:-1], lon[:-1], lat[1:], lon[1:])
+        if max(abs(a - b) for a, b in zip(steps, vector.tolist())) > 1e-6 \
+                or abs(cumulative_distance(lat, lon)[-1] - sum(steps)) > 1e-3:
+            print("[ERROR] Mesafe cekirdekleri skaler hesapla eslesmiyor")
+            return False
+        
+        # Sıralı durak algoritması (Li ve ark., 2008)
+        expected = []
+        i = 0
+        while i < n:
+            j = i + 1
+            while j < n and haversine_m(lat[i], lon[i], lat[j], lon[j]) <= 200:
+                j += 1
+            if t[j - 1] - t[i] >= 300:
+                expected.append((i, j - i))
+                i = j
+            else:
+                i += 1
+        stays = stay_points(lat, lon, t, max_distance=200, min_duration=300)
+        found = list(zip(stays['first'].tolist(), stays['count'].tolist()))
+        if not expected or found != expected:
+            print(f"[ERROR] Duraklar eslesmiyor: {found} != {expected}")
+            return False
+        
+        # Kapının iz boyunca seçtiği noktalar tek tek çalıştırmayla aynı olmalı
+        gate = ChangeGate()
+        sequential = []
+        for index, fix in enumerate(fixes):
+            if gate.should_geocode(fix):
+                gate.record_geocode(fix, 'adres')
+                sequential.append(index)
+        if ChangeGate().geocode_indices(lat, lon) != sequential:
+            print("[ERROR] Kapi secimi skaler calistirmayla eslesmiyor")
+            return False
+        
+        print(f"[OK] Geometri cekirdekleri calisiyor ({len(found)} durak)")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Geometri test hatasi: {e}")
+        return False
+
+def test_scheduler():
+    """Hıza göre aralığı, sınırları ve hata geri çekilmesini test et"""
+    print("\n[TEST] Zamanlayici test ediliyor...")
+    
+    try:
+        import random
+        from scheduler import AdaptiveScheduler
+        
+        now = [0.0]
+        
+        def fix(meters, t):
+            # Başlangıcın metre cinsinden kuzeyi
+            return {'lat': 41.0 + meters / 111195, 'lon': 29.0, 'time': t}
+        
+        scheduler = AdaptiveScheduler(clock=lambda: now[0], rng=random.Random(7))
+        if scheduler.next_interval() != 120:
+            print("[ERROR] Hiz bilinmeden taban aralik beklenirdi")
+            return False
+        
+        # 10 m/s, sonra 20 m/s: yumuşatılmış hız 15 m/s, aralık 500 m / 15 m/s
+        for meters, t in ((0, 0), (100, 10), (300, 20)):
+            scheduler.observe(fix(meters, t))
+        interval = scheduler.next_interval()
+        if abs(scheduler.speed - 15) > 0.01 or abs(interval - 500 / 15) > 0.01:
+            print(f"[ERROR] Beklenmeyen hiz/aralik: {scheduler.speed}, {interval}")
+            return False
+        
+        # Toplu işleme tek tek işlemeyle aynı tahmini vermeli
+        batch = AdaptiveScheduler(clock=lambda: now[0])
+        batch.observe_many([fix(0, 0), fix(100, 10), fix(300, 20)])
+        if abs(batch.speed - scheduler.speed) > 1e-6:
+            print(f"[ERROR] Toplu hiz tahmini farkli: {batch.speed}")
+            return False
+        
+        # Çok hızlıyken alt sınır
+        scheduler.observe(fix(10300, 30))
+        if scheduler.next_interval() != 30:
+            print(f"[ERROR] Alt sinir uygulanmadi: {scheduler.interval}")
+            return False
+        
+        # Durağanken aralık kademeli uzayıp üst sınırda kalmalı
+        scheduler.reset()
+        intervals = []
+        for t in range(0, 50, 10):
+            scheduler.observe(fix(0, t))
+            intervals.append(round(scheduler.next_interval()))
+        if intervals != [120, 180, 270, 405, 600]:
+            print(f"[ERROR] Beklenmeyen duragan araliklar: {intervals}")
+            return False
+        
+        # Hatalarda jitter'lı üstel geri çekilme (aynı tohumla tekrarlanabilir)
+        scheduler = AdaptiveScheduler(clock=lambda: now[0], rng=random.Random(7))
+        delays = [scheduler.record_error() for _ in range(6)]
+        rng = random.Random(7)
+        expected = []
+        for base in (30, 60, 120, 240, 480, 600):
+            expected.append(min(600, base + rng.uniform(-0.2 * base, 0.2 * base)))
+        if delays != expected:
+            print(f"[ERROR] Beklenmeyen geri cekilme: {delays}")
+            return False
+        
+        # Başarılı turdan sonra geri çekilme baştan başlamalı
+        scheduler.next_interval()
+        delay = scheduler.record_error()
+        if scheduler.consecutive_errors != 1 or not 24 <= delay <= 36:
+            print(f"[ERROR] Geri cekilme sifirlanmadi: {delay}")
+            return False
+        
+        print("[OK] Zamanlayici calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Zamanlayici test hatasi: {e}")
+        return False
+
+def test_change_gate():
+    """Değişiklik kapısının atlama, bastırma ve sayaçlarını test et"""
+    print("\n[TEST] Degisiklik kapisi test ediliyor...")
+    
+    try:
+        from gating import ChangeGate
+        from geocoder import TEXT_FAILED
+        
+        def fix(meters):
+            # Başlangıcın metre cinsinden kuzeyi
+            return {'lat': 41.0 + meters / 111195, 'lon': 29.0}
+        
+        gate = ChangeGate(min_distance=200)
+        decisions = []
+        # İlk konum çözümlenir, 200 m içindeki konum atlanır
+        for meters, text in ((0, 'Fatih'), (150, None), (250, 'Fatih'), (600, 'Beyoğlu')):
+            geocode = gate.should_geocode(fix(meters))
+            if geocode:
+                gate.record_geocode(fix(meters), text)
+            decisions.append((geocode, gate.should_notify(gate.last_text)))
+        if decisions != [(True, True), (False, False), (True, False), (True, True)]:
+            print(f"[ERROR] Beklenmeyen kapi kararlari: {decisions}")
+            return False
+        
+        # Geçici hata bildirilmemeli; aynı bölge çözülünce yeniden bildirim olmamalı
+        gate.record_geocode(fix(620), TEXT_FAILED, resolved=False)
+        failed = gate.should_notify(TEXT_FAILED, resolved=False)
+        # Başarısız çözümleme yakın konumda da yeniden denenmeli
+        retried = gate.should_geocode(fix(630))
+        gate.record_geocode(fix(630), 'Beyoğlu')
+        if failed or not retried or gate.should_notify('Beyoğlu') \
+                or gate.last_notified != 'Beyoğlu':
+            print("[ERROR] Cozumleme hatasi bildirimi veya son bildirimi degistirdi")
+            return False
+        
+        expected = {'ticks': 5, 'geocoded': 5, 'geocode_skipped': 1,
+                    'notified': 2, 'notification_suppressed': 4}
+        if gate.stats() != expected:
+            print(f"[ERROR] Beklenmeyen sayaclar: {gate.stats()}")
+            return False
+        
+        print("[OK] Degisiklik kapisi calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Degisiklik kapisi test hatasi: {e}")
+        return False
+
+def test_geocode_cache():
+    """Geocoding önbelleğini test et"""
+    print("\n[TEST] Geocoding onbellegi test ediliyor...")
+    
+    try:
+        from geocache import GeocodeCache
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = GeocodeCache(path=os.path.join(tmp, 'cache.sqlite3'), max_entries=2)
+            cache.put(41.0082, 28.9784, {'state': 'İstanbul', 'town': 'Fatih'})
+            
+            # Aynı hücredeki yakın nokta önbellekten gelmeli
+            if cache.get(41.0083, 28.9785) is None:
+                print("[ERROR] Onbellek isabeti bekleniyordu")
+                return False
+            
+            # Kapasite aşılınca en eski kayıt silinmeli
+            cache.put(39.9334, 32.8597, {'state': 'Ankara'})
+            cache.put(38.4237, 27.1428, {'state': 'İzmir'})
+            if cache.get(41.0082, 28.9784) is not None:
+                print("[ERROR] LRU tahliyesi calismadi")
+                return False
+            cache.close()
+        
+        print("[OK] Geocoding onbellegi calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Onbellek test hatasi: {e}")
+        return False
+
+def test_offline_resolver():
+    """Çevrimdışı il/ilçe çözümleyiciyi küçük bir sınır dosyasıyla test et"""
+    print("\n[TEST] Cevrimdisi cozumleyici test ediliyor...")
+    
+    try:
+        import json
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+        from build_boundaries import assign_parents, load_regions, write_boundaries
+        from offline_geocoder import LEVEL_DISTRICT, LEVEL_PROVINCE, OfflineResolver
+        
+        def square(name, west, east, **properties):
+            ring = [[west, 41.0], [east, 41.0], [east, 41.2], [west, 41.2], [west, 41.0]]
+            return {'type': 'Feature', 'properties': dict(properties, name=name),
+                    'geometry': {'type': 'Polygon', 'coordinates': [ring]}}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {}
+            for key, features in (
+                ('iller', [square('İstanbul', 29.0, 29.2)]),
+                ('ilceler', [square('Üsküdar', 29.0, 29.1, il='İstanbul'),
+                             square('Kadıköy', 29.1, 29.2, il='İstanbul')]),
+            ):
+                paths[key] = os.path.join(tmp, key + '.geojson')
+                with open(paths[key], 'w', encoding='utf-8') as f:
+                    json.dump({'type': 'FeatureCollection', 'features': features}, f)
+            
+            provinces = load_regions(paths['iller'], LEVEL_PROVINCE, 'name', 1)
+            districts = load_regions(paths['ilceler'], LEVEL_DISTRICT, 'name', 1)
+            assign_parents(provinces, districts, 'il')
+            path = os.path.join(tmp, 'sinirlar.bin')
+            write_boundaries(path, provinces, districts)
+            resolver = OfflineResolver.from_file(path)
+        
+        inside = resolver.lookup(41.1, 29.05)
+        if inside != {'state': 'İstanbul', 'town': 'Üsküdar'}:
+            print(f"[ERROR] Beklenmeyen ic nokta sonucu: {inside}")
+            return False
+        
+        if resolver.lookup(40.5, 29.5) is not None:
+            print("[ERROR] Disaridaki nokta bir bolgeye dusmemeli")
+            return False
+        
+        # Ortak kenardaki nokta tam olarak bir ilçeye düşmeli (çift-tek kuralı: doğudaki)
+        edge = resolver.lookup(41.1, 29.1)
+        if edge != {'state': 'İstanbul', 'town': 'Kadıköy'}:
+            print(f"[ERROR] Beklenmeyen kenar sonucu: {edge}")
+            return False
+        
+        print("[OK] Cevrimdisi cozumleyici calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Cevrimdisi cozumleyici test hatasi: {e}")
+        return False
+
+def test_batch_geocoder():
+    """Toplu çözümlemede hücre tekilleştirmeyi ve kaynak sırasını test et"""
+    print("\n[TEST] Toplu geocoding test ediliyor...")
+    
+    try:
+        from batch_geocoder import BatchGeocoder
+        from engine import ProcessLock, TrackingEngine
+        from geocache import GeocodeCache
+        from geocoder import Geocoder, GeocoderError
+        
+        class StandInGeocoder(Geocoder):
+            def __init__(self):
+                self.calls = []
+            
+            def reverse(self, lat, lon):
+                self.calls.append((lat, lon))
+                if lat < 38:
+                    raise GeocoderError("HTTP 503")
+                # Denizde adres yok
+                return {'state': 'İzmir'} if lon > 26 else None
+        
+        class StandInResolver:
+            def __init__(self):
+                self.calls = []
+            
+            def lookup(self, lat, lon):
+                self.calls.append((lat, lon))
+                return {'state': 'Ankara'} if lon > 32 else None
+        
+        points = [(38.4237, 27.1428), (41.0082, 28.9784), (39.9334, 32.8597),
+                  (38.4238, 27.1429), (41.0083, 28.9785), (36.9, 30.7)]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = GeocodeCache(path=os.path.join(tmp, 'cache.sqlite3'))
+            cache.put(41.0082, 28.9784, {'state': 'İstanbul'})
+            remote, offline = StandInGeocoder(), StandInResolver()
+            batch = BatchGeocoder(cache=cache, offline=offline, remote=remote)
+            results = batch.reverse_many(points)
+            # Ağdan gelen sonuç önbelleğe yazılmalı
+            cached = cache.get(38.4237, 27.1428)
+            cache.close()
+        
+        states = [address['state'] if address else None for address in results]
+        if states != ['İzmir', 'İstanbul', 'Ankara', 'İzmir', 'İstanbul', None]:
+            print(f"[ERROR] Sonuclar girdi sirasiyla eslesmiyor: {states}")
+            return False
+        
+        # Aynı hücre bir kez, önbellekte olan hücre hiç sorulmamalı
+        if len(remote.calls) != 2 or (41.0082, 28.9784) in offline.calls \
+                or len(offline.calls) != 3:
+            print(f"[ERROR] Beklenmeyen sorgular: ag {remote.calls}, cevrimdisi {offline.calls}")
+            return False
+        
+        if cached != {'state': 'İzmir'} or batch.last_stats['failed'] != 1 \
+                or batch.last_failed != [False] * 5 + [True]:
+            print(f"[ERROR] Beklenmeyen onbellek/istatistik: {batch.last_stats}")
+            return False
+        
+        # Kuyruktaki konumlardan yalnızca isteği başarısız olan yeniden denenmeli
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = TrackingEngine(locate=lambda: None, geocode=lambda lat, lon: '',
+                                    notify=lambda text: None,
+                                    lock=ProcessLock(os.path.join(tmp, 'tracking.lock')))
+            engine.geocoder = StandInGeocoder()
+            done = engine._resolve_backlog([{'lat': 38.4237, 'lon': 27.1428},
+                                            {'lat': 40.0, 'lon': 25.0},
+                                            {'lat': 36.9, 'lon': 30.7}])
+            engine.close()
+        if done != [True, True, False]:
+            print(f"[ERROR] Adressiz konum basarisiz sayildi: {done}")
+            return False
+        
+        print("[OK] Toplu geocoding calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Toplu geocoding test hatasi: {e}")
+        return False
+
+def test_resilience():
+    """Süreçler arası token kovasını ve devre kesici durumlarını test et"""
+    print("\n[TEST] Istek koruyuculari test ediliyor...")
+    
+    try:
+        import subprocess
+        from resilience import (
+            STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker,
+        )
+        
+        # İki süreç aynı dosyadaki kovadan 1 saniye boyunca token alır
+        script = (
+            "import sys, time\n"
+            "from resilience import TokenBucket\n"
+            "bucket = TokenBucket(rate=20, name='test', path=sys.argv[1])\n"
+            "end = time.time() + 1.0\n"
+            "while bucket.acquire(timeout=end - time.time()):\n"
+            "    print(time.time())\n"
+        )
+        root = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'limits.sqlite3')
+            workers = [subprocess.Popen([sys.executable, '-c', script, path], cwd=root,
+                                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                        text=True) for _ in range(2)]
+            grants = sorted(float(line) for worker in workers
+                            for line in worker.communicate(timeout=30)[0].split())
+        
+        span = grants[-1] - grants[0]
+        # Paylaşılmasaydı her süreç ayrı ayrı ~20 token alırdı
+        if not grants or len(grants) > 20 * span + 2 or len(grants) < 10:
+            print(f"[ERROR] Paylasilan kova hizi asildi: {len(grants)} token, {span:.2f} sn")
+            return False
+        
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        states = []
+        breaker.record_failure()
+        states.append(breaker.state)
+        breaker.record_failure()
+        states.append((breaker.state, breaker.allow()))
+        now[0] = 10
+        # Yarı açıkken yalnızca bir deneme isteği geçer; başarısızsa yeniden açılır
+        states.append((breaker.allow(), breaker.state, breaker.allow()))
+        breaker.record_failure()
+        states.append((breaker.state, breaker.allow()))
+        now[0] = 20
+        states.append((breaker.allow(), breaker.state))
+        breaker.record_success()
+        states.append((breaker.state, breaker.allow()))
+        if states != [STATE_CLOSED, (STATE_OPEN, False), (True, STATE_HALF_OPEN, False),
+                      (STATE_OPEN, False), (True, STATE_HALF_OPEN), (STATE_CLOSED, True)]:
+            print(f"[ERROR] Beklenmeyen devre durumlari: {states}")
+            return False
+        
+        print(f"[OK] Istek koruyuculari calisiyor ({len(grants)} token / {span:.2f} sn)")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Istek koruyuculari test hatasi: {e}")
+        return False
+
+def test_geocoder_standin():
+    """Nominatim arka ucunu yerel taklit sunucuya karşı test et"""
+    print("\n[TEST] Geocoder yerel taklide karsi test ediliyor...")
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+        from nominatim_standin import NominatimStandIn
+        from geocoder import NominatimGeocoder, address_text, TEXT_FAILED
+        
+        with NominatimStandIn() as standin:
+            geocoder = NominatimGeocoder(url=standin.url)
+            address = address_text(geocoder, 41.0082, 28.9784)
+            if 'Fatih' not in address:
+                print(f"[ERROR] Beklenmeyen adres: {address}")
+                return False
+            
+            # Sunucu hatası yer tutucu metne dönüşmeli
+            standin.status = 503
+            if address_text(geocoder, 41.0082, 28.9784) != TEXT_FAILED:
+                print("[ERROR] HTTP hatasi yer tutucuya donusmedi")
+                return False
+            
+            # Tüm istekler tek keep-alive bağlantısından gitmeli
+            standin.status = 200
+            for _ in range(3):
+                address_text(geocoder, 39.9334, 32.8597)
+            stats = geocoder.client.stats()
+            geocoder.close()
+            if stats['requests'] != 5 or stats['connections'] != 1 \
+                    or stats['reused'] != stats['requests'] - 1:
+                print(f"[ERROR] Baglanti yeniden kullanilmadi: {stats}")
+                return False
+        
+        print(f"[OK] Geocoder taklit sunucu: {address} ({stats['reused']} yeniden kullanim)")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Geocoder test hatasi: {e}")
+        return False
+
+def test_offline_queue():
+    """Çevrimdışı kuyruğu test et"""
+    print("\n[TEST] Cevrimdisi kuyruk test ediliyor...")
+    
+    try:
+        from offline_queue import OfflineQueue, KIND_FIX
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = OfflineQueue(path=os.path.join(tmp, 'queue.sqlite3'), max_items=3)
+            for i in range(5):
+                queue.push(KIND_FIX, {'lat': 41.0 + i, 'lon': 29.0})
+            
+            # Kapasite aşılınca en eski kayıtlar atılmalı
+            batch = queue.peek(KIND_FIX)
+            if [payload['lat'] for _, payload in batch] != [43.0, 44.0, 45.0]:
+                print(f"[ERROR] Beklenmeyen kuyruk icerigi: {batch}")
+                return False
+            
+            queue.ack([batch[0][0]])
+            if queue.count(KIND_FIX) != 2:
+                print("[ERROR] Islenen kayit silinmedi")
+                return False
+            queue.close()
+        
+        print("[OK] Cevrimdisi kuyruk calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Kuyruk test hatasi: {e}")
+        return False
+
+def test_track_store():
+    """Konum geçmişi deposunu yazıp geri okuyarak ve segment döndürerek test et"""
+    print("\n[TEST] Konum gecmisi deposu test ediliyor...")
+    
+    try:
+        from track_store import HEADER, RECORD, TrackReader, TrackWriter
+        from trajectory import create_simplifier, max_error
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            # Segment başına 10 kayıt, en fazla 2 segment
+            writer = TrackWriter(tmp, max_segment_bytes=HEADER.size + 10 * RECORD.size,
+                                 max_segments=2)
+            for i in range(25):
+                writer.append({'lat': 41.0 + i * 1e-5, 'lon': 29.0, 'accuracy': 4.6,
+                               'provider': 'gps'}, timestamp=1700000000 + i)
+            writer.close()
+            
+            # Bozuk segment okunurken atlanmalı
+            with open(os.path.join(tmp, 'track-1800000000.seg'), 'wb') as f:
+                f.write(b'bozuk')
+            
+            with TrackReader(tmp) as reader:
+                segments = len(reader.segments)
+                records = list(reader.scan())
+            
+            # Birkaç saniye eski gelen ağ konumları yeni segment açmamalı
+            mixed = os.path.join(tmp, 'karisik')
+            os.makedirs(mixed)
+            writer = TrackWriter(mixed, max_segments=1)
+            for i in range(20):
+                writer.append({'lat': 41.0, 'lon': 29.0, 'provider': 'network' if i % 2 else 'gps'},
+                              timestamp=1700000000 + i - 5 * (i % 2))
+            with TrackReader(mixed) as reader:
+                interleaved = (len(reader.segments), len(list(reader.scan())))
+            # Geri saat atlamasında açılan segment en eski sıralansa da silinmemeli
+            writer.append({'lat': 41.0, 'lon': 29.0}, timestamp=1700000000 - 86400)
+            writer.close()
+            with TrackReader(mixed) as reader:
+                stepped = [t for t, _, _, _, _ in reader.scan()]
+            
+            # Sadeleştiricide bekleyen noktalar servis öldürülse de kaybolmamalı
+            # Henüz olmayan klasör yazıcı tarafından oluşturulmalı
+            track = os.path.join(tmp, 'sade')
+            fixes = [{'lat': 41.0 + i * 1e-4, 'lon': 29.0, 'time': 1700000000 + i}
+                     for i in range(100)]
+            writer = TrackWriter(track, simplifier=create_simplifier(tolerance=25))
+            for fix in fixes:
+                writer.append(fix)
+            # close() çağrılmadan bırakılan yazıcı (dosyalar çöp toplayıcıyla kapanır)
+            del writer
+            TrackWriter(track, simplifier=create_simplifier(tolerance=25)).close()
+            with TrackReader(track) as reader:
+                recovered = [{'lat': lat, 'lon': lon, 'time': t}
+                             for t, lat, lon, _, _ in reader.scan()]
+        
+        # Döndürmede en eski segment silinmeli, kalan kayıtlar sırayla okunmalı
+        if segments != 2 or len(records) != 15:
+            print(f"[ERROR] Beklenmeyen segment/kayit: {segments}, {len(records)}")
+            return False
+        
+        t, lat, lon, accuracy, provider = records[0]
+        if (t, round(lat, 7), lon, accuracy, provider) != (1700000010, 41.0001, 29.0, 5, 'gps'):
+            print(f"[ERROR] Beklenmeyen kayit: {records[0]}")
+            return False
+        
+        if interleaved != (1, 20) or stepped != [1700000000 - 86400]:
+            print(f"[ERROR] Sira disi kayitlar segmentleri bozdu: {interleaved}, {stepped}")
+            return False
+        
+        if recovered[-1]['time'] != fixes[-1]['time'] or max_error(fixes, recovered) > 25:
+            print(f"[ERROR] Bekleyen noktalar kurtarilmadi: {len(recovered)} kayit")
+            return False
+        
+        print("[OK] Konum gecmisi deposu calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Konum gecmisi deposu test hatasi: {e}")
+        return False
+
+def test_status_channel():
+    """Durum kanalını geri döngü arabiriminde rastgele portla test et"""
+    print("\n[TEST] Durum kanali test ediliyor...")
+    
+    try:
+        import asyncio
+        from status_channel import StatusPublisher, StatusSubscriber
+        
+        async def exchange():
+            publisher = await StatusPublisher(port=0).start()
+            # Abone olmadan önce yayınlanan son olay geç katılana tekrar gönderilmeli
+            publisher.publish('location', lat=41.0082, lon=28.9784, text='Fatih / İstanbul')
+            received = []
+            subscriber = await StatusSubscriber(received.append, port=publisher.port).start()
+            try:
+                for _ in range(100):
+                    if subscriber.connected and received:
+                        break
+                    await asyncio.sleep(0.01)
+                publisher.publish('status', state='running')
+                for _ in range(100):
+                    if len(received) >= 2:
+                        break
+                    await asyncio.sleep(0.01)
+                return subscriber.connected, len(publisher.subscribers), received
+            finally:
+                subscriber.close()
+                publisher.close()
+        
+        connected, subscribers, received = asyncio.run(exchange())
+        if not connected or subscribers != 1:
+            print("[ERROR] Abonelik dogrulanmadi")
+            return False
+        
+        if [message['type'] for message in received] != ['location', 'status'] \
+                or received[0]['data']['text'] != 'Fatih / İstanbul':
+            print(f"[ERROR] Beklenmeyen olaylar: {received}")
+            return False
+        
+        print("[OK] Durum kanali calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Durum kanali test hatasi: {e}")
+        return False
+
+def test_metrics():
+    """Ölçüm histogramı ve dışa aktarımı test et"""
+    print("\n[TEST] Olcumler test ediliyor...")
+    
+    try:
+        import json
+        from metrics import Metrics, MetricsExporter
+        
+        metrics = Metrics()
+        for ms in (3, 4, 40, 700):
+            metrics.observe('geocode', ms / 1000)
+        metrics.incr('notifications_suppressed')
+        
+        histogram = metrics.histograms['geocode'].snapshot()
+        if histogram['count'] != 4 or histogram['p50'] != 5 or histogram['p95'] != 1000:
+            print(f"[ERROR] Beklenmeyen histogram: {histogram}")
+            return False
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'metrics.ndjson')
+            exporter = MetricsExporter(metrics, path=path, max_bytes=1, backups=1)
+            exporter.export()
+            exporter.export()
+            # İkinci yazımda dosya dönmeli, sayaçlar sıfırlanmış olmalı
+            with open(path + '.1', encoding='utf-8') as f:
+                first = json.loads(f.readline())
+            with open(path, encoding='utf-8') as f:
+                second = json.loads(f.readline())
+            if first['counters'] != {'notifications_suppressed': 1} or second['counters']:
+                print("[ERROR] Disa aktarim veya dosya dondurme hatali")
+                return False
+        
+        print("[OK] Olcumler calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Olcum test hatasi: {e}")
+        return False
+
+def test_motion():
+    """Hareket algılayıcıyı CSV ivme kaydıyla test et"""
+    print("\n[TEST] Hareket algilama test ediliyor...")
+    
+    try:
+        import random
+        from motion import STILL, WALKING, FileAccelerometer, MotionDetector
+        
+        now = [0.0]
+        rng = random.Random(1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'accel.csv')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("t,x,y,z\n")
+                # İlk 60 sn yürüyüş, sonra masada durma
+                for i in range(600):
+                    noise = 2.0 if i < 300 else 0.01
+                    f.write(f"{i * 0.2},0,0,{9.81 + rng.gauss(0, noise)}\n")
+            
+            detector = MotionDetector(FileAccelerometer(path, clock=lambda: now[0]),
+                                      still_hold=30, clock=lambda: now[0])
+            detector.start()
+            detector.update()
+            states = []
+            for t in (10, 50, 70, 90, 110):
+                now[0] = t
+                states.append(detector.update())
+        
+        # Durma, still_hold dolana kadar takibi kesmemeli
+        if states != [WALKING, WALKING, WALKING, WALKING, STILL]:
+            print(f"[ERROR] Beklenmeyen hareket durumlari: {states}")
+            return False
+        
+        print("[OK] Hareket algilama calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Hareket test hatasi: {e}")
+        return False
+
+def test_notifier():
+    """Bildirim hız sınırını, birleştirmeyi ve hazır oluşturucu kullanımını test et"""
+    print("\n[TEST] Bildirimci test ediliyor...")
+    
+    try:
+        import asyncio
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+        from jni_benchmark import CountingJVM, _JavaObject, counting_notifications
+        from notifications import LocationNotifier
+        
+        jvm = CountingJVM()
+        now = [0.0]
+        with counting_notifications(jvm, _JavaObject(jvm, 'PythonService.mService')):
+            notifier = LocationNotifier(min_interval=30, clock=lambda: now[0])
+            notifier.notify("Fatih")
+            first = (jvm.resolves, jvm.crossings)
+            
+            # Aralık içindeki metinler birleşmeli, yalnızca sonuncusu beklemeli
+            for t, text in ((5, "Beyoğlu"), (10, "Kadıköy")):
+                now[0] = t
+                notifier.notify(text)
+            now[0] = 20
+            notifier.flush()
+            early = notifier.stats()
+            now[0] = 31
+            notifier.flush()
+            second = (jvm.resolves - first[0], jvm.crossings - first[1])
+        
+        if early != {'posted': 1, 'coalesced': 1, 'alerts': 0} \
+                or notifier.stats() != {'posted': 2, 'coalesced': 1, 'alerts': 0}:
+            print(f"[ERROR] Beklenmeyen hiz siniri: {early}, {notifier.stats()}")
+            return False
+        
+        # İkinci gönderim sınıf çözmeden, hazır oluşturucuyla yapılmalı
+        if second[0] != 0 or not 0 < second[1] < first[1]:
+            print(f"[ERROR] Olusturucu yeniden kullanilmadi: ilk {first}, ikinci {second}")
+            return False
+        
+        # Döngü varken bekleyen metin aralık dolunca kendiliğinden gönderilmeli
+        async def coalesce():
+            notifier = LocationNotifier(min_interval=0.05)
+            for text in ("Fatih", "Beyoğlu", "Kadıköy"):
+                notifier.notify(text)
+            await asyncio.sleep(0.1)
+            notifier.close()
+            return notifier.stats()
+        
+        stats = asyncio.run(coalesce())
+        if stats != {'posted': 2, 'coalesced': 1, 'alerts': 0}:
+            print(f"[ERROR] Bekleyen bildirim gonderilmedi: {stats}")
+            return False
+        
+        print(f"[OK] Bildirimci calisiyor (ilk {sum(first)}, sonraki {second[1]} JNI gecisi)")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Bildirimci test hatasi: {e}")
+        return False
+
+def test_geofence():
+    """Bölge giriş/çıkış histerezisini ve dosyadan artımlı yüklemeyi test et"""
+    print("\n[TEST] Bolge tetikleyicileri test ediliyor...")
+    
+    try:
+        import json
+        from geofence import DWELL, ENTER, EXIT, GeofenceMonitor
+        from notifications import LocationNotifier
+        
+        def fix(meters, t):
+            # Merkezin metre cinsinden kuzeyi
+            return {'lat': 41.0 + meters / 111195, 'lon': 29.0, 'time': t, 'accuracy': 5}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'geofences.ndjson')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'id': 'ev', 'lat': 41.0, 'lon': 29.0, 'radius': 100,
+                                    'dwell': 60}) + "\n")
+            
+            monitor = GeofenceMonitor(path, reload_interval=0)
+            events = []
+            # Sınırın hemen dışına çıkıp dönmek çıkış sayılmamalı
+            for meters, t in ((0, 0), (110, 10), (90, 20), (50, 70), (200, 80)):
+                events.extend(event['type'] for event in monitor.update(fix(meters, t)))
+            if events != [ENTER, DWELL, EXIT]:
+                print(f"[ERROR] Beklenmeyen bolge olaylari: {events}")
+                return False
+            
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'id': 'park', 'polygon': [[41.001, 28.999], [41.003, 28.999],
+                                                               [41.003, 29.001]]}) + "\n")
+            events = monitor.update(fix(250, 90))
+            if len(monitor.index) != 2 or [e['id'] for e in events] != ['park']:
+                print("[ERROR] Eklenen bolge okunmadi")
+                return False
+            
+            # İçindeyken silinen bölge çıkış olayı üretmeli
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'id': 'park', 'deleted': True}) + "\n")
+            events = monitor.update(fix(250, 100))
+            if [(e['type'], e['id']) for e in events] != [(EXIT, 'park')]:
+                print(f"[ERROR] Silinen bolge icin cikis bekleniyordu: {events}")
+                return False
+        
+        # Bölge olayları konum bildiriminin hız sınırına takılmamalı
+        now = [0.0]
+        notifier = LocationNotifier(min_interval=30, clock=lambda: now[0])
+        notifier.notify("Fatih")
+        for t, text in ((5, "Bölgeye girildi: Ev"), (10, "Bölgeden çıkıldı: Ev")):
+            now[0] = t
+            notifier.alert(text)
+        now[0] = 12
+        notifier.notify("Kadıköy")
+        if notifier.stats() != {'posted': 1, 'coalesced': 0, 'alerts': 2}:
+            print(f"[ERROR] Bolge bildirimleri kayboldu: {notifier.stats()}")
+            return False
+        
+        print("[OK] Bolge tetikleyicileri calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Bolge test hatasi: {e}")
+        return False
+
+def test_trajectory():
+    """İz sadeleştirmenin hata sınırını ve sıkıştırmasını test et"""
+    print("\n[TEST] Iz sadelestirme test ediliyor...")
+    
+    try:
+        from simulation import synthetic_trajectory
+        from trajectory import (
+            MODE_DEAD_RECKONING, MODE_DOUGLAS_PEUCKER, create_simplifier, max_error,
+        )
+        
+        fixes = list(synthetic_trajectory(3 * 3600, seed=2))
+        for mode in (MODE_DEAD_RECKONING, MODE_DOUGLAS_PEUCKER):
+            simplifier = create_simplifier(mode, tolerance=25)
+            # Noktalar tek tek verilir, akış sonunda kalanlar alınır
+            kept = [fix for point in fixes for fix in simplifier.push(point)]
+            kept += simplifier.flush()
+            error = max_error(fixes, kept)
+            if kept[-1] is not fixes[-1] or error > 25 or len(kept) * 10 > len(fixes):
+                print(f"[ERROR] {mode}: {len(kept)}/{len(fixes)} nokta, hata {error:.1f} m")
+                return False
+        
+        print("[OK] Iz sadelestirme calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Iz sadelestirme test hatasi: {e}")
+        return False
+
+def test_uploader():
+    """Toplu yüklemeyi ve idempotent yeniden denemeyi yerel toplayıcıya karşı test et"""
+    print("\n[TEST] Konum yukleme yerel taklide karsi test ediliyor...")
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+        from collector_standin import CollectorStandIn
+        from offline_queue import OfflineQueue
+        from uploader import KIND_UPLOAD, Uploader
+        
+        fixes = [{'lat': 41.0 + i * 1e-4, 'lon': 29.0, 'time': 1700000000 + i, 'accuracy': 5}
+                 for i in range(120)]
+        with CollectorStandIn() as collector, tempfile.TemporaryDirectory() as tmp:
+            queue = OfflineQueue(os.path.join(tmp, 'upload.sqlite3'))
+            uploader = Uploader(collector.url, queue=queue, max_batch=50, device='test',
+                                is_online=lambda: True)
+            
+            # Sunucu veya yetki hatası verirken konumlar kuyrukta kalmalı
+            uploader.add_many(fixes)
+            for status in (503, 401):
+                collector.status = status
+                uploader.breaker.record_success()
+                uploader.flush(force=True)
+            if queue.count(KIND_UPLOAD) != 120 or uploader.rejected:
+                print("[ERROR] Basarisiz yukleme kuyruktan dusmemeli")
+                return False
+            
+            # Yanıtı kaybolmuş parti yeniden gönderilince tekrar kaydedilmemeli
+            collector.status = 200
+            collector.drop_acks = 1
+            uploader.breaker.record_success()
+            uploader.flush(force=True)
+            uploader.close(upload=True)
+            if len(collector.records) != 120 or collector.duplicates != 1 \
+                    or collector.batches != 3:
+                print(f"[ERROR] Beklenmeyen yukleme: {len(collector.records)} konum, "
+                      f"{collector.batches} parti, {collector.duplicates} tekrar")
+                return False
+            
+            # Yanıtı kaybolan yarım parti, kuyruk büyüse de aynı aralıkla yeniden gönderilmeli
+            queue = OfflineQueue(os.path.join(tmp, 'partial.sqlite3'))
+            uploader = Uploader(collector.url, queue=queue, max_batch=50, device='partial',
+                                is_online=lambda: True)
+            collector.drop_acks = 1
+            uploader.add_many(fixes[:10])
+            uploader.flush(force=True)
+            uploader.add_many(fixes[10:30])
+            uploader.close(upload=True)
+            if collector.duplicates != 2 or collector.batches != 5 \
+                    or len(collector.records) != 150:
+                print(f"[ERROR] Yeniden denenen parti araligi degisti: "
+                      f"{collector.batches} parti, {collector.duplicates} tekrar")
+                return False
+        
+        print(f"[OK] Konum yukleme: 120 konum, {collector.requests} istek")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Yukleme test hatasi: {e}")
+        return False
+
+def test_simulation():
+    """Sanal saati, iz yükleyicilerini ve simüle konum kaynağını test et"""
+    print("\n[TEST] Simulasyon test ediliyor...")
+    
+    try:
+        import asyncio
+        import time
+        from clock import VirtualClock
+        from simulation import SimulatedLocationProvider, load_csv, load_gpx
+        
+        # Beklemesiz saat beklemeyi anında bitirip sanal zamanı ilerletmeli
+        clock = VirtualClock(start=1000)
+        started = time.monotonic()
+        asyncio.run(clock.sleep(3600))
+        if not clock.synchronous or clock.time() != 4600 or clock.elapsed() != 3600 \
+                or time.monotonic() - started > 0.5:
+            print(f"[ERROR] Beklemesiz saat hatali: {clock.time()}")
+            return False
+        
+        # Hızlandırılmış saat gerçek beklemeyi hız kadar kısaltmalı
+        clock = VirtualClock(start=1000, speed=100)
+        asyncio.run(clock.sleep(2))
+        if clock.synchronous or not 2 <= clock.elapsed() < 20:
+            print(f"[ERROR] Hizlandirilmis saat hatali: {clock.elapsed()}")
+            return False
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            gpx = os.path.join(tmp, 'iz.gpx')
+            with open(gpx, 'w', encoding='utf-8') as f:
+                f.write('<?xml version="1.0"?>\n'
+                        '<gpx xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>'
+                        '<trkpt lat="41.0082" lon="28.9784"><time>2023-11-14T22:13:20Z</time></trkpt>'
+                        '<trkpt lat="41.0090" lon="28.9790"><time>2023-11-14T22:13:50Z</time></trkpt>'
+                        '</trkseg></trk></gpx>')
+            csv_path = os.path.join(tmp, 'iz.csv')
+            with open(csv_path, 'w', encoding='utf-8') as f:
+                f.write("Latitude,Longitude,timestamp,acc\n"
+                        "41.0082,28.9784,1700000000,5\n"
+                        "41.0090,28.9790,1700000030,\n")
+            gpx_fixes = list(load_gpx(gpx))
+            csv_fixes = list(load_csv(csv_path))
+        
+        expected = [(41.0082, 28.9784, 1700000000.0), (41.009, 28.979, 1700000030.0)]
+        if [(f['lat'], f['lon'], f['time']) for f in gpx_fixes] != expected \
+                or [(f['lat'], f['lon'], f['time']) for f in csv_fixes] != expected:
+            print(f"[ERROR] Iz dosyalari okunamadi: {gpx_fixes}, {csv_fixes}")
+            return False
+        
+        if csv_fixes[0].get('accuracy') != 5.0 or 'accuracy' in csv_fixes[1]:
+            print(f"[ERROR] CSV dogruluk sutunu hatali: {csv_fixes}")
+            return False
+        
+        # 10 sn aralıklı 11 konum; iz saatin başlangıcına hizalanır
+        clock = VirtualClock(start=1000)
+        provider = SimulatedLocationProvider(
+            [{'lat': 41.0, 'lon': 29.0, 'time': 500 + i * 10} for i in range(11)], clock)
+        batches = [[fix['time'] for fix in provider.drain()]]
+        asyncio.run(clock.sleep(25))
+        batches.append([fix['time'] for fix in provider.drain()])
+        # Askıdayken konum verilmemeli; sürdürülünce yalnızca en son atlanan gelmeli
+        provider.stop()
+        asyncio.run(clock.sleep(40))
+        batches.append(provider.drain())
+        provider.start()
+        batches.append([fix['time'] for fix in provider.drain()])
+        asyncio.run(clock.sleep(100))
+        batches.append([fix['time'] for fix in provider.drain()])
+        if batches != [[1000], [1010, 1020], [], [1060], [1070, 1080, 1090, 1100]] \
+                or provider.skipped != 3 or provider.received != 8 or not provider.finished:
+            print(f"[ERROR] Beklenmeyen simule konumlar: {batches}, {provider.skipped} atlanan")
+            return False
+        
+        print("[OK] Simulasyon calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Simulasyon test hatasi: {e}")
+        return False
+
+def test_engine():
+    """Motoru sanal saat ve simüle konum kaynağıyla çalıştırıp durdurmayı test et"""
+    print("\n[TEST] Takip motoru test ediliyor...")
+    
+    try:
+        import asyncio
+        import threading
+        import time
+        from clock import VirtualClock
+        from engine import ProcessLock, TrackingEngine
+        from simulation import SimulatedLocationProvider, run_until_finished
+        
+        # 10 dakika boyunca dakikada 500 m kuzeye giden iz
+        fixes = [{'lat': 41.0 + i * 500 / 111195, 'lon': 29.0, 'time': i * 60.0}
+                 for i in range(11)]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tracking.lock')
+            
+            # Beklemesiz sanal saat: iz birkaç turda biter
+            clock = VirtualClock(start=1700000000)
+            provider = SimulatedLocationProvider(fixes, clock)
+            notified = []
+            engine = TrackingEngine(provider=provider, clock=clock, lock=ProcessLock(path),
+                                    geocode=lambda lat, lon: f"Bolge {int((lat - 41) * 100)}",
+                                    notify=notified.append)
+            asyncio.run(run_until_finished(engine, provider))
+            engine.close()
+            counters = engine.metrics.counters
+            if provider.received != 11 or counters.get('fixes') != 11 \
+                    or engine.current_location['lat'] != fixes[-1]['lat'] \
+                    or notified[-1] != 'Bolge 4':
+                print(f"[ERROR] Konumlar islenmedi: {provider.received}, {counters}, {notified}")
+                return False
+            
+            # Gerçek hızda saat: durdurma hem uykuyu hem süren isteği beklememeli
+            clock = VirtualClock(speed=1)
+            provider = SimulatedLocationProvider(fixes, clock)
+            entered, release = threading.Event(), threading.Event()
+            
+            def slow_geocode(lat, lon):
+                entered.set()
+                release.wait(10)
+                return 'Fatih'
+            
+            engine = TrackingEngine(provider=provider, clock=clock, lock=ProcessLock(path),
+                                    geocode=slow_geocode, notify=notified.append)
+            
+            async def stop_while_busy():
+                task = engine.start()
+                while not entered.is_set():
+                    await asyncio.sleep(0.01)
+                started = time.monotonic()
+                engine.stop()
+                await asyncio.gather(task, return_exceptions=True)
+                elapsed = time.monotonic() - started
+                release.set()
+                return elapsed
+            
+            elapsed = asyncio.run(stop_while_busy())
+            engine.close()
+            released = ProcessLock(path).acquire()
+        
+        if elapsed > 0.5 or not released:
+            print(f"[ERROR] Durdurma gecikti ({elapsed:.2f} sn) veya kilit birakilmadi")
+            return False
+        
+        print(f"[OK] Takip motoru calisiyor ({len(notified)} bildirim, durdurma "
+              f"{elapsed * 1000:.0f} ms)")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Takip motoru test hatasi: {e}")
+        return False
+
+def test_engine_restart():
+    """Durdurulup hemen yeniden başlatılan motorun kaynaklarını koruduğunu test et"""
+    print("\n[TEST] Motor yeniden baslatma test ediliyor...")
+    
+    try:
+        import asyncio
+        from engine import ProcessLock, TrackingEngine
+        from locations import LocationProvider
+        
+        class StandInProvider(LocationProvider):
+            running = False
+            
+            def start(self):
+                self.running = True
+            
+            def stop(self):
+                self.running = False
+        
+        class StandInPublisher:
+            open = False
+            
+            async def start(self):
+                self.open = True
+                return self
+            
+            def publish(self, kind, **data):
+                pass
+            
+            def close(self):
+                self.open = False
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tracking.lock')
+            provider, publisher = StandInProvider(), StandInPublisher()
+            engine = TrackingEngine(provider=provider, geocode=lambda lat, lon: 'Fatih',
+                                    notify=lambda text: None, lock=ProcessLock(path),
+                                    publisher=publisher)
+            
+            async def restart():
+                engine.start()
+                await asyncio.sleep(0.05)
+                # Arayüz durdur/başlat düğmesine art arda basar
+                engine.stop()
+                task = engine.start()
+                await asyncio.sleep(0.05)
+                held = not ProcessLock(path).acquire()
+                state = (engine.is_running, provider.running, publisher.open, held)
+                engine.stop()
+                await asyncio.gather(task, return_exceptions=True)
+                return state, task.done()
+            
+            state, done = asyncio.run(restart())
+            released = ProcessLock(path).acquire()
+            engine.close()
+        
+        if state != (True, True, True, True):
+            print(f"[ERROR] Ikinci dongu kaynaklarini kaybetti: {state}")
+            return False
+        
+        if not done or not released or provider.running or publisher.open:
+            print("[ERROR] Durdurulan motor kaynaklari birakmadi")
+            return False
+        
+        print("[OK] Motor yeniden baslatma calisiyor")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Motor yeniden baslatma test hatasi: {e}")
+        return False
+
 def test_ui():
     """UI'yi test et"""
     print("\n[TEST] UI test ediliyor...")
@@ -101,6 +1294,111 @@ def main():
         print("\n[ERROR] Konum servisi testi basarisiz!")
         return False
     
+    # Konum kaynağı testi
+    if not test_location_provider():
+        print("\n[ERROR] Konum kaynagi testi basarisiz!")
+        return False
+    
+    # Geometri testi
+    if not test_geometry():
+        print("\n[ERROR] Geometri testi basarisiz!")
+        return False
+    
+    # Zamanlayıcı testi
+    if not test_scheduler():
+        print("\n[ERROR] Zamanlayici testi basarisiz!")
+        return False
+    
+    # Değişiklik kapısı testi
+    if not test_change_gate():
+        print("\n[ERROR] Degisiklik kapisi testi basarisiz!")
+        return False
+    
+    # Önbellek testi
+    if not test_geocode_cache():
+        print("\n[ERROR] Onbellek testi basarisiz!")
+        return False
+    
+    # Çevrimdışı çözümleyici testi
+    if not test_offline_resolver():
+        print("\n[ERROR] Cevrimdisi cozumleyici testi basarisiz!")
+        return False
+    
+    # Toplu geocoding testi
+    if not test_batch_geocoder():
+        print("\n[ERROR] Toplu geocoding testi basarisiz!")
+        return False
+    
+    # İstek koruyucuları testi
+    if not test_resilience():
+        print("\n[ERROR] Istek koruyuculari testi basarisiz!")
+        return False
+    
+    # Geocoder testi
+    if not test_geocoder_standin():
+        print("\n[ERROR] Geocoder testi basarisiz!")
+        return False
+    
+    # Kuyruk testi
+    if not test_offline_queue():
+        print("\n[ERROR] Kuyruk testi basarisiz!")
+        return False
+    
+    # Konum geçmişi testi
+    if not test_track_store():
+        print("\n[ERROR] Konum gecmisi testi basarisiz!")
+        return False
+    
+    # Durum kanalı testi
+    if not test_status_channel():
+        print("\n[ERROR] Durum kanali testi basarisiz!")
+        return False
+    
+    # Ölçüm testi
+    if not test_metrics():
+        print("\n[ERROR] Olcum testi basarisiz!")
+        return False
+    
+    # Hareket testi
+    if not test_motion():
+        print("\n[ERROR] Hareket testi basarisiz!")
+        return False
+    
+    # Bildirimci testi
+    if not test_notifier():
+        print("\n[ERROR] Bildirimci testi basarisiz!")
+        return False
+    
+    # Bölge testi
+    if not test_geofence():
+        print("\n[ERROR] Bolge testi basarisiz!")
+        return False
+    
+    # İz sadeleştirme testi
+    if not test_trajectory():
+        print("\n[ERROR] Iz sadelestirme testi basarisiz!")
+        return False
+    
+    # Yükleme testi
+    if not test_uploader():
+        print("\n[ERROR] Yukleme testi basarisiz!")
+        return False
+    
+    # Simülasyon testi
+    if not test_simulation():
+        print("\n[ERROR] Simulasyon testi basarisiz!")
+        return False
+    
+    # Takip motoru testi
+    if not test_engine():
+        print("\n[ERROR] Takip motoru testi basarisiz!")
+        return False
+    
+    # Motor yeniden başlatma testi
+    if not test_engine_restart():
+        print("\n[ERROR] Motor yeniden baslatma testi basarisiz!")
+        return False
+    
     # UI testi
     if not test_ui():
         print("\n[ERROR] UI testi basarisiz!")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Konum Geçmişi Adres Doldurma
+Kayıtlı konum geçmişini (track_store) toplu geocoding ile çözümler ve
+bölge başına kayıt sayısını yazar. Servis gibi yalnızca son çözümlenen
+noktadan yeterince uzaklaşılan noktalar çözülür (gating.ChangeGate);
+aradaki noktalar son adresi alır. --stays ile duraklar (geometry.stay_points)
+adresleriyle listelenir. --standin ile ağ yerine yerel Nominatim taklidi
+kullanılır.
+
+Kullanım:
+    python tools/backfill_track.py --start 1700000000 --end 1700086400
+    python tools/backfill_track.py --stays --min-duration 600
+    python tools/backfill_track.py --standin --synthetic 50000
+"""
+
+import argparse
+import collections
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Kivy komut satırı argümanlarını yutmasın
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from batch_geocoder import BatchGeocoder, create_batch_geocoder  # noqa: E402
+from geocache import GeocodeCache  # noqa: E402
+from gating import ChangeGate  # noqa: E402
+from geocoder import NominatimGeocoder, format_address  # noqa: E402
+from geometry import cumulative_distance, stay_points  # noqa: E402
+from nominatim_standin import NominatimStandIn  # noqa: E402
+from resilience import TokenBucket  # noqa: E402
+from track_store import TrackReader  # noqa: E402
+
+
+def synthetic_points(count, fixtures, seed=1):
+    """Taklit kayıtlarının çevresinde rastgele noktalar üret"""
+    rng = random.Random(seed)
+    centers = [(lat, lon) for lat, lon, _ in fixtures]
+    return [(lat + rng.uniform(-0.02, 0.02), lon + rng.uniform(-0.02, 0.02))
+            for lat, lon in (rng.choice(centers) for _ in range(count))]
+
+
+def gated_addresses(geocoder, points, min_distance):
+    """Yalnızca kapının çözeceği noktaları çözümle, aradakilere son adresi ver"""
+    gate = ChangeGate(min_distance)
+    indices = gate.geocode_indices([lat for lat, _ in points], [lon for _, lon in points])
+    resolved = geocoder.reverse_many([points[i] for i in indices])
+
+    addresses = [None] * len(points)
+    bounds = indices[1:] + [len(points)]
+    for start, end, address in zip(indices, bounds, resolved):
+        addresses[start:end] = [address] * (end - start)
+    return addresses, len(indices)
+
+
+def print_stays(geocoder, times, points, max_distance, min_duration):
+    """Durakları süre ve adresleriyle yazdır"""
+    lat = [p[0] for p in points]
+    lon = [p[1] for p in points]
+    stays = stay_points(lat, lon, times, max_distance, min_duration)
+    addresses = geocoder.reverse_many(list(zip(stays['lat'].tolist(), stays['lon'].tolist())))
+
+    for stay, address in zip(stays, addresses):
+        arrival = time.strftime('%d.%m %H:%M', time.localtime(stay['arrival']))
+        minutes = (stay['departure'] - stay['arrival']) / 60
+        print(f"{arrival}  {minutes:>6.0f} dk  {format_address(address)}")
+    total_km = cumulative_distance(lat, lon)[-1] / 1000 if points else 0.0
+    print(f"\n{len(stays)} durak, toplam yol {total_km:.1f} km")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konum geçmişini toplu çözümle")
+    parser.add_argument('--track-dir', default=None)
+    parser.add_argument('--start', type=int, default=None)
+    parser.add_argument('--end', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--rate', type=float, default=1.0,
+                        help="taklit sunucuya saniyede en fazla istek (--standin ile)")
+    parser.add_argument('--standin', action='store_true', help="yerel Nominatim taklidini kullan")
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help="geçmiş yerine bu kadar sentetik nokta kullan (--standin ile)")
+    parser.add_argument('--min-distance', type=float, default=200,
+                        help="yeniden çözümleme için en az uzaklık (metre)")
+    parser.add_argument('--stays', action='store_true', help="durakları listele")
+    parser.add_argument('--stay-radius', type=float, default=200.0, help="durak yarıçapı (metre)")
+    parser.add_argument('--min-duration', type=float, default=300.0,
+                        help="durak sayılacak en kısa süre (saniye)")
+    args = parser.parse_args()
+
+    standin = NominatimStandIn(max_distance_km=5).start() if args.standin else None
+    try:
+        times = None
+        if args.synthetic and standin is not None:
+            points = synthetic_points(args.synthetic, standin.fixtures)
+        else:
+            with TrackReader(args.track_dir) as reader:
+                records = list(reader.scan(args.start, args.end))
+            times = [t for t, _, _, _, _ in records]
+            points = [(lat, lon) for _, lat, lon, _, _ in records]
+
+        if standin is not None:
+            tmp = tempfile.mkdtemp()
+            geocoder = BatchGeocoder(cache=GeocodeCache(os.path.join(tmp, 'cache.sqlite3')),
+                                     remote=NominatimGeocoder(url=standin.url),
+                                     workers=args.workers, limiter=TokenBucket(args.rate))
+        else:
+            geocoder = create_batch_geocoder(workers=args.workers)
+
+        if args.stays:
+            if times is None:
+                parser.error("--stays zaman damgalı geçmiş gerektirir (--synthetic ile kullanılamaz)")
+            print_stays(geocoder, times, points, args.stay_radius, args.min_duration)
+            geocoder.close()
+            return
+
+        addresses, gated = gated_addresses(geocoder, points, args.min_distance)
+        geocoder.close()
+
+        regions = collections.Counter(format_address(address) for address in addresses)
+        for text, count in regions.most_common(20):
+            print(f"{count:>8}  {text}")
+
+        stats = geocoder.last_stats
+        print(f"\n{len(points)} kayıttan {gated} nokta çözümlendi")
+        print(f"{stats['points']} nokta, {stats['cells']} hücre "
+              f"(önbellek {stats['cache']}, çevrimdışı {stats['offline']}, "
+              f"ağ {stats['remote']}, hata {stats['failed']}) - {stats['seconds']:.2f} sn")
+    finally:
+        if standin is not None:
+            standin.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Sınır Dosyası Oluşturucu
+İl ve ilçe GeoJSON sınırlarını offline_geocoder'ın ikili biçimine çevirir
+
+Kullanım:
+    python tools/build_boundaries.py iller.geojson ilceler.geojson \\
+        --name-field name --parent-field province -o data/tr_boundaries.bin
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Kivy komut satırı argümanlarını yutmasın
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from offline_geocoder import (  # noqa: E402
+    COORD_SCALE, HEADER, LEVEL_DISTRICT, LEVEL_PROVINCE, MAGIC, NO_PARENT,
+    REGION, RING, VERSION, DEFAULT_DATA_PATH,
+)
+
+
+def feature_rings(geometry, quantum):
+    """Geometrinin halkalarını ölçekli ve sadeleştirilmiş köşe listeleri olarak döndür"""
+    if geometry['type'] == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif geometry['type'] == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        return []
+
+    rings = []
+    for polygon in polygons:
+        for ring in polygon:
+            points = []
+            for lon, lat, *_ in ring:
+                # Köşeleri ızgaraya oturt, art arda gelen tekrarları at
+                x = int(round(lon * COORD_SCALE / quantum)) * quantum
+                y = int(round(lat * COORD_SCALE / quantum)) * quantum
+                if not points or points[-1] != (x, y):
+                    points.append((x, y))
+            if len(points) > 1 and points[0] == points[-1]:
+                points.pop()
+            if len(points) >= 3:
+                rings.append(points)
+    return rings
+
+
+def point_in_rings(rings, x, y):
+    """Çift-tek kuralı ile nokta-poligon testi"""
+    inside = False
+    for ring in rings:
+        j = len(ring) - 1
+        for i in range(len(ring)):
+            xi, yi = ring[i]
+            xj, yj = ring[j]
+            if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+    return inside
+
+
+def load_regions(path, level, name_field, quantum):
+    """GeoJSON dosyasındaki bölgeleri oku"""
+    with open(path, encoding='utf-8') as f:
+        collection = json.load(f)
+
+    regions = []
+    for feature in collection.get('features', []):
+        rings = feature_rings(feature['geometry'], quantum)
+        if not rings:
+            continue
+        regions.append({
+            'level': level,
+            'name': str(feature['properties'].get(name_field, '')).strip(),
+            'properties': feature['properties'],
+            'rings': rings,
+        })
+    return regions
+
+
+def assign_parents(provinces, districts, parent_field):
+    """Her ilçeyi bağlı olduğu ile eşle"""
+    by_name = {p['name'].casefold(): i for i, p in enumerate(provinces)}
+
+    for district in districts:
+        district['parent'] = NO_PARENT
+
+        if parent_field:
+            key = str(district['properties'].get(parent_field, '')).strip().casefold()
+            if key in by_name:
+                district['parent'] = by_name[key]
+                continue
+
+        # Özellik yoksa ilçenin köşelerinin çoğunu içeren ili seç
+        samples = district['rings'][0][::max(1, len(district['rings'][0]) // 10)]
+        best, best_hits = NO_PARENT, 0
+        for i, province in enumerate(provinces):
+            hits = sum(point_in_rings(province['rings'], x, y) for x, y in samples)
+            if hits > best_hits:
+                best, best_hits = i, hits
+        district['parent'] = best
+
+
+def write_boundaries(path, provinces, districts):
+    """Bölgeleri ikili biçimde yaz"""
+    regions = provinces + districts
+    for province in provinces:
+        province['parent'] = NO_PARENT
+
+    region_blob = bytearray()
+    ring_blob = bytearray()
+    vertex_blob = bytearray()
+    names = bytearray()
+    ring_index = 0
+    vertex_index = 0
+
+    for region in regions:
+        name = region['name'].encode('utf-8')
+        xs = [x for ring in region['rings'] for x, _ in ring]
+        ys = [y for ring in region['rings'] for _, y in ring]
+
+        region_blob += REGION.pack(
+            region['level'], region['parent'], len(names), len(name),
+            ring_index, len(region['rings']),
+            min(xs), min(ys), max(xs), max(ys)
+        )
+        names += name
+
+        for ring in region['rings']:
+            ring_blob += RING.pack(vertex_index, len(ring))
+            for x, y in ring:
+                vertex_blob += struct.pack('<ii', x, y)
+            vertex_index += len(ring)
+            ring_index += 1
+
+    body = zlib.compress(bytes(region_blob + ring_blob + vertex_blob + names), 9)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(regions), len(body)))
+        f.write(body)
+
+    return vertex_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İl/ilçe sınır dosyası oluştur")
+    parser.add_argument('provinces', help="İl sınırları (GeoJSON)")
+    parser.add_argument('districts', help="İlçe sınırları (GeoJSON)")
+    parser.add_argument('--name-field', default='name', help="Bölge adı özelliği")
+    parser.add_argument('--parent-field', default=None,
+                        help="İlçedeki il adı özelliği (yoksa mekansal eşleme)")
+    parser.add_argument('--quantum', type=int, default=10,
+                        help="Köşe ızgarası (1e-5 derece biriminde)")
+    parser.add_argument('-o', '--output', default=DEFAULT_DATA_PATH)
+    args = parser.parse_args()
+
+    provinces = load_regions(args.provinces, LEVEL_PROVINCE, args.name_field, args.quantum)
+    districts = load_regions(args.districts, LEVEL_DISTRICT, args.name_field, args.quantum)
+    assign_parents(provinces, districts, args.parent_field)
+
+    vertex_count = write_boundaries(args.output, provinces, districts)
+    size_kb = os.path.getsize(args.output) / 1024
+    print(f"✅ {len(provinces)} il, {len(districts)} ilçe, {vertex_count} köşe "
+          f"-> {args.output} ({size_kb:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Yerel Toplayıcı Taklidi
+Yükleyicinin (uploader.py) gönderdiği sıkıştırılmış NDJSON partilerini
+alan yerel HTTP sunucusu. Idempotency-Key ile tekrar gönderilen partileri,
+(cihaz, seq) ile örtüşen konumları tekilleştirir. Ağ olmadan yükleme yolunu
+test etmek ve ölçmek için kullanılır.
+
+Kullanım:
+    python tools/collector_standin.py --port 8090
+    python tools/collector_standin.py --port 8090 --fail-rate 0.3
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Kivy komut satırı argümanlarını yutmasın
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from uploader import decode_batch  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """'/ingest' isteklerini çözüp taklide iletir"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        standin = self.server.standin
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+
+        if urlparse(self.path).path.rstrip('/') != '/ingest':
+            self._reply(404)
+            return
+        if standin.latency:
+            time.sleep(standin.latency)
+
+        status = standin.receive(self.headers, body)
+        self._reply(status)
+
+    def _reply(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # Test çıktısını kirletmesin
+        pass
+
+
+class CollectorStandIn:
+    """Arka planda çalışan yerel toplayıcı taklidi"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, fail_rate=0.0, seed=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.status = 200
+        # Kaydedilip yanıtı "kaybolacak" (503 dönecek) parti sayısı
+        self.drop_acks = 0
+        self.requests = 0
+        self.batches = 0
+        self.duplicates = 0
+        self.bytes = 0
+        self.records = []
+        self._keys = set()
+        self._seen = set()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """Yükleyiciye verilecek '/ingest' adresi"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/ingest"
+
+    def receive(self, headers, body):
+        """Partiyi işle ve HTTP durum kodunu döndür"""
+        with self._lock:
+            self.requests += 1
+            if self.status != 200:
+                return self.status
+            if self.fail_rate and self._rng.random() < self.fail_rate:
+                return 503
+
+            key = headers.get('Idempotency-Key')
+            if key and key in self._keys:
+                self.duplicates += 1
+                return 409
+            try:
+                records = decode_batch(body, headers.get('Content-Encoding'))
+            except Exception:
+                return 400
+
+            device = headers.get('X-Device-Id')
+            for record in records:
+                if (device, record.get('seq')) not in self._seen:
+                    self._seen.add((device, record.get('seq')))
+                    self.records.append(record)
+            if key:
+                self._keys.add(key)
+            self.batches += 1
+            self.bytes += len(body)
+            if self.drop_acks:
+                self.drop_acks -= 1
+                return 503
+            return 200
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel toplayıcı taklidi")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help="her yanıta eklenecek yapay gecikme")
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help="503 ile reddedilecek isteklerin oranı (yeniden deneme testi)")
+    args = parser.parse_args()
+
+    standin = CollectorStandIn(args.host, args.port, latency=args.latency_ms / 1000,
+                               fail_rate=args.fail_rate)
+    print(f"📥 Toplayıcı dinliyor - {standin.url}")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin._server.server_close()
+        print(f"{standin.batches} parti, {len(standin.records)} konum, "
+              f"{standin.duplicates} tekrar, {standin.bytes} bayt")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Geocoder Arka Uç Karşılaştırması
+Arka uçların gecikmesini yerel Nominatim taklidine karşı ağ olmadan ölçer
+
+Kullanım:
+    python tools/compare_geocoders.py --repeat 20 --latency-ms 120
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Kivy komut satırı argümanlarını yutmasın
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from geocache import GeocodeCache  # noqa: E402
+from geocoder import (  # noqa: E402
+    CachedGeocoder, NominatimGeocoder, OfflineGeocoder, measure_latency,
+)
+from nominatim_standin import NominatimStandIn  # noqa: E402
+from offline_geocoder import OfflineResolver  # noqa: E402
+
+
+def summarize(name, timings):
+    """Gecikme özetini yazdır"""
+    ordered = sorted(timings)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000
+    mean = statistics.mean(ordered) * 1000
+    print(f"{name:<12} n={len(ordered):<5} ort={mean:8.3f} ms  p50={p50:8.3f} ms  p95={p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geocoder arka uçlarını karşılaştır")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help="Taklit sunucuya eklenecek yapay gecikme")
+    args = parser.parse_args()
+
+    with NominatimStandIn(latency=args.latency_ms / 1000) as standin, \
+            tempfile.TemporaryDirectory() as tmp:
+        points = [(lat, lon) for lat, lon, _ in standin.fixtures]
+
+        nominatim = NominatimGeocoder(url=standin.url)
+        summarize('nominatim', measure_latency(nominatim, points, args.repeat))
+
+        cache = GeocodeCache(path=os.path.join(tmp, 'cache.sqlite3'))
+        cached = CachedGeocoder(NominatimGeocoder(url=standin.url), cache)
+        summarize('cached', measure_latency(cached, points, args.repeat))
+        cached.close()
+
+        resolver = OfflineResolver.load_default()
+        if resolver is not None:
+            summarize('offline', measure_latency(OfflineGeocoder(resolver), points, args.repeat))
+
+        print(f"\nTaklit sunucuya giden istek: {standin.request_count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Yerel Nominatim Taklidi
+Kaydedilmiş Nominatim JSON yanıtlarını yerel HTTP sunucusundan tekrar oynatır.
+Ağ olmadan geocoding yolunu test etmek ve ölçmek için kullanılır.
+
+Kullanım:
+    python tools/nominatim_standin.py --port 8089 --latency-ms 150
+    python tools/nominatim_standin.py --record 41.0082 28.9784 istanbul_fatih
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'nominatim'
+)
+
+
+def load_fixtures(directory=FIXTURE_DIR):
+    """Kayıtlı yanıtları (lat, lon, yanıt) listesi olarak oku"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            record = json.load(f)
+        fixtures.append((float(record['lat']), float(record['lon']), record['response']))
+    return fixtures
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """'/reverse' isteklerine en yakın kayıtla yanıt verir"""
+
+    # Keep-alive: istemcinin bağlantı havuzu ölçülebilsin
+    protocol_version = 'HTTP/1.1'
+    # Başlık ve gövde ayrı yazılır; Nagle + gecikmeli ACK her yanıta ~40 ms eklemesin
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+
+        if url.path.rstrip('/') != '/reverse':
+            self._reply(404, {'error': 'Unknown endpoint'})
+            return
+
+        query = parse_qs(url.query)
+        try:
+            lat = float(query['lat'][0])
+            lon = float(query['lon'][0])
+        except (KeyError, ValueError):
+            self._reply(400, {'error': 'Missing lat/lon'})
+            return
+
+        server.standin.record_request()
+        if server.standin.latency:
+            time.sleep(server.standin.latency)
+
+        forced = server.standin.status
+        if forced != 200:
+            self._reply(forced, {'error': 'Forced failure'})
+            return
+
+        response = server.standin.nearest(lat, lon)
+        if response is None:
+            self._reply(200, {'error': 'Unable to geocode'})
+        else:
+            self._reply(200, response)
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Test çıktısını kirletmesin
+        pass
+
+
+class NominatimStandIn:
+    """Arka planda çalışan yerel Nominatim taklidi"""
+
+    def __init__(self, host='127.0.0.1', port=0, fixtures=None,
+                 latency=0.0, max_distance_km=50.0):
+        self.fixtures = fixtures if fixtures is not None else load_fixtures()
+        self.latency = latency
+        self.max_distance_km = max_distance_km
+        self.status = 200
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """Geocoder'a verilecek '/reverse' adresi"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/reverse"
+
+    def record_request(self):
+        with self._lock:
+            self.request_count += 1
+
+    def nearest(self, lat, lon):
+        """En yakın kayıtlı yanıtı döndür, çok uzaksa None"""
+        best, best_km = None, self.max_distance_km
+        for f_lat, f_lon, response in self.fixtures:
+            # Eşdikdörtgen yaklaşım bu ölçekte yeterli
+            dx = math.radians(lon - f_lon) * math.cos(math.radians((lat + f_lat) / 2))
+            dy = math.radians(lat - f_lat)
+            km = 6371.0 * math.hypot(dx, dy)
+            if km <= best_km:
+                best, best_km = response, km
+        return best
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def record_fixture(lat, lon, name, directory=FIXTURE_DIR):
+    """Gerçek Nominatim yanıtını kaydet"""
+    import requests
+
+    response = requests.get(
+        "https://nominatim.openstreetmap.org/reverse",
+        params={'lat': lat, 'lon': lon, 'format': 'json', 'addressdetails': 1,
+                'accept-language': 'tr', 'zoom': 10},
+        headers={'User-Agent': 'LocationTracker/1.0'},
+        timeout=15
+    )
+    response.raise_for_status()
+
+    path = os.path.join(directory, f"{name}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'lat': lat, 'lon': lon, 'response': response.json()},
+                  f, ensure_ascii=False, indent=2)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel Nominatim taklidi")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help="Her yanıta eklenecek yapay gecikme")
+    parser.add_argument('--record', nargs=3, metavar=('LAT', 'LON', 'NAME'),
+                        help="Gerçek Nominatim'den yeni kayıt al ve çık")
+    args = parser.parse_args()
+
+    if args.record:
+        lat, lon, name = args.record
+        print(f"✅ Kaydedildi: {record_fixture(float(lat), float(lon), name)}")
+        return
+
+    standin = NominatimStandIn(args.host, args.port, latency=args.latency_ms / 1000)
+    print(f"🌍 {len(standin.fixtures)} kayıt yüklendi - {standin.url}")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Takip Simülasyonu
+Tüm hattı (konum → zamanlayıcı → geocoding → bildirim) kayıtlı bir GPX/CSV
+izi veya sentetik bir gün üzerinde sanal saatle çalıştırır. Geocoding
+yerel Nominatim taklidine gider; gerçek sunucuya istek yapılmaz.
+
+Kullanım:
+    python tools/simulate.py --synthetic --duration 86400          # beklemesiz
+    python tools/simulate.py --trace yol.gpx --speed 100           # 100x hız
+    python tools/simulate.py --synthetic --motion                  # durağanken askı
+    python tools/simulate.py --synthetic --track-dir iz --simplify douglas-peucker
+    python tools/simulate.py --synthetic --upload --simplify dead-reckoning
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Kivy komut satırı argümanlarını yutmasın
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from clock import VirtualClock  # noqa: E402
+from collector_standin import CollectorStandIn  # noqa: E402
+from engine import ProcessLock, TrackingEngine  # noqa: E402
+from geocache import GeocodeCache  # noqa: E402
+from geocoder import create_geocoder  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+from motion import MotionDetector  # noqa: E402
+from nominatim_standin import NominatimStandIn  # noqa: E402
+from offline_queue import OfflineQueue  # noqa: E402
+from resilience import TokenBucket  # noqa: E402
+from simulation import (  # noqa: E402
+    SimulatedAccelerometer, SimulatedLocationProvider, load_trace, run_until_finished,
+    synthetic_trajectory,
+)
+from track_store import TrackWriter  # noqa: E402
+from uploader import Uploader  # noqa: E402
+from trajectory import (  # noqa: E402
+    DEFAULT_TOLERANCE, MODE_DEAD_RECKONING, MODE_DOUGLAS_PEUCKER, create_simplifier,
+)
+
+# Sanal günün başlangıcı (sabit: sonuçlar tekrarlanabilir olsun)
+SIM_START = 1_700_000_000
+
+
+def simulate(trace=None, duration=86400, interval=1.0, speed=None, seed=1,
+             latency=0.0, track_dir=None, engine_options=None, setup=None, motion=False,
+             simplify=None, tolerance=DEFAULT_TOLERANCE, upload=False, max_batch=500):
+    """Simülasyonu çalıştır ve özet sayaçları döndür
+
+    setup(engine) verilirse motor başlamadan önce çağrılır (ölçüm kancaları için).
+    motion=True ise aynı izden üretilen ivme örnekleriyle hareket algılayıcı
+    kullanılır; durağan dönemlerde konum alma askıya alınır. simplify bir
+    sadeleştirme kipiyse konum geçmişi yazılmadan (ve yüklenmeden) önce
+    sadeleştirilir. upload=True ise konumlar yerel toplayıcı taklidine
+    max_batch'lik partilerle yüklenir.
+    """
+    clock = VirtualClock(start=SIM_START, speed=speed)
+
+    def load():
+        return load_trace(trace) if trace else synthetic_trajectory(duration, interval, seed=seed)
+
+    provider = SimulatedLocationProvider(load(), clock)
+    detector = None
+    if motion:
+        detector = MotionDetector(SimulatedAccelerometer(load(), clock, seed=seed),
+                                  clock=clock.time)
+        engine_options = dict(engine_options or {}, motion=detector)
+    notifications = []
+    alerts = []
+
+    with NominatimStandIn(latency=latency, max_distance_km=100) as standin, \
+            CollectorStandIn() as collector, tempfile.TemporaryDirectory() as tmp:
+        cache = GeocodeCache(path=os.path.join(tmp, 'cache.sqlite3'))
+        client = HttpClient()
+        simplifier = create_simplifier(simplify, tolerance) if simplify and track_dir else None
+        writer = TrackWriter(track_dir, simplifier=simplifier) if track_dir else None
+        uploader = None
+        if upload:
+            uploader = Uploader(
+                collector.url, client=client,
+                queue=OfflineQueue(os.path.join(tmp, 'upload.sqlite3'), max_items=10 ** 6,
+                                   clock=clock.time),
+                simplifier=create_simplifier(simplify, tolerance) if simplify else None,
+                max_batch=max_batch, device='sim', is_online=lambda: True, clock=clock.time)
+        engine = TrackingEngine(
+            provider=provider,
+            notify=lambda text: notifications.append((clock.time(), text)),
+            alert=lambda text: alerts.append((clock.time(), text)),
+            http_client=client,
+            lock=ProcessLock(os.path.join(tmp, 'tracking.lock')),
+            track_writer=writer,
+            uploader=uploader,
+            clock=clock,
+            log_prefix='Simulation',
+            **(engine_options or {})
+        )
+        # Nominatim politikası sanal zamanda uygulanır
+        engine.geocoder.close()
+        engine.geocoder = create_geocoder(
+            'nominatim', cache=cache, nominatim_url=standin.url, client=client,
+            limiter=TokenBucket(1.0, clock=clock.time), limiter_wait=0
+        )
+        if setup is not None:
+            setup(engine)
+
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        asyncio.run(run_until_finished(engine, provider))
+        real_seconds = time.perf_counter() - started
+        cpu_seconds = time.process_time() - cpu_started
+
+        stats = {
+            'virtual_seconds': clock.elapsed(),
+            'real_seconds': real_seconds,
+            'cpu_seconds': cpu_seconds,
+            'fixes': provider.received,
+            'fixes_skipped': provider.skipped,
+            'gate': engine.change_gate.stats(),
+            'notifications': len(notifications),
+            'alerts': len(alerts),
+            'cache_hits': cache.hits,
+            'cache_misses': cache.misses,
+            'nominatim_requests': standin.request_count,
+            'http': client.stats(),
+            'motion': None,
+            'trajectory': None,
+            'upload': None,
+        }
+        if detector is not None:
+            stats['motion'] = dict(detector.stats(),
+                                   still_ticks=engine.metrics.counters.get('still_ticks', 0))
+        if uploader is not None:
+            # Kuyrukta kalanlar eşik beklenmeden gönderilir
+            uploader.close(upload=True)
+            engine.uploader = None
+            stats['upload'] = dict(uploader.stats(), requests=collector.requests,
+                                   received=len(collector.records))
+            if uploader.simplifier is not None:
+                stats['upload']['trajectory'] = uploader.simplifier.stats()
+        engine.close()
+        if simplifier is not None:
+            stats['trajectory'] = simplifier.stats()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Takip hattını sanal saatle çalıştır")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--trace', help="GPX veya CSV iz dosyası")
+    source.add_argument('--synthetic', action='store_true', help="sentetik gün üret")
+    parser.add_argument('--duration', type=float, default=86400, help="sentetik iz süresi (sn)")
+    parser.add_argument('--interval', type=float, default=1.0, help="sentetik konum aralığı (sn)")
+    parser.add_argument('--speed', type=float, default=None,
+                        help="gerçek zamanın katı (1-1000); verilmezse beklemesiz")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help="taklit sunucuya eklenecek yapay gecikme")
+    parser.add_argument('--track-dir', default=None, help="konum geçmişini buraya yaz")
+    parser.add_argument('--simplify', choices=[MODE_DEAD_RECKONING, MODE_DOUGLAS_PEUCKER],
+                        help="konum geçmişini yazmadan önce sadeleştir (--track-dir ile)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="sadeleştirme hata sınırı (metre)")
+    parser.add_argument('--upload', action='store_true',
+                        help="konumları yerel toplayıcı taklidine partiler halinde yükle")
+    parser.add_argument('--max-batch', type=int, default=500, help="parti başına konum")
+    parser.add_argument('--motion', action='store_true',
+                        help="ivmeölçer taklidiyle durağanken konum almayı askıya al")
+    parser.add_argument('--json', action='store_true', help="sonucu JSON olarak yaz")
+    args = parser.parse_args()
+
+    stats = simulate(trace=args.trace, duration=args.duration, interval=args.interval,
+                     speed=args.speed, seed=args.seed, latency=args.latency_ms / 1000,
+                     track_dir=args.track_dir, motion=args.motion, simplify=args.simplify,
+                     tolerance=args.tolerance, upload=args.upload, max_batch=args.max_batch)
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+
+    hours = stats['virtual_seconds'] / 3600
+    print(f"Sanal süre   : {hours:.1f} saat ({stats['real_seconds']:.2f} sn gerçek, "
+          f"{stats['virtual_seconds'] / max(stats['real_seconds'], 1e-9):.0f}x)")
+    print(f"Konum        : {stats['fixes']} (askıda atlanan {stats['fixes_skipped']})")
+    print(f"Tur          : {stats['gate']['ticks']} (geocoding {stats['gate']['geocoded']}, "
+          f"atlanan {stats['gate']['geocode_skipped']})")
+    print(f"Bildirim     : {stats['notifications']} ({stats['notifications'] / max(hours, 1e-9):.1f}/saat)")
+    if stats['alerts']:
+        print(f"Bölge        : {stats['alerts']} bildirim")
+    print(f"Önbellek     : {stats['cache_hits']} isabet / {stats['cache_misses']} ıskalama")
+    print(f"Nominatim    : {stats['nominatim_requests']} istek")
+    if stats['trajectory'] is not None:
+        print(f"Geçmiş       : {stats['trajectory']['kept']} / {stats['trajectory']['received']} "
+              f"nokta yazıldı ({stats['trajectory']['ratio']:.1f}x)")
+    if stats['upload'] is not None:
+        upload = stats['upload']
+        print(f"Yükleme      : {upload['received']} konum, {upload['requests']} istek "
+              f"({upload['raw_bytes']} → {upload['sent_bytes']} bayt)")
+    if stats['motion'] is not None:
+        print(f"Hareket      : {stats['motion']['still_ticks']} durağan tur, "
+              f"{stats['motion']['transitions']} durum değişimi")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Durum Kanalı Taklidi
+Android servisi olmadan arayüzü denemek için status_channel protokolüyle
+sentetik konum olayları yayınlar ya da yayını dinleyip ekrana yazar.
+
+Kullanım:
+    python tools/status_standin.py publish --interval 2
+    python tools/status_standin.py listen
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Kivy komut satırı argümanlarını yutmasın
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from status_channel import DEFAULT_PORT, StatusPublisher, StatusSubscriber  # noqa: E402
+
+# İstanbul içinde rastgele yürüyüş için örnek ilçeler
+DISTRICTS = [
+    (41.0082, 28.9784, "Alemdar / Fatih / İstanbul"),
+    (40.9910, 29.0270, "Caferağa / Kadıköy / İstanbul"),
+    (41.0422, 29.0083, "Sinanpaşa / Beşiktaş / İstanbul"),
+    (41.0370, 28.9850, "Cihangir / Beyoğlu / İstanbul"),
+]
+
+
+async def publish(port, interval):
+    """Sentetik konum ve durum olayları yayınla"""
+    publisher = await StatusPublisher(port=port).start()
+    rng = random.Random()
+    lat, lon, text = DISTRICTS[0]
+    try:
+        while True:
+            if rng.random() < 0.2:
+                lat, lon, text = rng.choice(DISTRICTS)
+            lat += rng.uniform(-0.001, 0.001)
+            lon += rng.uniform(-0.001, 0.001)
+
+            publisher.publish('location', lat=lat, lon=lon, provider='standin', text=text)
+            publisher.publish('status', state='running', speed=None, counters={},
+                              next_update=interval)
+            print(f"📡 {text} ({lat:.4f}, {lon:.4f}) -> {len(publisher.subscribers)} abone")
+            await asyncio.sleep(interval)
+    finally:
+        publisher.publish('status', state='stopped', speed=None, counters={})
+        publisher.close()
+
+
+async def listen(port):
+    """Yayını dinle ve olayları yazdır"""
+    subscriber = await StatusSubscriber(
+        lambda message: print(f"📥 {message['type']}: {message['data']}"), port=port
+    ).start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        subscriber.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Durum kanalı taklidi")
+    parser.add_argument('mode', choices=['publish', 'listen'])
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--interval', type=float, default=2.0)
+    args = parser.parse_args()
+
+    try:
+        if args.mode == 'publish':
+            asyncio.run(publish(args.port, args.interval))
+        else:
+            asyncio.run(listen(args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+"""
+Konum Geçmişi Deposu
+Konumları sabit boyutlu ikili kayıtlar olarak segment dosyalarına ekler,
+okurken dosyaları bellek eşlemeli (mmap) tarar.
+
+Segment dosyası (little-endian):
+    başlık : '<4sHHq'  sihirli sözcük, sürüm, kayıt boyutu, başlangıç zamanı (unix sn)
+    kayıt  : '<HiiBB'  başlangıca göre saniye, enlem, boylam (1e-7 derece ölçekli int32),
+                        doğruluk (metre, 0 = bilinmiyor, en fazla 255), sağlayıcı kodu
+
+Kayıt 12 bayttır; saniyede bir konumla bir gün ~1 MB tutar. Zaman farkı
+uint16 olduğu için bir segment en fazla ~18 saat kapsar, sonra yenisine geçilir.
+Segment başından biraz eski kayıtlar (GPS ve ağ konumlarının karışması)
+başlangıç zamanına kısılır; yalnızca büyük geri saat atlamasında yeni
+segment açılır.
+Yazıcıya sadeleştirici (bkz. trajectory.py) verilirse yalnızca hata sınırı
+içinde izi koruyan noktalar yazılır. Henüz kesinleşmemiş noktalar
+pending.ndjson günlüğünde tutulur; servis öldürülürse bir sonraki açılışta
+günlük aynı hata sınırıyla (Douglas–Peucker) sadeleştirilip yazılır.
+"""
+
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+from geocache import default_data_dir
+from runtime import Logger, lazy_import
+from trajectory import douglas_peucker
+
+np = lazy_import('numpy')
+
+MAGIC = b'TRK1'
+VERSION = 1
+HEADER = struct.Struct('<4sHHq')
+RECORD = struct.Struct('<HiiBB')
+COORD_SCALE = 10_000_000            # 1e-7 derece
+MAX_OFFSET = 0xFFFF                 # segment başına en fazla saniye
+MAX_LATENESS = 300                  # saniye; segment başından bu kadar eski kayıt kısılır
+TRACK_DIRNAME = 'tracks'
+PENDING_FILENAME = 'pending.ndjson'
+PENDING_KEYS = ('lat', 'lon', 'time', 'accuracy', 'provider')
+
+DEFAULT_MAX_SEGMENT_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_SEGMENTS = 60
+
+PROVIDER_CODES = {'gps': 1, 'network': 2, 'passive': 3, 'fused': 4, 'test': 5, 'sim': 6}
+PROVIDER_NAMES = {code: name for name, code in PROVIDER_CODES.items()}
+
+# NumPy ile sıfır kopyalı okuma için kayıt tipi
+RECORD_DTYPE = [('dt', '<u2'), ('lat', '<i4'), ('lon', '<i4'),
+                ('accuracy', 'u1'), ('provider', 'u1')]
+
+
+def default_track_dir():
+    path = os.path.join(default_data_dir(), TRACK_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class TrackWriter:
+    """Segment döndürmeli, yalnızca sona ekleyen konum yazıcısı"""
+
+    def __init__(self, directory=None, max_segment_bytes=DEFAULT_MAX_SEGMENT_BYTES,
+                 max_segments=DEFAULT_MAX_SEGMENTS, simplifier=None):
+        self.directory = directory or default_track_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        # Kesinleşmemiş noktalar kapanışta (öldürülürse sonraki açılışta) yazılır
+        self.simplifier = simplifier
+        self._file = None
+        self._base_time = None
+        self._size = 0
+        # append/close iş parçacığından da çağrılır; sadeleştirici ve günlük de korunur
+        self._lock = threading.RLock()
+        self._journal = None
+        self._journal_path = os.path.join(self.directory, PENDING_FILENAME)
+        if simplifier is not None:
+            self._recover()
+
+    def append(self, location, timestamp=None):
+        """Konumu kaydet (sadeleştirici varsa kesinleşen noktaları)"""
+        if self.simplifier is None:
+            self._write(location, timestamp)
+            return
+
+        if timestamp is not None or location.get('time') is None:
+            location = dict(location, time=timestamp if timestamp is not None else time.time())
+        with self._lock:
+            kept = self.simplifier.push(location)
+            for fix in kept:
+                self._write(fix)
+            # Parça kesildiyse günlük baştan yazılır, yoksa yalnızca yeni nokta eklenir
+            if kept:
+                self._log_pending(self.simplifier.pending(), rewrite=True)
+            else:
+                self._log_pending([location])
+
+    def append_many(self, fixes):
+        """Bir turda gelen konumları kaydet (engeller; motor iş parçacığında çağırır)"""
+        for fix in fixes:
+            self.append(fix)
+
+    def _log_pending(self, fixes, rewrite=False):
+        try:
+            if self._journal is None:
+                self._journal = open(self._journal_path, 'a', encoding='utf-8')
+            if rewrite:
+                self._journal.seek(0)
+                self._journal.truncate()
+            self._journal.write(''.join(
+                json.dumps({key: fix.get(key) for key in PENDING_KEYS}) + '\n' for fix in fixes))
+            self._journal.flush()
+        except OSError as e:
+            Logger.error(f"TrackStore: Günlük yazma hatası - {str(e)}")
+
+    def _recover(self):
+        """Önceki süreçten kalan kesinleşmemiş noktaları hata sınırı içinde yaz"""
+        fixes = []
+        try:
+            with open(self._journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        fixes.append(json.loads(line))
+                    except ValueError:
+                        # Yarım yazılmış son satır
+                        break
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            Logger.error(f"TrackStore: Günlük okunamadı - {str(e)}")
+            return
+
+        # İlk nokta (son tutulan) zaten diskte
+        indices = douglas_peucker(fixes, self.simplifier.tolerance)
+        for i in indices[1:]:
+            self._write(fixes[i])
+        if len(indices) > 1:
+            Logger.info(f"TrackStore: Günlükten {len(indices) - 1} nokta kurtarıldı")
+        self._remove_journal()
+
+    def _remove_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        try:
+            os.remove(self._journal_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            Logger.error(f"TrackStore: Günlük silinemedi - {str(e)}")
+
+    def _write(self, location, timestamp=None):
+        timestamp = int(timestamp if timestamp is not None else location.get('time') or time.time())
+        accuracy = location.get('accuracy')
+        accuracy = 0 if accuracy is None else max(1, min(255, int(round(accuracy))))
+        provider = PROVIDER_CODES.get(location.get('provider'), 0)
+
+        try:
+            with self._lock:
+                if self._file is not None and \
+                        self._base_time - MAX_LATENESS <= timestamp < self._base_time:
+                    # Sıra dışı gelen kayıt için küçük segment açılmasın
+                    timestamp = self._base_time
+                if self._needs_rotation(timestamp):
+                    self._rotate(timestamp)
+
+                self._file.write(RECORD.pack(
+                    timestamp - self._base_time,
+                    int(round(location['lat'] * COORD_SCALE)),
+                    int(round(location['lon'] * COORD_SCALE)),
+                    accuracy, provider
+                ))
+                # Servis öldürülse bile kayıt diske ulaşsın
+                self._file.flush()
+                self._size += RECORD.size
+
+        except OSError as e:
+            Logger.error(f"TrackStore: Yazma hatası - {str(e)}")
+
+    def _needs_rotation(self, timestamp):
+        return (self._file is None
+                or not 0 <= timestamp - self._base_time <= MAX_OFFSET
+                or self._size + RECORD.size > self.max_segment_bytes)
+
+    def _rotate(self, timestamp):
+        """Yeni segment aç, eski segmentleri sınırla"""
+        if self._file is not None:
+            self._file.close()
+
+        path = os.path.join(self.directory, f"track-{timestamp}.seg")
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"track-{timestamp}-{suffix}.seg")
+            suffix += 1
+
+        self._file = open(path, 'ab')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, timestamp))
+        self._base_time = timestamp
+        self._size = HEADER.size
+
+        # Geri saat atlamasında yeni segment en eskisi sıralanır; yazılan segment silinmez
+        segments = [segment for segment in list_segments(self.directory) if segment != path]
+        for old in segments[:max(0, len(segments) + 1 - self.max_segments)]:
+            os.remove(old)
+
+    def close(self):
+        with self._lock:
+            if self.simplifier is not None:
+                for fix in self.simplifier.flush():
+                    self._write(fix)
+                self._remove_journal()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def list_segments(directory=None):
+    """Segment dosyalarını zaman sırasıyla döndür"""
+    directory = directory or default_track_dir()
+
+    def start_time(path):
+        name = os.path.basename(path)[len('track-'):-len('.seg')]
+        return tuple(int(part) for part in name.split('-'))
+
+    return sorted(glob.glob(os.path.join(directory, 'track-*.seg')), key=start_time)
+
+
+class Segment:
+    """Bellek eşlemeli tek segment"""
+
+    def __init__(self, path):
+        self.path = path
+        self._map = None
+        self._file = open(path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"Boş segment: {path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, record_size, base_time = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+                raise ValueError(f"Geçersiz segment: {path}")
+        except BaseException:
+            # Okuyucu bozuk segmenti atlayıp devam eder; tanıtıcı açık kalmasın
+            self.close()
+            raise
+
+        self.base_time = base_time
+        # Yarım yazılmış son kaydı yok say
+        self.count = (size - HEADER.size) // RECORD.size
+
+    def _payload(self):
+        return memoryview(self._map)[HEADER.size:HEADER.size + self.count * RECORD.size]
+
+    def iter_raw(self):
+        """(dt, lat_e7, lon_e7, doğruluk, sağlayıcı) demetlerini kopyalamadan üret"""
+        return RECORD.iter_unpack(self._payload())
+
+    def array(self):
+        """Kayıtların NumPy yapılandırılmış dizi görünümü (kopya yok)"""
+        if np is None:
+            raise RuntimeError("NumPy yüklü değil")
+        return np.frombuffer(self._map, dtype=RECORD_DTYPE, count=self.count,
+                             offset=HEADER.size)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class TrackReader:
+    """Tüm segmentleri sırayla tarayan okuyucu"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_track_dir()
+        self.segments = []
+        for path in list_segments(self.directory):
+            try:
+                self.segments.append(Segment(path))
+            except (OSError, ValueError) as e:
+                Logger.warning(f"TrackStore: Segment atlandı - {str(e)}")
+
+    def __len__(self):
+        return sum(segment.count for segment in self.segments)
+
+    def scan(self, start=None, end=None):
+        """(zaman, enlem, boylam, doğruluk, sağlayıcı) kayıtlarını sırayla üret"""
+        for segment in self.segments:
+            base = segment.base_time
+            if end is not None and base > end:
+                break
+            if start is not None and base + MAX_OFFSET < start:
+                continue
+
+            for dt, lat, lon, accuracy, provider in segment.iter_raw():
+                t = base + dt
+                if start is not None and t < start:
+                    continue
+                if end is not None and t > end:
+                    return
+                yield (t, lat / COORD_SCALE, lon / COORD_SCALE,
+                       accuracy or None, PROVIDER_NAMES.get(provider))
+
+    def arrays(self):
+        """Her segment için (başlangıç zamanı, NumPy görünümü) üret"""
+        for segment in self.segments:
+            yield segment.base_time, segment.array()
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,221 @@
+"""
+İz Sadeleştirme
+Konum akışındaki gereksiz noktaları atarak saklanan ve gönderilen nokta
+sayısını azaltır; atılan her nokta, kalan noktalar arasında zamana göre
+doğrusal ara değerlemeyle en fazla tolerance metre hatayla geri elde edilir
+(eşzamanlı Öklid uzaklığı, SED).
+
+İki kip vardır:
+    dead-reckoning   çevrimiçi; son tutulan noktadan hızla tahmin yapılır,
+                     tahmin tolerance'tan fazla saparsa parça kesilir
+    douglas-peucker  tampon dolunca (window nokta) tepeden aşağı DP
+                     (Meratnia ve de By, 2004); tamponun son noktası bir
+                     sonraki tamponun başı olur
+
+İkisi de push(fix) ile artımlı çalışır ve yalnızca kesinleşen noktaları
+döndürür; flush() akış bitince kalan noktaları verir. pending() son tutulan
+noktayla birlikte kesinleşmemiş noktaları döndürür; süreç beklenmedik
+şekilde biterse bunlar douglas_peucker ile aynı sınırda kurtarılabilir
+(bkz. track_store.py).
+"""
+
+import math
+
+from geometry import EARTH_RADIUS_M
+
+MODE_DEAD_RECKONING = 'dead-reckoning'
+MODE_DOUGLAS_PEUCKER = 'douglas-peucker'
+
+DEFAULT_TOLERANCE = 25.0        # metre; GPS gürültüsünün (~5 m) birkaç katı
+DEFAULT_WINDOW = 256            # DP tampon boyutu (nokta)
+DEFAULT_MAX_INTERVAL = 600      # saniye; bu kadar süre nokta tutulmadıysa tut
+
+_METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+
+def _offset_m(origin, fix):
+    """fix'in origin'e göre yerel düzlemdeki konumu (doğu, kuzey metre)"""
+    cos_lat = math.cos(math.radians(origin['lat']))
+    return ((fix['lon'] - origin['lon']) * cos_lat * _METERS_PER_DEGREE,
+            (fix['lat'] - origin['lat']) * _METERS_PER_DEGREE)
+
+
+def synchronized_distance(start, end, fix):
+    """fix ile start-end arasında aynı zamana düşen ara değer noktası arasındaki uzaklık (metre)"""
+    span = end['time'] - start['time']
+    ratio = (fix['time'] - start['time']) / span if span > 0 else 0.0
+    ex, ey = _offset_m(start, end)
+    px, py = _offset_m(start, fix)
+    return math.hypot(px - ratio * ex, py - ratio * ey)
+
+
+def douglas_peucker(fixes, tolerance=DEFAULT_TOLERANCE):
+    """Tutulacak noktaların sıralarını döndür (ilk ve son her zaman tutulur)"""
+    n = len(fixes)
+    if n <= 2:
+        return list(range(n))
+
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    # Özyineleme yerine yığın: uzun izlerde yığın taşması olmasın
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        worst, index = tolerance, None
+        for i in range(first + 1, last):
+            distance = synchronized_distance(fixes[first], fixes[last], fixes[i])
+            if distance > worst:
+                worst, index = distance, i
+        if index is not None:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [i for i in range(n) if keep[i]]
+
+
+class TrajectorySimplifier:
+    """Artımlı sadeleştirici arayüzü ve sayaçları"""
+
+    def __init__(self, tolerance=DEFAULT_TOLERANCE):
+        self.tolerance = tolerance
+        self.received = 0
+        self.kept = 0
+
+    def push(self, fix):
+        """Yeni konumu işle, kesinleşen (tutulan) konumları döndür"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Bekleyen konumları döndür (akış sonu)"""
+        raise NotImplementedError
+
+    def pending(self):
+        """Son tutulan nokta ve ardından gelen kesinleşmemiş noktalar"""
+        raise NotImplementedError
+
+    def _emit(self, fixes):
+        self.kept += len(fixes)
+        return fixes
+
+    def stats(self):
+        return {'received': self.received, 'kept': self.kept,
+                'ratio': self.received / self.kept if self.kept else None}
+
+
+class DeadReckoningSimplifier(TrajectorySimplifier):
+    """Çevrimiçi dead-reckoning sadeleştirici
+
+    Son çapadan (tutulan nokta) ortalama hızla yapılan tahmin tolerance'tan
+    fazla saparsa parça kesilir. Kesilen parçanın içindeki noktalar çapa ile
+    sınır içindeki son nokta arasında DP ile denetlenir; tahminin kaçırdığı
+    sapmalar da böylece tolerance ile sınırlı kalır.
+    """
+
+    def __init__(self, tolerance=DEFAULT_TOLERANCE, max_interval=DEFAULT_MAX_INTERVAL,
+                 max_points=DEFAULT_WINDOW):
+        super().__init__(tolerance)
+        self.max_interval = max_interval
+        self.max_points = max(3, max_points)
+        self._anchor = None
+        self._velocity = (0.0, 0.0)
+        self._segment = []          # çapadan sonraki tutulmamış noktalar
+
+    def _deviation(self, fix):
+        dt = fix['time'] - self._anchor['time']
+        x, y = _offset_m(self._anchor, fix)
+        return math.hypot(x - self._velocity[0] * dt, y - self._velocity[1] * dt)
+
+    def _set_anchor(self, fix):
+        before = self._anchor
+        if before is not None and fix['time'] > before['time']:
+            # Parça boyunca ortalama hız: ardışık iki noktadan tahmin GPS gürültüsünü büyütür
+            x, y = _offset_m(before, fix)
+            dt = fix['time'] - before['time']
+            self._velocity = (x / dt, y / dt)
+        self._anchor = fix
+
+    def _cut(self):
+        """Parçayı kapat: son nokta yeni çapa olur, aradakiler DP ile denetlenir"""
+        segment = [self._anchor] + self._segment
+        kept = [segment[i] for i in douglas_peucker(segment, self.tolerance)[1:]]
+        self._segment = []
+        self._set_anchor(kept[-1])
+        return kept
+
+    def push(self, fix):
+        self.received += 1
+        if self._anchor is None:
+            self._set_anchor(fix)
+            return self._emit([fix])
+
+        kept = []
+        if self._segment and (self._deviation(fix) > self.tolerance
+                              or fix['time'] - self._anchor['time'] > self.max_interval
+                              or len(self._segment) >= self.max_points):
+            kept = self._cut()
+        self._segment.append(fix)
+        return self._emit(kept)
+
+    def flush(self):
+        return self._emit(self._cut() if self._segment else [])
+
+    def pending(self):
+        if self._anchor is None:
+            return []
+        return [self._anchor] + self._segment
+
+
+class DouglasPeuckerSimplifier(TrajectorySimplifier):
+    """Tamponlu Douglas–Peucker sadeleştirici"""
+
+    def __init__(self, tolerance=DEFAULT_TOLERANCE, window=DEFAULT_WINDOW):
+        super().__init__(tolerance)
+        self.window = max(3, window)
+        self._buffer = []
+
+    def _simplify(self):
+        buffer = self._buffer
+        indices = douglas_peucker(buffer, self.tolerance)
+        # İlk nokta önceki tamponda zaten verildi; son nokta sonrakinin başı olur
+        self._buffer = [buffer[-1]]
+        return self._emit([buffer[i] for i in indices[1:]])
+
+    def push(self, fix):
+        self.received += 1
+        if not self._buffer:
+            self._buffer = [fix]
+            return self._emit([fix])
+
+        self._buffer.append(fix)
+        if len(self._buffer) < self.window:
+            return []
+        return self._simplify()
+
+    def flush(self):
+        kept = self._simplify() if len(self._buffer) > 1 else []
+        self._buffer = []
+        return kept
+
+    def pending(self):
+        return list(self._buffer)
+
+
+def create_simplifier(mode=MODE_DEAD_RECKONING, tolerance=DEFAULT_TOLERANCE, **options):
+    """Kipe göre sadeleştirici kur"""
+    if mode == MODE_DEAD_RECKONING:
+        return DeadReckoningSimplifier(tolerance, **options)
+    if mode == MODE_DOUGLAS_PEUCKER:
+        return DouglasPeuckerSimplifier(tolerance, **options)
+    raise ValueError(f"Bilinmeyen sadeleştirme kipi: {mode}")
+
+
+def max_error(original, kept):
+    """Atılan noktaların, tutulanlar arası ara değerlemeye en büyük uzaklığı (metre)"""
+    worst = 0.0
+    j = 0
+    for fix in original:
+        while j + 1 < len(kept) and kept[j + 1]['time'] < fix['time']:
+            j += 1
+        if j + 1 < len(kept):
+            worst = max(worst, synchronized_distance(kept[j], kept[j + 1], fix))
+    return worst
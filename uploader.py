@@ -0,0 +1,337 @@
+"""
+Konum Geçmişi Yükleyici
+Servisin ürettiği konumları yapılandırılmış bir toplayıcı sunucuya toplu
+olarak gönderir. Konumlar önce kalıcı kuyruğa (bkz. offline_queue.py)
+yazılır; kuyrukta max_batch konum biriktiğinde veya en eskisi max_age
+saniyeyi geçtiğinde tek bir sıkıştırılmış POST ile yüklenir. Böylece
+radyo her konum için değil, her parti için uyanır.
+
+Parti gövdesi satır başına bir konum içeren NDJSON'dur, gzip (varsayılan)
+ya da zstd (zstandard kuruluysa) ile sıkıştırılır:
+    {"seq": 17, "t": 1700000000, "lat": 41.0082, "lon": 28.9784, "acc": 5, "p": "gps"}
+
+Yeniden deneme idempotenttir: gönderilemeyen partinin kayıt aralığı ilk
+denemede sabitlenir; kuyruk bu arada büyüse de aynı konumlar aynı
+Idempotency-Key ve aynı gövdeyle yeniden gönderilir. Aralık bellekte
+tutulur; süreç yeniden başlarsa parti farklı sınırlarla oluşabilir, bu
+durumda seq (cihaz başına artan kuyruk sırası) sayesinde sunucu örtüşen
+partilerdeki konumları tekilleştirir.
+
+Yalnızca gövdesi hatalı partiler (400, 413, 422) deneme sınırından sonra
+kuyruktan düşer. Yetki (401/403), hız sınırı (429) ve sunucu hataları
+devre kesicinin arkasında süresiz yeniden denenir; sunucu tarafındaki bir
+yapılandırma hatası kullanıcının geçmişini sildirmez.
+
+Yapılandırma veri klasöründeki upload.json dosyasından okunur; endpoint
+yoksa yükleme kapalıdır:
+    {"endpoint": "https://ornek.com/ingest", "codec": "gzip", "max_batch": 500,
+     "max_age": 900, "simplify": "dead-reckoning", "headers": {"Authorization": "Bearer ..."}}
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import time
+import uuid
+
+from geocache import default_data_dir
+from http_client import HttpClient, TransportError
+from offline_queue import OfflineQueue, network_available
+from resilience import CircuitBreaker
+from runtime import Logger, lazy_import
+from trajectory import MODE_DEAD_RECKONING, create_simplifier
+
+# İsteğe bağlı; kurulu değilse None
+zstandard = lazy_import('zstandard')
+
+UPLOAD_QUEUE_FILENAME = 'upload_queue.sqlite3'
+UPLOAD_CONFIG_FILENAME = 'upload.json'
+DEVICE_ID_FILENAME = 'device_id'
+KIND_UPLOAD = 'upload'
+
+CODEC_GZIP = 'gzip'
+CODEC_ZSTD = 'zstd'
+CONTENT_TYPE = 'application/x-ndjson'
+
+DEFAULT_MAX_BATCH = 500         # konum
+DEFAULT_MAX_AGE = 900           # saniye; en eski konum bu kadar beklediyse gönder
+DEFAULT_MAX_ITEMS = 50000       # kuyruk sınırı (~2 hafta, sadeleştirilmiş iz)
+DEFAULT_CHECK_INTERVAL = 60     # saniye
+
+# Gövdesi yeniden gönderilince de reddedilecek yanıtlar (parti bozuk)
+MALFORMED_STATUSES = (400, 413, 422)
+
+
+class UploadRejected(Exception):
+    """Sunucu partiyi kalıcı olarak reddetti (yeniden denemek sonucu değiştirmez)"""
+
+
+def encode_batch(records, codec=CODEC_GZIP):
+    """Kayıtları sıkıştırılmış NDJSON gövdesine çevir"""
+    raw = ''.join(json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n'
+                  for record in records).encode('utf-8')
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard yüklü değil")
+        return raw, zstandard.ZstdCompressor(level=3).compress(raw)
+    # mtime=0: aynı parti her denemede bayt bayt aynı gövdeyi üretir
+    return raw, gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+def decode_batch(body, encoding=CODEC_GZIP):
+    """Parti gövdesini kayıt listesine çevir (toplayıcı tarafı)"""
+    if encoding == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard yüklü değil")
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    elif encoding == CODEC_GZIP:
+        body = gzip.decompress(body)
+    return [json.loads(line) for line in body.decode('utf-8').splitlines() if line]
+
+
+def fix_record(fix):
+    """Konumu kısa anahtarlı yükleme kaydına çevir"""
+    record = {'t': round(fix.get('time') or time.time(), 3),
+              'lat': round(fix['lat'], 7), 'lon': round(fix['lon'], 7)}
+    if fix.get('accuracy') is not None:
+        record['acc'] = round(fix['accuracy'], 1)
+    if fix.get('provider'):
+        record['p'] = fix['provider']
+    return record
+
+
+def device_id(directory=None):
+    """Cihaza özgü kalıcı kimlik (ilk çağrıda üretilir)"""
+    path = os.path.join(directory or default_data_dir(), DEVICE_ID_FILENAME)
+    try:
+        with open(path, encoding='utf-8') as f:
+            value = f.read().strip()
+        if value:
+            return value
+    except FileNotFoundError:
+        pass
+    value = uuid.uuid4().hex
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(value)
+    return value
+
+
+class Uploader:
+    """Konumları kalıcı kuyrukta biriktirip partiler halinde POST eden aşama
+
+    add() yalnızca kuyruğa yazar (SQLite; motor bunu iş parçacığında çağırır);
+    run() eşik dolunca partileri iş parçacığında gönderir. Sunucu art arda
+    hata verirse devre kesici istekleri bir süre durdurur; konumlar kuyrukta kalır.
+    """
+
+    def __init__(self, endpoint, client=None, queue=None, simplifier=None, codec=CODEC_GZIP,
+                 max_batch=DEFAULT_MAX_BATCH, max_age=DEFAULT_MAX_AGE, headers=None,
+                 device=None, is_online=network_available,
+                 check_interval=DEFAULT_CHECK_INTERVAL, breaker=None, clock=time.time):
+        if codec not in (CODEC_GZIP, CODEC_ZSTD):
+            raise ValueError(f"Bilinmeyen sıkıştırma: {codec}")
+        if codec == CODEC_ZSTD and zstandard is None:
+            Logger.warning("Uploader: zstandard yok - gzip kullanılacak")
+            codec = CODEC_GZIP
+
+        self.endpoint = endpoint
+        # Dışarıdan verilen istemcinin ömrünü sahibi yönetir
+        self._owns_client = client is None
+        self.client = client if client is not None else HttpClient()
+        self.queue = queue or OfflineQueue(
+            path=os.path.join(default_data_dir(), UPLOAD_QUEUE_FILENAME),
+            max_items=DEFAULT_MAX_ITEMS, clock=clock)
+        # Gönderilen iz, saklanan iz gibi sadeleştirilir (bkz. trajectory.py)
+        self.simplifier = simplifier
+        self.codec = codec
+        self.max_batch = max_batch
+        self.max_age = max_age
+        self.headers = dict(headers or {})
+        self.device = device or device_id()
+        self.is_online = is_online
+        self.check_interval = check_interval
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.clock = clock
+        self.pending = None
+        self.batches = 0
+        self.uploaded = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.failures = 0
+        self.rejected = 0
+        self._wakeup = None
+        self._loop = None
+        # Gönderilemeyen partinin son kaydı; yeniden deneme bu aralıkla sınırlı
+        self._retry_last = None
+
+    def add(self, fix):
+        """Konumu (sadeleştirici varsa kesinleşen konumları) kuyruğa ekle"""
+        self.add_many([fix])
+
+    def add_many(self, fixes):
+        """Bir turda gelen konumları tek yazma işlemiyle kuyruğa ekle"""
+        if self.simplifier is not None:
+            fixes = [kept for fix in fixes for kept in self.simplifier.push(fix)]
+        self._enqueue(fixes)
+
+    def _enqueue(self, fixes):
+        self.queue.push_many(KIND_UPLOAD, [fix_record(fix) for fix in fixes])
+        if fixes:
+            if self.pending is None:
+                self.pending = self.queue.count(KIND_UPLOAD)
+            else:
+                self.pending += len(fixes)
+            if self.pending >= self.max_batch:
+                self.wake()
+
+    def wake(self):
+        """Eşiği beklemeden kontrol et (herhangi bir iş parçacığından çağrılabilir)"""
+        if self._wakeup is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def ready(self):
+        """Gönderilecek dolu ya da yeterince eski bir parti var mı"""
+        self.pending = self.queue.count(KIND_UPLOAD)
+        if self.pending >= self.max_batch:
+            return True
+        oldest = self.queue.oldest(KIND_UPLOAD)
+        return oldest is not None and self.clock() - oldest >= self.max_age
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            if await asyncio.to_thread(self.ready) and await asyncio.to_thread(self.is_online):
+                await asyncio.to_thread(self.flush)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def flush(self, force=False):
+        """Hazır partileri gönder (engeller); gönderilen parti sayısını döndür"""
+        sent = 0
+        while force or self.ready():
+            batch = self._next_batch()
+            if not batch:
+                break
+            if not self.breaker.allow():
+                break
+
+            ids = [row_id for row_id, _ in batch]
+            try:
+                self._post(batch)
+            except UploadRejected as e:
+                self.breaker.record_success()
+                self.rejected += 1
+                Logger.error(f"Uploader: Parti reddedildi - {str(e)}")
+                # Deneme sınırını aşan parti kuyruktan düşer
+                self.queue.retry(ids)
+                self._retry_last = ids[-1]
+                break
+            except TransportError as e:
+                self.breaker.record_failure()
+                self.failures += 1
+                Logger.warning(f"Uploader: Gönderilemedi, sonra denenecek - {str(e)}")
+                self._retry_last = ids[-1]
+                break
+
+            self._retry_last = None
+            self.breaker.record_success()
+            self.queue.ack(ids)
+            self.batches += 1
+            self.uploaded += len(ids)
+            sent += 1
+        self.pending = self.queue.count(KIND_UPLOAD)
+        return sent
+
+    def _next_batch(self):
+        """Sıradaki parti; önceki deneme başarısızsa aynı kayıt aralığı"""
+        batch = self.queue.peek(KIND_UPLOAD, self.max_batch)
+        if self._retry_last is not None:
+            batch = [(row_id, record) for row_id, record in batch if row_id <= self._retry_last]
+            if not batch:
+                # Aralıktaki kayıtlar deneme sınırıyla düştü
+                self._retry_last = None
+                batch = self.queue.peek(KIND_UPLOAD, self.max_batch)
+        return batch
+
+    def _post(self, batch):
+        records = [dict(record, seq=row_id) for row_id, record in batch]
+        raw, body = encode_batch(records, self.codec)
+        headers = dict(self.headers)
+        headers.update({
+            'Content-Type': CONTENT_TYPE,
+            'Content-Encoding': self.codec,
+            'Idempotency-Key': f"{self.device}-{batch[0][0]}-{batch[-1][0]}",
+            'X-Device-Id': self.device,
+        })
+
+        response = self.client.post(self.endpoint, data=body, headers=headers)
+        status = response.status_code
+        # 409: parti daha önce alınmış (önceki denemenin yanıtı kaybolmuş)
+        if 200 <= status < 300 or status == 409:
+            self.raw_bytes += len(raw)
+            self.sent_bytes += len(body)
+            return
+        if status in MALFORMED_STATUSES:
+            raise UploadRejected(f"HTTP {status}")
+        # 401/403/404/429/5xx: yapılandırma veya sunucu düzelince aynı parti geçer
+        raise TransportError(f"HTTP {status}")
+
+    def stats(self):
+        return {
+            'pending': self.pending,
+            'batches': self.batches,
+            'uploaded': self.uploaded,
+            'raw_bytes': self.raw_bytes,
+            'sent_bytes': self.sent_bytes,
+            'failures': self.failures,
+            'rejected': self.rejected,
+            'breaker': self.breaker.state,
+        }
+
+    def close(self, upload=False):
+        """Kesinleşmemiş konumları kuyruğa yaz, kaynakları bırak
+
+        upload=True ise kuyruk eşik beklenmeden gönderilir (araçlar için);
+        servis kapanışı ağ beklememesi için bunu kullanmaz, kuyruk bir
+        sonraki açılışta gönderilir.
+        """
+        if self.simplifier is not None:
+            self._enqueue(self.simplifier.flush())
+        if upload:
+            self.flush(force=True)
+        self.queue.close()
+        if self._owns_client:
+            self.client.close()
+
+
+def load_upload_config(path=None):
+    """upload.json yapılandırmasını oku; yoksa veya geçersizse None"""
+    path = path or os.path.join(default_data_dir(), UPLOAD_CONFIG_FILENAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        Logger.error(f"Uploader: Yapılandırma okunamadı - {str(e)}")
+        return None
+    return config if config.get('endpoint') else None
+
+
+def create_uploader(client=None, config_path=None):
+    """Yapılandırma varsa yükleyiciyi kur, yoksa None (yükleme kapalı)"""
+    config = load_upload_config(config_path)
+    if config is None:
+        return None
+    mode = config.get('simplify', MODE_DEAD_RECKONING)
+    return Uploader(config['endpoint'], client=client,
+                    simplifier=create_simplifier(mode) if mode else None,
+                    codec=config.get('codec', CODEC_GZIP),
+                    max_batch=config.get('max_batch', DEFAULT_MAX_BATCH),
+                    max_age=config.get('max_age', DEFAULT_MAX_AGE),
+                    headers=config.get('headers'))